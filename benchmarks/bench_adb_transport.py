@@ -0,0 +1,195 @@
+"""Compare tap latency of the ADB shell fast path with the uiautomator2 path.
+
+Starts two local stand-ins and sends the same taps through each transport:
+
+- ``uiautomator2``: JSON-RPC ``click`` requests over a keep-alive HTTP
+  connection, as uiautomator2 sends them to its on-device server;
+- ``adb shell``: one new ADB connection per ``input tap``, like ``adb shell``;
+- ``persistent shell``: ``input tap`` lines written to the client's AdbShell,
+  which keeps one ``exec:sh`` connection open.
+
+The stand-in ADB server speaks the ADB smart-socket protocol for the requests
+involved. ``--rpc-ms`` and ``--input-ms`` add simulated on-device time per tap;
+on real devices ``input`` starts a new process for every event, so measure
+both on the target before relying on the fast path::
+
+    python benchmarks/bench_adb_transport.py --taps 500
+    python benchmarks/bench_adb_transport.py --rpc-ms 15 --input-ms 120
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import pathlib
+import socket
+import socketserver
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from helpers import load_module  # noqa: E402
+
+AdbShell = load_module("adb_shell").AdbShell
+
+SERIAL = "emulator-5554"
+
+
+class _AdbHandler(socketserver.StreamRequestHandler):
+    """Stand-in ADB server: transports to one device, ``shell:`` and ``exec:sh``."""
+
+    disable_nagle_algorithm = True
+    input_cost = 0.0
+
+    def handle(self) -> None:
+        while request := self._read_request():
+            if request == f"host:transport:{SERIAL}":
+                self.wfile.write(b"OKAY")
+            elif request.startswith("shell:"):
+                self.wfile.write(b"OKAY")
+                self._run(request.removeprefix("shell:"))
+                return
+            elif request == "exec:sh":
+                self.wfile.write(b"OKAY")
+                self._sh()
+                return
+            else:
+                message = f"unknown request {request}".encode()
+                self.wfile.write(b"FAIL" + f"{len(message):04x}".encode() + message)
+                return
+
+    def _read_request(self) -> str | None:
+        length = self.rfile.read(4)
+        if len(length) < 4:
+            return None
+        return self.rfile.read(int(length, 16)).decode()
+
+    def _run(self, command: str) -> bytes:
+        if command.startswith("input "):
+            time.sleep(self.input_cost)
+        return b""
+
+    def _sh(self) -> None:
+        for line in self.rfile:
+            command, _, echo = line.decode().rstrip("\n").partition(" 2>&1; echo ")
+            self.wfile.write(self._run(command) + echo.replace("$?", "0").encode() + b"\n")
+            self.wfile.flush()
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    """Stand-in uiautomator2 server answering JSON-RPC calls."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, Nagle's algorithm
+    # and delayed ACKs add 40 ms that the real server does not have.
+    disable_nagle_algorithm = True
+    rpc_cost = 0.0
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.rpc_cost)
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - http.server API
+        return None
+
+
+class _ThreadingAdbServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _adb_request(sock: socket.socket, request: str) -> None:
+    sock.sendall(f"{len(request):04x}{request}".encode())
+    status = sock.recv(4)
+    if status != b"OKAY":
+        raise RuntimeError(f"ADB request {request} failed: {status!r}")
+
+
+def _adb_connect(port: int) -> socket.socket:
+    sock = socket.create_connection(("127.0.0.1", port))
+    _adb_request(sock, f"host:transport:{SERIAL}")
+    return sock
+
+
+def _adb_connect_shell(port: int) -> socket.socket:
+    sock = _adb_connect(port)
+    _adb_request(sock, "exec:sh")
+    return sock
+
+
+def _one_shot_tap(port: int, x: int, y: int) -> None:
+    with _adb_connect(port) as sock:
+        _adb_request(sock, f"shell:input tap {x} {y}")
+        while sock.recv(4096):
+            pass
+
+
+def _rpc_tap(connection: http.client.HTTPConnection, x: int, y: int, request_id: int) -> None:
+    body = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": "click", "params": [x, y]})
+    connection.request("POST", "/jsonrpc/0", body, {"Content-Type": "application/json"})
+    connection.getresponse().read()
+
+
+def _timed(taps: int, tap: Callable[[int], None]) -> list[float]:
+    samples = []
+    for idx in range(taps):
+        started = time.perf_counter()
+        tap(idx)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={statistics.median(ordered) * 1000:8.3f} ms  p95={p95 * 1000:8.3f} ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--taps", type=int, default=300)
+    parser.add_argument("--rpc-ms", type=float, default=0.0, help="simulated device time per uiautomator2 click")
+    parser.add_argument("--input-ms", type=float, default=0.0, help="simulated device time per 'input tap'")
+    args = parser.parse_args()
+
+    _AdbHandler.input_cost = args.input_ms / 1000
+    _RpcHandler.rpc_cost = args.rpc_ms / 1000
+    adb_server = _ThreadingAdbServer(("127.0.0.1", 0), _AdbHandler)
+    rpc_server = ThreadingHTTPServer(("127.0.0.1", 0), _RpcHandler)
+    for server in (adb_server, rpc_server):
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    adb_port = adb_server.server_address[1]
+
+    rpc = http.client.HTTPConnection("127.0.0.1", rpc_server.server_address[1])
+    shell = AdbShell(lambda: _adb_connect_shell(adb_port))
+    try:
+        results = {
+            "uiautomator2": _timed(args.taps, lambda idx: _rpc_tap(rpc, 540, 1200, idx)),
+            "adb shell": _timed(args.taps, lambda idx: _one_shot_tap(adb_port, 540, 1200)),
+            "persistent shell": _timed(args.taps, lambda idx: shell.tap(540, 1200)),
+        }
+    finally:
+        shell.close()
+        rpc.close()
+        adb_server.shutdown()
+        rpc_server.shutdown()
+
+    for name, samples in results.items():
+        print(f"{name:<18} {_summary(samples)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
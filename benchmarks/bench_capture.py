@@ -0,0 +1,110 @@
+"""Measure how much smaller and faster reduced hierarchy captures are.
+
+For every dump of the benchmark corpus this compares:
+
+- ``full``: the dump as recorded, parsed without package filtering (the old path);
+- ``app``: the same dump parsed with foreign windows skipped (the current path);
+- ``reduced``: the dump a device-side filter would send, i.e. only app nodes,
+  only the attributes the client reads, and no single-child wrappers.
+
+The reduction is a model built here, not uiautomator's compressed mode: that
+mode also drops multi-child layout containers, which row grouping relies on,
+so these numbers do not show that the ``compact_dumps`` option is safe.
+
+Usage::
+
+    python benchmarks/bench_capture.py
+    python benchmarks/bench_capture.py --corpus captured_dumps/ --json capture.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+import timeit
+from xml.etree import ElementTree
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from corpus import load_corpus  # noqa: E402
+from helpers import load_module  # noqa: E402
+
+hierarchy_parser = load_module("hierarchy_parser")
+parse_hierarchy = hierarchy_parser.parse_hierarchy
+VIMAR_PACKAGE = load_module("const").VIMAR_PACKAGE
+
+# Attributes the parser and the client's selectors rely on.
+_KEPT_ATTRIBUTES = ("text", "resource-id", "class", "package", "bounds")
+
+
+def reduce_dump(hierarchy_xml: str, package: str = VIMAR_PACKAGE) -> str:
+    """Return the part of a dump a device-side package filter would transfer."""
+    root = ElementTree.fromstring(hierarchy_xml.encode())
+    reduced = ElementTree.Element(root.tag, root.attrib)
+    for child in root:
+        _reduce_node(child, reduced, package)
+    return ElementTree.tostring(reduced, encoding="unicode")
+
+
+def _reduce_node(node: ElementTree.Element, parent: ElementTree.Element, package: str) -> None:
+    if node.get("package", package) != package:
+        return
+    attrib = {key: node.get(key) for key in _KEPT_ATTRIBUTES if node.get(key)}
+    if node.get("scrollable") == "true":
+        attrib["scrollable"] = "true"
+    children = list(node)
+    if len(children) == 1 and not node.get("text") and "scrollable" not in attrib:
+        # A wrapper around a single child groups nothing; keep only the child.
+        _reduce_node(children[0], parent, package)
+        return
+    reduced = ElementTree.SubElement(parent, "node", attrib)
+    for child in children:
+        _reduce_node(child, reduced, package)
+
+
+def _parse_ms(xml: str, package: str | None) -> float:
+    number = max(1, 2000 // max(1, len(xml) // 1024))
+    runs = timeit.repeat(lambda: parse_hierarchy(xml, package=package), number=number, repeat=5)
+    return round(min(runs) / number * 1000, 3)
+
+
+def measure(xml: str) -> dict[str, float]:
+    reduced = reduce_dump(xml)
+    full_shades = parse_hierarchy(xml).shades
+    app_shades = parse_hierarchy(xml, package=VIMAR_PACKAGE).shades
+    reduced_shades = parse_hierarchy(reduced, package=VIMAR_PACKAGE).shades
+    if [shade.id for shade in reduced_shades] != [shade.id for shade in app_shades]:
+        raise AssertionError("the reduced dump lost or renamed shades")
+    return {
+        "shades": len(app_shades),
+        "foreign_shades": len(full_shades) - len(app_shades),
+        "full_kib": round(len(xml.encode()) / 1024, 1),
+        "reduced_kib": round(len(reduced.encode()) / 1024, 1),
+        "full_parse_ms": _parse_ms(xml, None),
+        "app_parse_ms": _parse_ms(xml, VIMAR_PACKAGE),
+        "reduced_parse_ms": _parse_ms(reduced, VIMAR_PACKAGE),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=pathlib.Path, help="directory with extra *.xml dumps")
+    parser.add_argument("--json", type=pathlib.Path, help="write the results to this file")
+    args = parser.parse_args()
+
+    results = {name: measure(xml) for name, xml in load_corpus(args.corpus)}
+    print(f"{'dump':<22} {'full KiB':>9} {'reduced':>9} {'full ms':>9} {'app ms':>9} {'reduced ms':>11}")
+    for name, row in results.items():
+        print(
+            f"{name:<22} {row['full_kib']:>9} {row['reduced_kib']:>9} {row['full_parse_ms']:>9} "
+            f"{row['app_parse_ms']:>9} {row['reduced_parse_ms']:>11}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
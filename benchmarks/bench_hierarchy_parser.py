@@ -0,0 +1,56 @@
+"""Microbenchmark: structural hierarchy parser on large shade lists.
+
+``unchanged ms`` is what the client spends on a capture whose app part matches
+the previous one: it fingerprints the dump and reuses the last parse.
+
+Run with ``python benchmarks/bench_hierarchy_parser.py``.
+"""
+
+from __future__ import annotations
+
+import pathlib
+import re
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from dumps import synthetic_shade_list  # noqa: E402
+from helpers import load_module  # noqa: E402
+
+parse_hierarchy = load_module("hierarchy_parser").parse_hierarchy
+fingerprint = load_module("vimar_android_client")._fingerprint
+
+
+def legacy_regex_scan(hierarchy_xml: str) -> tuple[list, list]:
+    """The flat text scan the structural parser replaced, kept for comparison."""
+    shades = []
+    candidates = re.findall(r'text="([^"]+)"', hierarchy_xml)
+    for idx, text in enumerate(candidates):
+        if "%" not in text:
+            continue
+        match = re.search(r"(\d{1,3})\s*%", text)
+        if match:
+            name = candidates[idx - 1] if idx > 0 else f"Shade {idx + 1}"
+            shades.append((re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_"), int(match.group(1))))
+    scenarios = [text for text in re.findall(r'text="([^"]+)"', hierarchy_xml) if re.search(r"(?i)(scenario|scena)", text)]
+    return shades, scenarios
+
+
+def main() -> None:
+    print(f"{'shades':>7} {'dump KiB':>9} {'structural ms':>14} {'unchanged ms':>13} {'legacy ms':>10}")
+    for count in (50, 200, 500):
+        dump = synthetic_shade_list(count)
+        assert len(parse_hierarchy(dump).shades) == count
+        runs = 20
+        structural = timeit.timeit(lambda: parse_hierarchy(dump), number=runs) / runs
+        unchanged = timeit.timeit(lambda: fingerprint(dump), number=runs) / runs
+        legacy = timeit.timeit(lambda: legacy_regex_scan(dump), number=runs) / runs
+        print(
+            f"{count:>7} {len(dump) / 1024:>9.1f} {structural * 1000:>14.2f} "
+            f"{unchanged * 1000:>13.2f} {legacy * 1000:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
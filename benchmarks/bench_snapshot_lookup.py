@@ -0,0 +1,59 @@
+"""Benchmark: entity state reads for one coordinator refresh.
+
+Each shade has a cover and three sensors; each entity reads a few properties
+per state write. Compares the former list-of-dicts scan with the id-indexed
+VimarSnapshot. Run with ``python benchmarks/bench_snapshot_lookup.py``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from helpers import load_module  # noqa: E402
+
+models = load_module("models")
+
+ENTITIES_PER_SHADE = 4
+READS_PER_ENTITY = 3
+
+
+def _records(count: int) -> list:
+    return [
+        models.ShadeState(id=f"shade_{idx}", name=f"Shade {idx}", position=idx % 101, is_moving=False)
+        for idx in range(count)
+    ]
+
+
+def refresh_list_of_dicts(records: list) -> None:
+    data = {"shades": [asdict(record) for record in records]}
+    for record in records:
+        for _ in range(ENTITIES_PER_SHADE * READS_PER_ENTITY):
+            for shade in data["shades"]:
+                if shade["id"] == record.id:
+                    break
+
+
+def refresh_indexed_snapshot(records: list) -> None:
+    snapshot = models.VimarSnapshot.from_records(records, [])
+    for record in records:
+        for _ in range(ENTITIES_PER_SHADE * READS_PER_ENTITY):
+            snapshot.shades.get(record.id)
+
+
+def main() -> None:
+    print(f"{'shades':>7} {'list scan ms':>13} {'indexed ms':>11}")
+    for count in (10, 100, 500):
+        records = _records(count)
+        runs = 5 if count >= 500 else 50
+        scan = timeit.timeit(lambda: refresh_list_of_dicts(records), number=runs) / runs
+        indexed = timeit.timeit(lambda: refresh_indexed_snapshot(records), number=runs) / runs
+        print(f"{count:>7} {scan * 1000:>13.2f} {indexed * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
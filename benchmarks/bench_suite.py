@@ -0,0 +1,159 @@
+"""Benchmark suite: parse time, allocations and end-to-end snapshot refreshes.
+
+Runs every dump of the corpus (recorded fixtures plus synthetic lists in two
+locales) through the hierarchy parser and through ``async_get_snapshot`` of a
+client driving a fake device with a configurable per-call latency. Needs
+neither Home Assistant nor a device::
+
+    python benchmarks/bench_suite.py --latency 0.03 --json results.json
+    python benchmarks/bench_suite.py --compare results.json
+
+``--compare`` prints the ratio to a previous ``--json`` run and exits with
+status 1 when a parse or snapshot time regressed by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import pathlib
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from corpus import load_corpus  # noqa: E402
+from fake_device import LatencyDevice  # noqa: E402
+from helpers import load_module  # noqa: E402
+
+parse_hierarchy = load_module("hierarchy_parser").parse_hierarchy
+VimarAndroidClient = load_module("vimar_android_client").VimarAndroidClient
+
+# Metrics checked by --compare; the rest are informational.
+TIMED_METRICS = ("parse_ms", "cold_snapshot_ms", "warm_snapshot_ms")
+
+
+def measure_parse(xml: str, repeat: int) -> dict[str, float]:
+    number = max(1, 2000 // max(1, len(xml) // 1024))
+    runs = timeit.repeat(lambda: parse_hierarchy(xml), number=number, repeat=repeat)
+    parsed = parse_hierarchy(xml)
+
+    tracemalloc.start()
+    try:
+        result = parse_hierarchy(xml)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+
+    return {
+        "shades": len(parsed.shades),
+        "scenarios": len(parsed.scenarios),
+        "dump_kib": round(len(xml) / 1024, 1),
+        "parse_ms": round(min(runs) / number * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+    }
+
+
+async def measure_snapshot(xml: str, latency: float, repeat: int) -> dict[str, float]:
+    """Time a first refresh (session setup) and repeated unchanged refreshes."""
+    client = VimarAndroidClient("127.0.0.1", 5555, None, "user", "password", None)
+    device = LatencyDevice(xml, latency)
+    client._device = device
+    try:
+        started = time.perf_counter()
+        await client.async_get_snapshot()
+        cold = time.perf_counter() - started
+        cold_trips = device.round_trips
+
+        warm_runs = []
+        for _ in range(repeat):
+            device.round_trips = 0
+            started = time.perf_counter()
+            await client.async_get_snapshot()
+            warm_runs.append(time.perf_counter() - started)
+    finally:
+        await client.async_disconnect()
+
+    return {
+        "cold_snapshot_ms": round(cold * 1000, 2),
+        "cold_round_trips": cold_trips,
+        "warm_snapshot_ms": round(statistics.median(warm_runs) * 1000, 2),
+        "warm_round_trips": device.round_trips,
+    }
+
+
+def run(latency: float, repeat: int, extra_dir: pathlib.Path | None) -> dict[str, dict[str, float]]:
+    results = {}
+    for name, xml in load_corpus(extra_dir):
+        results[name] = measure_parse(xml, repeat) | asyncio.run(measure_snapshot(xml, latency, repeat))
+    return results
+
+
+def print_table(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]] | None) -> None:
+    columns = (
+        "shades",
+        "dump_kib",
+        "parse_ms",
+        "peak_kib",
+        "retained_kib",
+        "cold_snapshot_ms",
+        "cold_round_trips",
+        "warm_snapshot_ms",
+        "warm_round_trips",
+    )
+    width = max(len(name) for name in results)
+    print(f"{'dump':<{width}} " + " ".join(f"{column:>{len(column)}}" for column in columns))
+    for name, row in results.items():
+        cells = []
+        for column in columns:
+            cell = f"{row[column]:g}"
+            if baseline and column in TIMED_METRICS and baseline.get(name, {}).get(column):
+                cell += f" x{row[column] / baseline[name][column]:.2f}"
+            cells.append(f"{cell:>{len(column)}}")
+        print(f"{name:<{width}} " + " ".join(cells))
+
+
+def regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+    found = []
+    for name, row in results.items():
+        for metric in TIMED_METRICS:
+            previous = baseline.get(name, {}).get(metric)
+            if previous and row[metric] > previous * (1 + tolerance):
+                found.append(f"{name} {metric}: {previous:g} -> {row[metric]:g}")
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.03, help="seconds per fake device call")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions per measurement")
+    parser.add_argument("--corpus", type=pathlib.Path, help="directory with additional recorded dumps")
+    parser.add_argument("--json", type=pathlib.Path, help="write results to this file")
+    parser.add_argument("--compare", type=pathlib.Path, help="results of a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare")
+    args = parser.parse_args()
+
+    results = run(args.latency, args.repeat, args.corpus)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_table(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+    if baseline:
+        found = regressions(results, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
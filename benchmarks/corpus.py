@@ -0,0 +1,28 @@
+"""Dump corpus for the benchmark suite: recorded fixtures plus synthetic lists."""
+
+from __future__ import annotations
+
+import pathlib
+
+from dumps import synthetic_shade_list
+
+FIXTURES = pathlib.Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+
+# (shades, scenarios, locale) of the synthetic dumps.
+SYNTHETIC_SIZES = ((10, 4, "it"), (50, 10, "en"), (200, 10, "it"), (500, 20, "en"))
+
+
+def load_corpus(extra_dir: pathlib.Path | None = None) -> list[tuple[str, str]]:
+    """Return ``(name, xml)`` pairs, smallest recorded dumps first.
+
+    ``extra_dir`` adds every ``*.xml`` in it, e.g. dumps captured from a real
+    device with ``adb exec-out uiautomator dump /dev/tty``.
+    """
+    corpus = [(path.stem, path.read_text(encoding="utf-8")) for path in sorted(FIXTURES.glob("*.xml"))]
+    if extra_dir is not None:
+        corpus += [(path.stem, path.read_text(encoding="utf-8")) for path in sorted(extra_dir.glob("*.xml"))]
+    corpus += [
+        (f"synthetic_{locale}_{shades}", synthetic_shade_list(shades, scenarios, locale))
+        for shades, scenarios, locale in SYNTHETIC_SIZES
+    ]
+    return corpus
@@ -0,0 +1,65 @@
+"""Synthetic uiautomator dumps shaped like the Vimar View app shade list."""
+
+from __future__ import annotations
+
+_ATTRS = (
+    'checkable="false" checked="false" enabled="true" focusable="false" focused="false" '
+    'long-clickable="false" password="false" selected="false"'
+)
+
+
+def _node(text: str, cls: str, rid: str, bounds: str, pkg: str = "it.vimar.View", **extra: str) -> str:
+    flags = " ".join(f'{key}="{value}"' for key, value in extra.items())
+    return (
+        f'<node index="0" text="{text}" resource-id="{rid}" class="{cls}" package="{pkg}" '
+        f'content-desc="" {_ATTRS} {flags} bounds="{bounds}"'
+    )
+
+
+# App labels per locale: shade name prefix, room subtitle, row buttons, list
+# title and scenario tile prefix.
+LOCALES = {
+    "en": ("Shade", "Ground floor", ("Up", "Stop", "Down"), "Shades", "Scenario"),
+    "it": ("Tapparella", "Piano terra", ("Su", "Ferma", "Giu"), "Tapparelle", "Scena"),
+}
+
+
+def _row(idx: int, top: int, locale: str) -> str:
+    shade, room, actions, _, _ = LOCALES[locale]
+    lines = [
+        _node("", "android.widget.LinearLayout", "it.vimar.View:id/shade_row", f"[0,{top}][1080,{top + 160}]", clickable="true") + ">",
+        "  " + _node(f"{shade} {idx:03d}", "android.widget.TextView", "it.vimar.View:id/shade_name", f"[48,{top + 20}][700,{top + 80}]") + " />",
+        "  " + _node(room, "android.widget.TextView", "it.vimar.View:id/shade_room", f"[48,{top + 84}][700,{top + 130}]") + " />",
+        "  " + _node(f"{(idx * 7) % 101}%", "android.widget.TextView", "it.vimar.View:id/shade_position", f"[720,{top + 20}][860,{top + 80}]") + " />",
+    ]
+    for offset, action in enumerate(actions):
+        left = 880 + offset * 64
+        lines.append(
+            "  "
+            + _node(action, "android.widget.Button", f"it.vimar.View:id/btn_{action.lower()}", f"[{left},{top + 20}][{left + 60},{top + 140}]", clickable="true")
+            + " />"
+        )
+    lines.append("</node>")
+    return "\n".join(lines)
+
+
+def synthetic_shade_list(shades: int, scenarios: int = 10, locale: str = "en") -> str:
+    """Return a dump with ``shades`` list rows plus a row of scenario tiles."""
+    _, _, _, title, scenario = LOCALES[locale]
+    parts = [
+        "<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>",
+        '<hierarchy rotation="0">',
+        _node("", "android.widget.FrameLayout", "android:id/content", "[0,63][1080,2280]") + ">",
+        _node(title, "android.widget.TextView", "it.vimar.View:id/toolbar_title", "[48,80][600,200]") + " />",
+        _node("", "androidx.recyclerview.widget.RecyclerView", "it.vimar.View:id/list", "[0,220][1080,2200]", scrollable="true") + ">",
+    ]
+    parts.extend(_row(idx, 220 + idx * 160, locale) for idx in range(shades))
+    parts.append("</node>")
+    parts.extend(
+        _node(f"{scenario} {idx:02d}", "android.widget.Button", "it.vimar.View:id/scenario_tile", "[0,0][0,0]", clickable="true") + " />"
+        for idx in range(scenarios)
+    )
+    parts.append("</node>")
+    parts.append(_node("10:42", "android.widget.TextView", "com.android.systemui:id/clock", "[32,0][120,63]", pkg="com.android.systemui") + " />")
+    parts.append("</hierarchy>")
+    return "\n".join(parts)
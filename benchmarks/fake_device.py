@@ -0,0 +1,75 @@
+"""uiautomator2 device double with a fixed per-call latency."""
+
+from __future__ import annotations
+
+import time
+
+
+class _Scroll:
+    def __init__(self, device: LatencyDevice) -> None:
+        self._device = device
+
+    def forward(self) -> bool:
+        # The list is a single page: scrolling never moves it.
+        self._device.round_trip()
+        return False
+
+    def toBeginning(self) -> bool:  # noqa: N802 - uiautomator2 API name
+        self._device.round_trip()
+        return False
+
+
+class _Selector:
+    def __init__(self, device: LatencyDevice, query: dict) -> None:
+        self._device = device
+        self._query = query
+
+    @property
+    def scroll(self) -> _Scroll:
+        return _Scroll(self._device)
+
+    def exists(self, timeout: float = 0) -> bool:
+        # The list is a single page and no login form is shown.
+        self._device.round_trip()
+        return False
+
+
+class LatencyDevice:
+    """Serve one hierarchy dump; every device call costs ``latency`` seconds.
+
+    Implements the part of the uiautomator2 API used by a snapshot refresh and
+    counts round trips, so results separate device time from parsing time.
+    """
+
+    def __init__(self, hierarchy: str, latency: float, package: str = "it.vimar.View") -> None:
+        self.hierarchy = hierarchy
+        self.latency = latency
+        self.package = package
+        self.round_trips = 0
+
+    def round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def info(self) -> dict:
+        self.round_trip()
+        return {"screenOn": True}
+
+    def __call__(self, **kwargs) -> _Selector:
+        return _Selector(self, kwargs)
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self.round_trip()
+
+    def app_current(self) -> dict:
+        self.round_trip()
+        return {"package": self.package, "activity": ".MainActivity"}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        self.round_trip()
+        return self.hierarchy
+
+    def press(self, key: str) -> None:
+        self.round_trip()
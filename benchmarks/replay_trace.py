@@ -0,0 +1,85 @@
+"""Replay a recorded Vimar device trace against the current client code.
+
+Record a trace by setting the "Record device trace to file" option of the
+integration, then run::
+
+    python benchmarks/replay_trace.py vimar_trace.jsonl --time-scale 1
+    python benchmarks/replay_trace.py vimar_trace.jsonl --time-scale 0 --strict
+
+The polls and commands of the recorded session are issued again, in order, by
+a fresh client driving a ReplayDevice. ``--time-scale 1`` reproduces the
+recorded device latencies, ``0`` leaves only client-side time. Running the same
+trace on two checkouts compares client versions against identical traffic.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import pathlib
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1] / "tests"))
+
+from helpers import load_module  # noqa: E402
+
+trace = load_module("trace")
+models = load_module("models")
+VimarAndroidClient = load_module("vimar_android_client").VimarAndroidClient
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict) and {"name", "action"} <= value.keys():
+        return models.ShadeOperation(**value)
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+async def replay(path: pathlib.Path, time_scale: float, strict: bool) -> tuple[list[tuple[str, float, str]], Any, Any]:
+    """Issue the recorded operations again; return (op, seconds, outcome) rows."""
+    header, events = trace.load_trace(path)
+    device = trace.ReplayDevice(events, time_scale=time_scale, strict=strict)
+    client = VimarAndroidClient("127.0.0.1", 5555, header.get("serial"), "user", "password", None)
+    client._device = device
+
+    rows = []
+    try:
+        for event in events:
+            if "op" not in event:
+                continue
+            method = getattr(client, f"async_{event['op']}")
+            started = time.perf_counter()
+            try:
+                await method(*_decode(event["args"]))
+                outcome = "ok"
+            except trace.TraceMismatchError:
+                raise
+            except Exception as err:  # noqa: BLE001 - recorded failures replay as failures
+                outcome = f"error: {err}"
+            rows.append((event["op"], time.perf_counter() - started, outcome))
+    finally:
+        await client.async_disconnect()
+    return rows, device, client.metrics
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", type=pathlib.Path)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="multiplier for recorded latencies")
+    parser.add_argument("--strict", action="store_true", help="require the exact recorded call order")
+    args = parser.parse_args()
+
+    rows, device, metrics = asyncio.run(replay(args.trace, args.time_scale, args.strict))
+    for op, seconds, outcome in rows:
+        print(f"{op:<22} {seconds * 1000:>9.1f} ms  {outcome}")
+    print(f"\n{len(rows)} operations, {device.served} device calls ({device.skipped} skipped, {device.reused} reused)")
+    for phase, stats in metrics.as_dict().items():
+        print(f"{phase:<16} n={stats['count']:<5} p50={stats['p50_ms']} ms p95={stats['p95_ms']} ms max={stats['max_ms']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
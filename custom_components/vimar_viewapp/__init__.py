@@ -2,62 +2,170 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+import logging
+from pathlib import Path
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
+    CONF_ADB_FAST_PATH,
     CONF_ADB_HOST,
     CONF_ADB_PORT,
+    CONF_COMPACT_DUMPS,
+    CONF_DETAIL_BUDGET,
+    CONF_EXTRA_DEVICES,
+    CONF_MAX_POLL_INTERVAL,
     CONF_PASSWORD,
     CONF_PIN,
     CONF_POLL_INTERVAL,
+    CONF_PUSH_UPDATES,
     CONF_SERIAL,
+    CONF_TRACE_FILE,
     CONF_USERNAME,
     DATA_CLIENT,
     DATA_COORDINATOR,
+    DATA_METRICS,
+    DEFAULT_ADB_FAST_PATH,
+    DEFAULT_COMPACT_DUMPS,
+    DEFAULT_DETAIL_BUDGET,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DETAIL_CRAWL_INTERVAL,
+    DOMAIN,
+    EVENT_LOG_PATTERN,
+    KEEPALIVE_INTERVAL,
     PLATFORMS,
 )
 from .coordinator import VimarDataUpdateCoordinator
+from .device_pool import VimarDevicePool, parse_adb_endpoints
+from .event_watcher import DeviceEventWatcher, LogcatStream
+from .metrics import PhaseMetrics
+from .services import async_setup_services, async_unload_services
+from .snapshot_store import VimarSnapshotStore
 from .vimar_android_client import VimarAndroidClient
 
+_LOGGER = logging.getLogger(__name__)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Vimar integration from config entry."""
-    client = VimarAndroidClient(
-        adb_host=entry.data[CONF_ADB_HOST],
-        adb_port=entry.data[CONF_ADB_PORT],
-        serial=entry.data.get(CONF_SERIAL),
-        username=entry.data[CONF_USERNAME],
-        password=entry.data[CONF_PASSWORD],
-        pin=entry.data.get(CONF_PIN),
+    endpoints = [(entry.data[CONF_ADB_HOST], entry.data[CONF_ADB_PORT], entry.data.get(CONF_SERIAL))]
+    endpoints += parse_adb_endpoints(entry.options.get(CONF_EXTRA_DEVICES, entry.data.get(CONF_EXTRA_DEVICES)))
+    metrics = PhaseMetrics()
+    trace_file = entry.options.get(CONF_TRACE_FILE)
+    client = VimarDevicePool(
+        [
+            VimarAndroidClient(
+                adb_host=adb_host or entry.data[CONF_ADB_HOST],
+                adb_port=adb_port or entry.data[CONF_ADB_PORT],
+                serial=serial,
+                username=entry.data[CONF_USERNAME],
+                password=entry.data[CONF_PASSWORD],
+                pin=entry.data.get(CONF_PIN),
+                metrics=metrics,
+                trace_path=_trace_path(hass, trace_file, index) if trace_file else None,
+                compact_dumps=entry.options.get(CONF_COMPACT_DUMPS, DEFAULT_COMPACT_DUMPS),
+                adb_fast_path=entry.options.get(CONF_ADB_FAST_PATH, DEFAULT_ADB_FAST_PATH),
+            )
+            for index, (adb_host, adb_port, serial) in enumerate(endpoints)
+        ]
     )
-    await client.async_connect()
-
+    store = VimarSnapshotStore(hass, entry.entry_id)
     coordinator = VimarDataUpdateCoordinator(
         hass,
         client,
         poll_interval=entry.options.get(CONF_POLL_INTERVAL, entry.data[CONF_POLL_INTERVAL]),
+        max_poll_interval=entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+        store=store,
+        detail_budget=entry.options.get(CONF_DETAIL_BUDGET, DEFAULT_DETAIL_BUDGET),
     )
-    await coordinator.async_config_entry_first_refresh()
+
+    # With a stored snapshot, entities are created right away and the emulator is
+    # connected in the background; without one there is nothing to create yet.
+    if (snapshot := await store.async_load()) is not None:
+        coordinator.async_restore(snapshot)
+        entry.async_create_background_task(
+            hass,
+            _async_start_live_updates(client, coordinator),
+            f"{DOMAIN}_connect_{entry.entry_id}",
+        )
+    else:
+        await client.async_connect()
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(entry.domain, {})[entry.entry_id] = {
         DATA_CLIENT: client,
         DATA_COORDINATOR: coordinator,
+        DATA_METRICS: metrics,
     }
 
+    async def _async_keepalive(_now: datetime) -> None:
+        await client.async_keepalive()
+
+    entry.async_on_unload(async_track_time_interval(hass, _async_keepalive, timedelta(seconds=KEEPALIVE_INTERVAL)))
+
+    if coordinator.detail_budget:
+
+        async def _async_crawl_details(_now: datetime) -> None:
+            await coordinator.async_crawl_details()
+
+        entry.async_on_unload(
+            async_track_time_interval(hass, _async_crawl_details, timedelta(seconds=DETAIL_CRAWL_INTERVAL))
+        )
+
+    if entry.options.get(CONF_PUSH_UPDATES, False):
+        # Activity on the primary device is enough to know the state changed.
+        serial = client.devices[0].name
+        watcher = DeviceEventWatcher(
+            lambda: LogcatStream(serial),
+            coordinator.async_handle_device_event,
+            pattern=EVENT_LOG_PATTERN,
+            name=f"{DOMAIN}_events_{serial}",
+        )
+        coordinator.watcher = watcher
+        watcher.start(hass.loop)
+        entry.async_on_unload(watcher.stop)
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
     return True
 
 
+def _trace_path(hass: HomeAssistant, trace_file: str, index: int) -> str:
+    """Resolve the trace file of one pool device; extra devices get a numbered file."""
+    path = Path(hass.config.path(trace_file))
+    if index:
+        path = path.with_name(f"{path.stem}.{index}{path.suffix}")
+    return str(path)
+
+
+async def _async_start_live_updates(client: VimarDevicePool, coordinator: VimarDataUpdateCoordinator) -> None:
+    """Connect the devices and replace the stored snapshot with live data."""
+    try:
+        await client.async_connect()
+    except Exception as err:  # noqa: BLE001 - devices are reconnected on the next poll
+        _LOGGER.warning("Vimar devices not reachable yet, retrying with the next poll: %s", err)
+    await coordinator.async_refresh()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[entry.domain].pop(entry.entry_id)
+        data = hass.data[entry.domain].pop(entry.entry_id)
+        await data[DATA_CLIENT].async_disconnect()
+        async_unload_services(hass)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored snapshot of a removed config entry."""
+    await VimarSnapshotStore(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -0,0 +1,121 @@
+"""Persistent ADB shell for input events, bypassing uiautomator2's HTTP round trips."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import itertools
+import logging
+import socket
+
+from .const import ADB_SHELL_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+_MARKER = "__vimar_done__"
+
+
+class AdbShellError(RuntimeError):
+    """Raised when a shell command fails or the shell connection is lost."""
+
+
+class AdbShell:
+    """Run commands in one long-lived ``sh`` on the device.
+
+    The shell is started through the ADB ``exec:`` service, so every command is a
+    single write and read on an already open socket instead of a new ADB
+    transport, or an HTTP request to the uiautomator2 server. Each command is
+    followed by an ``echo`` of a numbered marker and its exit status, which
+    delimits its output.
+    """
+
+    def __init__(self, open_connection: Callable[[], socket.socket], timeout: float = ADB_SHELL_TIMEOUT) -> None:
+        self._open_connection = open_connection
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._buffer = b""
+        self._sequence = itertools.count()
+
+    @classmethod
+    def for_serial(cls, serial: str, timeout: float = ADB_SHELL_TIMEOUT) -> AdbShell:
+        """Open the shell through the local ADB server, as uiautomator2 does."""
+        import adbutils  # noqa: PLC0415 - installed with uiautomator2, only needed here
+
+        def open_connection() -> socket.socket:
+            connection = adbutils.adb.device(serial=serial).open_transport(timeout=timeout)
+            connection.send_command("exec:sh")
+            connection.check_okay()
+            return connection.conn
+
+        return cls(open_connection, timeout)
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def run(self, command: str) -> str:
+        """Run a command and return its output; a non-zero exit status raises."""
+        sock = self._connect()
+        marker = f"{_MARKER}{next(self._sequence)}"
+        try:
+            sock.sendall(f"{command} 2>&1; echo {marker} $?\n".encode())
+            output, status = self._read_until(sock, marker.encode())
+        except OSError as err:
+            self.close()
+            raise AdbShellError(f"ADB shell connection lost: {err}") from err
+        if status != 0:
+            raise AdbShellError(f"'{command}' exited with status {status}: {output.strip()}")
+        return output
+
+    def tap(self, x: int, y: int) -> None:
+        self.run(f"input tap {x} {y}")
+
+    def swipe(self, x1: int, y1: int, x2: int, y2: int, duration_ms: int = 200) -> None:
+        self.run(f"input swipe {x1} {y1} {x2} {y2} {duration_ms}")
+
+    def key(self, keycode: int) -> None:
+        self.run(f"input keyevent {keycode}")
+
+    def dump(self, compressed: bool = False) -> str:
+        """Capture the hierarchy with the device's own ``uiautomator dump``.
+
+        The command needs the accessibility connection uiautomator2 normally
+        holds, so the client keeps using uiautomator2 for dumps.
+        """
+        flag = " --compressed" if compressed else ""
+        output = self.run(f"uiautomator dump{flag} /dev/tty")
+        start, end = output.find("<?xml"), output.rfind(">")
+        if start < 0 or end < start:
+            raise AdbShellError(f"No hierarchy in uiautomator dump output: {output[:200]}")
+        return output[start : end + 1]
+
+    def close(self) -> None:
+        sock, self._sock = self._sock, None
+        self._buffer = b""
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError as err:
+                _LOGGER.debug("Closing the ADB shell failed: %s", err)
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            try:
+                sock = self._open_connection()
+            except Exception as err:
+                raise AdbShellError(f"Unable to open an ADB shell: {err}") from err
+            sock.settimeout(self._timeout)
+            self._sock = sock
+        return self._sock
+
+    def _read_until(self, sock: socket.socket, marker: bytes) -> tuple[str, int]:
+        while True:
+            idx = self._buffer.find(marker)
+            if idx >= 0 and (end := self._buffer.find(b"\n", idx)) >= 0:
+                output = self._buffer[:idx]
+                status = self._buffer[idx + len(marker) : end].strip()
+                self._buffer = self._buffer[end + 1 :]
+                return output.decode(errors="replace"), int(status or 0)
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionResetError("shell exited")
+            self._buffer += chunk
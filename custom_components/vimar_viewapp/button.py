@@ -10,7 +10,8 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DATA_CLIENT, DATA_COORDINATOR, DOMAIN
 from .coordinator import VimarDataUpdateCoordinator
-from .vimar_android_client import VimarAndroidClient
+from .device_pool import VimarDevicePool
+from .models import Scenario
 
 
 async def async_setup_entry(
@@ -20,11 +21,11 @@ async def async_setup_entry(
 ) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: VimarDataUpdateCoordinator = data[DATA_COORDINATOR]
-    client: VimarAndroidClient = data[DATA_CLIENT]
+    client: VimarDevicePool = data[DATA_CLIENT]
 
     entities = [
-        VimarScenarioButton(client, coordinator, scenario["id"])
-        for scenario in coordinator.data.get("scenarios", [])
+        VimarScenarioButton(client, coordinator, scenario_id)
+        for scenario_id in coordinator.data.scenarios
     ]
     async_add_entities(entities)
 
@@ -34,20 +35,17 @@ class VimarScenarioButton(CoordinatorEntity[VimarDataUpdateCoordinator], ButtonE
 
     def __init__(
         self,
-        client: VimarAndroidClient,
+        client: VimarDevicePool,
         coordinator: VimarDataUpdateCoordinator,
         scenario_id: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=scenario_id)
         self._client = client
         self._scenario_id = scenario_id
 
     @property
-    def _scenario(self):
-        for scenario in self.coordinator.data.get("scenarios", []):
-            if scenario["id"] == self._scenario_id:
-                return scenario
-        return None
+    def _scenario(self) -> Scenario | None:
+        return self.coordinator.data.scenarios.get(self._scenario_id)
 
     @property
     def unique_id(self) -> str:
@@ -56,9 +54,9 @@ class VimarScenarioButton(CoordinatorEntity[VimarDataUpdateCoordinator], ButtonE
     @property
     def name(self) -> str | None:
         scenario = self._scenario
-        return scenario["name"] if scenario else self._scenario_id
+        return scenario.name if scenario else self._scenario_id
 
     async def async_press(self) -> None:
         scenario = self._scenario
         if scenario:
-            await self._client.async_run_scenario(scenario["name"])
+            await self._client.async_run_scenario(scenario.name)
@@ -0,0 +1,259 @@
+"""Order the polls and commands waiting for one device by priority, with deadlines."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import IntEnum
+import itertools
+import logging
+import time
+from typing import Any
+
+from .const import COMMAND_DEADLINE, PHASE_QUEUE_WAIT, POLL_DEADLINE, SHADE_ACTION_STOP, STOP_DEADLINE
+from .metrics import PhaseMetrics
+from .models import ShadeOperation, ShadeState
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Order in which queued device work is started; lower starts first."""
+
+    STOP = 0
+    COMMAND = 1
+    POLL = 2
+    BACKGROUND = 3
+
+
+_DEADLINES = {
+    Priority.STOP: STOP_DEADLINE,
+    Priority.COMMAND: COMMAND_DEADLINE,
+    Priority.POLL: POLL_DEADLINE,
+    Priority.BACKGROUND: POLL_DEADLINE,
+}
+
+
+class ShadeBatchError(RuntimeError):
+    """Raised when some operations of a shade batch failed."""
+
+    def __init__(self, failures: dict[str, str]) -> None:
+        super().__init__(
+            "Shade batch failed for " + ", ".join(f"'{name}': {error}" for name, error in failures.items())
+        )
+        self.failures = failures
+
+
+class DeadlineExceededError(RuntimeError):
+    """Raised when device work did not finish before its deadline."""
+
+
+@dataclass(slots=True, eq=False)
+class _Job:
+    priority: Priority
+    sequence: int
+    submitted: float
+    deadline: float
+    future: asyncio.Future[Any]
+    run: Callable[[float], Awaitable[Any]] | None = None
+    key: str | None = None
+    operation: ShadeOperation | None = None
+    read_back: bool = False
+    waiters: int = 1
+
+    def order(self) -> tuple[int, int]:
+        return self.priority, self.sequence
+
+
+class CommandScheduler:
+    """Start the work queued for one device by priority instead of arrival.
+
+    The device worker runs one operation at a time; this queue decides which
+    one goes next. Stops start before other shade commands, and commands before
+    polls. A command for a shade replaces the one still queued for that shade,
+    and all queued shade commands start together as one batch. Polls and
+    background checks with the same key share one queued run.
+
+    Every operation has a deadline. Queued work past it is dropped, and callers
+    stop waiting for work that is still running past it. Running work receives
+    its deadline to cut its own waits short; a stop may still wait for the step
+    in progress to finish.
+    """
+
+    def __init__(
+        self,
+        run_operations: Callable[[list[ShadeOperation], bool, float], Awaitable[list[ShadeState]]],
+        metrics: PhaseMetrics | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._run_operations = run_operations
+        self._metrics = metrics or PhaseMetrics()
+        self._clock = clock
+        self._queue: list[_Job] = []
+        self._running: list[_Job] = []
+        self._sequence = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+        self.superseded = 0
+        self.expired = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of operations waiting to start."""
+        return len(self._queue)
+
+    async def async_submit(
+        self,
+        priority: Priority,
+        run: Callable[[float], Awaitable[Any]],
+        key: str | None = None,
+        timeout: float | None = None,
+    ) -> Any:
+        """Queue ``run`` and return its result; queued runs with the same ``key`` are shared.
+
+        ``run`` is called with the deadline, in ``clock`` time, it should finish by.
+        """
+        for job in self._queue:
+            if key is not None and job.key == key:
+                job.waiters += 1
+                job.priority = min(job.priority, priority)
+                return await self._async_wait(job)
+        return await self._async_wait(self._enqueue(priority, timeout, run=run, key=key))
+
+    async def async_submit_operation(
+        self, operation: ShadeOperation, read_back: bool = True, timeout: float | None = None
+    ) -> ShadeState | None:
+        """Queue a shade command and return the row read back after it, if any.
+
+        Returns None as well when a newer command for the same shade replaced
+        this one before it started.
+        """
+        for job in [job for job in self._queue if job.operation and job.operation.name == operation.name]:
+            _LOGGER.debug("Queued %s of '%s' replaced by %s", job.operation.action, operation.name, operation.action)
+            self._queue.remove(job)
+            self.superseded += 1
+            _resolve(job, None)
+        priority = Priority.STOP if operation.action == SHADE_ACTION_STOP else Priority.COMMAND
+        return await self._async_wait(self._enqueue(priority, timeout, operation=operation, read_back=read_back))
+
+    def close(self) -> None:
+        """Fail queued and running work, e.g. because the device was disconnected."""
+        jobs = self._queue + self._running
+        self._queue, self._running = [], []
+        for job in jobs:
+            _resolve(job, error=RuntimeError("Device disconnected"))
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "running": len(self._running),
+            "superseded": self.superseded,
+            "expired": self.expired,
+        }
+
+    def _enqueue(self, priority: Priority, timeout: float | None, **kwargs: Any) -> _Job:
+        now = self._clock()
+        job = _Job(
+            priority=priority,
+            sequence=next(self._sequence),
+            submitted=now,
+            deadline=now + (_DEADLINES[priority] if timeout is None else timeout),
+            future=asyncio.get_running_loop().create_future(),
+            **kwargs,
+        )
+        self._queue.append(job)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._async_drain())
+        return job
+
+    async def _async_wait(self, job: _Job) -> Any:
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), max(0.0, job.deadline - self._clock()))
+        except TimeoutError:
+            self.expired += 1
+            self._abandon(job)
+            raise DeadlineExceededError(
+                f"Device operation still {'running' if job in self._running else 'queued'} at its deadline"
+            ) from None
+        except asyncio.CancelledError:
+            self._abandon(job)
+            raise
+
+    def _abandon(self, job: _Job) -> None:
+        job.waiters -= 1
+        if job.waiters:
+            return
+        if job in self._queue:
+            self._queue.remove(job)
+        # Nobody waits for the result any more; a running job just finishes.
+        job.future.cancel()
+
+    async def _async_drain(self) -> None:
+        try:
+            while jobs := self._next():
+                self._running = jobs
+                wait = self._metrics.histogram(PHASE_QUEUE_WAIT)
+                now = self._clock()
+                for job in jobs:
+                    wait.record(now - job.submitted)
+                if jobs[0].operation is None:
+                    await self._async_run_call(jobs[0])
+                else:
+                    await self._async_run_batch(jobs)
+                self._running = []
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    def _next(self) -> list[_Job]:
+        """Take the next job off the queue; shade commands are taken all at once."""
+        if not self._queue:
+            return []
+        first = min(self._queue, key=_Job.order)
+        if first.operation is None:
+            jobs = [first]
+        else:
+            jobs = sorted((job for job in self._queue if job.operation is not None), key=_Job.order)
+        for job in jobs:
+            self._queue.remove(job)
+        return jobs
+
+    async def _async_run_call(self, job: _Job) -> None:
+        assert job.run is not None
+        try:
+            result = await job.run(job.deadline)
+        except Exception as err:  # noqa: BLE001 - handed to the caller
+            _resolve(job, error=err)
+        else:
+            _resolve(job, result)
+
+    async def _async_run_batch(self, jobs: list[_Job]) -> None:
+        operations = [job.operation for job in jobs if job.operation is not None]
+        try:
+            # Each caller gives up at its own deadline; the batch runs until the last.
+            states = await self._run_operations(
+                operations, any(job.read_back for job in jobs), max(job.deadline for job in jobs)
+            )
+        except ShadeBatchError as err:
+            for job, operation in zip(jobs, operations):
+                failure = err.failures.get(operation.name)
+                _resolve(job, None, RuntimeError(failure) if failure is not None else None)
+        except Exception as err:  # noqa: BLE001 - handed to the callers
+            for job in jobs:
+                _resolve(job, error=err)
+        else:
+            by_name = {state.name: state for state in states}
+            for job, operation in zip(jobs, operations):
+                _resolve(job, by_name.get(operation.name))
+
+
+def _resolve(job: _Job, result: Any = None, error: BaseException | None = None) -> None:
+    if job.future.done():
+        return
+    if error is not None:
+        job.future.set_exception(error)
+    else:
+        job.future.set_result(result)
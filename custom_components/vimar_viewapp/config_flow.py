@@ -10,15 +10,26 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 
 from .const import (
+    CONF_ADB_FAST_PATH,
     CONF_ADB_HOST,
     CONF_ADB_PORT,
+    CONF_COMPACT_DUMPS,
+    CONF_DETAIL_BUDGET,
+    CONF_EXTRA_DEVICES,
+    CONF_MAX_POLL_INTERVAL,
     CONF_PASSWORD,
     CONF_PIN,
     CONF_POLL_INTERVAL,
+    CONF_PUSH_UPDATES,
     CONF_SERIAL,
+    CONF_TRACE_FILE,
     CONF_USERNAME,
+    DEFAULT_ADB_FAST_PATH,
     DEFAULT_ADB_HOST,
     DEFAULT_ADB_PORT,
+    DEFAULT_COMPACT_DUMPS,
+    DEFAULT_DETAIL_BUDGET,
+    DEFAULT_MAX_POLL_INTERVAL,
     DEFAULT_POLL_INTERVAL,
     DOMAIN,
 )
@@ -46,6 +57,7 @@ class VimarViewAppConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_PASSWORD): str,
                 vol.Optional(CONF_PIN): str,
                 vol.Required(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): int,
+                vol.Optional(CONF_EXTRA_DEVICES): str,
             }
         )
 
@@ -76,6 +88,37 @@ class VimarViewAppOptionsFlow(config_entries.OptionsFlow):
                         self.config_entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
                     ),
                 ): int,
+                vol.Required(
+                    CONF_MAX_POLL_INTERVAL,
+                    default=self.config_entry.options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL),
+                ): int,
+                vol.Optional(
+                    CONF_EXTRA_DEVICES,
+                    default=self.config_entry.options.get(
+                        CONF_EXTRA_DEVICES,
+                        self.config_entry.data.get(CONF_EXTRA_DEVICES, ""),
+                    ),
+                ): str,
+                vol.Optional(
+                    CONF_TRACE_FILE,
+                    description={"suggested_value": self.config_entry.options.get(CONF_TRACE_FILE)},
+                ): str,
+                vol.Optional(
+                    CONF_PUSH_UPDATES,
+                    default=self.config_entry.options.get(CONF_PUSH_UPDATES, False),
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_DUMPS,
+                    default=self.config_entry.options.get(CONF_COMPACT_DUMPS, DEFAULT_COMPACT_DUMPS),
+                ): bool,
+                vol.Optional(
+                    CONF_ADB_FAST_PATH,
+                    default=self.config_entry.options.get(CONF_ADB_FAST_PATH, DEFAULT_ADB_FAST_PATH),
+                ): bool,
+                vol.Optional(
+                    CONF_DETAIL_BUDGET,
+                    default=self.config_entry.options.get(CONF_DETAIL_BUDGET, DEFAULT_DETAIL_BUDGET),
+                ): vol.All(int, vol.Range(min=0)),
             }
         )
 
@@ -12,17 +12,212 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_PIN = "pin"
 CONF_POLL_INTERVAL = "poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+CONF_EXTRA_DEVICES = "extra_devices"
+CONF_TRACE_FILE = "trace_file"
+CONF_PUSH_UPDATES = "push_updates"
+CONF_COMPACT_DUMPS = "compact_dumps"
+CONF_ADB_FAST_PATH = "adb_fast_path"
+CONF_DETAIL_BUDGET = "detail_budget"
 
 DEFAULT_ADB_HOST = "127.0.0.1"
 DEFAULT_ADB_PORT = 5555
 DEFAULT_POLL_INTERVAL = 20
+DEFAULT_MAX_POLL_INTERVAL = 300
+
+# Poll interval (seconds) used after commands and while shades move, and for how
+# long after a command it stays in effect.
+FAST_POLL_INTERVAL = 3
+FAST_POLL_WINDOW = 30
+
+# Seconds a failing pool device is skipped, doubling per consecutive failure.
+DEVICE_RETRY_BACKOFF = 10
+DEVICE_MAX_BACKOFF = 300
+
+# Storage of the last good snapshot, used to create entities at startup.
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
 
 DATA_CLIENT = "client"
 DATA_COORDINATOR = "coordinator"
+DATA_METRICS = "metrics"
+
+# Timed phases of client operations. The first three are whole operations as
+# seen by callers, including time spent waiting for the device worker; the
+# queue wait is the part of it spent behind other work for the same device.
+PHASE_SNAPSHOT = "snapshot"
+PHASE_COMMAND = "command"
+PHASE_SCENARIO = "scenario"
+PHASE_APP_START = "app_start"
+PHASE_LOGIN = "login_probe"
+PHASE_DUMP = "dump_hierarchy"
+PHASE_PARSE = "parse"
+PHASE_CRAWL = "crawl"
+PHASE_SELECTOR = "selector_wait"
+PHASE_TAP = "tap"
+PHASE_QUEUE_WAIT = "queue_wait"
+PHASES = [
+    PHASE_SNAPSHOT,
+    PHASE_COMMAND,
+    PHASE_SCENARIO,
+    PHASE_APP_START,
+    PHASE_LOGIN,
+    PHASE_DUMP,
+    PHASE_PARSE,
+    PHASE_CRAWL,
+    PHASE_SELECTOR,
+    PHASE_TAP,
+    PHASE_QUEUE_WAIT,
+]
+# Number of recent samples per phase the latency percentiles are computed over.
+METRICS_WINDOW = 200
 
 ATTR_SHADE_POSITION = "position"
 ATTR_SHADE_MOVING = "is_moving"
 ATTR_SHADE_BATTERY = "battery"
 ATTR_SHADE_SIGNAL = "signal"
 
+# Labels of the readings shown on a shade's detail page (localized variants).
+DETAIL_METRIC_PATTERNS = {
+    ATTR_SHADE_BATTERY: r"(?i)(battery|batteria)",
+    ATTR_SHADE_SIGNAL: r"(?i)(signal|segnale|rssi)",
+}
+# Seconds within which each detail page reading should be refreshed; older
+# readings are still served, but reported as stale. Shades are due for another
+# visit once their readings are half that old.
+DETAIL_METRIC_TTLS = {
+    ATTR_SHADE_BATTERY: 24 * 3600,
+    ATTR_SHADE_SIGNAL: 3600,
+}
+# Every DETAIL_CRAWL_INTERVAL seconds, the detail pages of due shades are read
+# in round-robin order: as many as it takes to visit every shade within half the
+# shortest TTL, and at least DETAIL_CRAWL_MIN_SHADES. No new page is started
+# once DEFAULT_DETAIL_BUDGET seconds (configurable, 0 disables) have passed.
+DETAIL_CRAWL_INTERVAL = 300
+DETAIL_CRAWL_MIN_SHADES = 3
+DEFAULT_DETAIL_BUDGET = 10
+
 VIMAR_PACKAGE = "it.vimar.View"
+
+SHADE_ACTION_OPEN = "open"
+SHADE_ACTION_CLOSE = "close"
+SHADE_ACTION_STOP = "stop"
+SHADE_ACTION_SET_POSITION = "set_position"
+SHADE_ACTIONS = [SHADE_ACTION_OPEN, SHADE_ACTION_CLOSE, SHADE_ACTION_STOP, SHADE_ACTION_SET_POSITION]
+
+# Labels of the app buttons performing each shade action (localized variants).
+SHADE_ACTION_PATTERNS = {
+    SHADE_ACTION_OPEN: r"(?i)(open|up|apri|su)",
+    SHADE_ACTION_CLOSE: r"(?i)(close|down|chiudi|giu)",
+    SHADE_ACTION_STOP: r"(?i)(stop|ferma)",
+}
+
+# Labels of the login and PIN confirmation buttons (localized variants).
+LOGIN_BUTTON_PATTERN = r"(?i)(login|accedi|sign in)"
+PIN_CONFIRM_PATTERN = r"(?i)(conferma|confirm|ok)"
+
+# Navigation towards the app list gives up after this many steps (login, PIN,
+# back). After each step the screen is re-read every NAVIGATION_SETTLE_INTERVAL
+# seconds until it changes, for up to NAVIGATION_SETTLE_TIMEOUT seconds until a
+# timeout was learned (see WAIT_SCREEN below).
+MAX_NAVIGATION_STEPS = 4
+NAVIGATION_SETTLE_TIMEOUT = 3.0
+NAVIGATION_SETTLE_INTERVAL = 0.3
+
+# Kinds of waits on the device, and the seconds each may take until enough
+# successful waits have been seen to learn a timeout for it. Learned timeouts
+# are TIMEOUT_P95_FACTOR times the 95th percentile of the last successful waits,
+# within TIMEOUT_MIN and TIMEOUT_MAX seconds, and double after every wait that
+# timed out until one succeeds again.
+WAIT_SHADE = "shade"
+WAIT_SLIDER = "slider"
+WAIT_ACTION = "action"
+WAIT_SCENARIO = "scenario"
+WAIT_SCREEN = "screen_change"
+# From app_start until the app shows a screen other than its splash or loading
+# page; far slower than the back transitions WAIT_SCREEN learns from.
+WAIT_LAUNCH = "app_launch"
+DEFAULT_TIMEOUTS = {
+    WAIT_SHADE: 2.0,
+    WAIT_SLIDER: 2.0,
+    WAIT_ACTION: 2.0,
+    WAIT_SCENARIO: 3.0,
+    WAIT_SCREEN: NAVIGATION_SETTLE_TIMEOUT,
+    WAIT_LAUNCH: 10.0,
+}
+TIMEOUT_P95_FACTOR = 2.0
+TIMEOUT_MIN = 0.5
+TIMEOUT_MAX = 15.0
+TIMEOUT_MIN_SAMPLES = 5
+
+SERVICE_RUN_SHADE_BATCH = "run_shade_batch"
+ATTR_OPERATIONS = "operations"
+ATTR_SHADE = "shade"
+ATTR_ACTION = "action"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+# Seconds cover commands are collected before they are sent as one batch, so
+# cover groups and scenes moving many shades share a single navigation pass.
+SHADE_BATCH_WINDOW = 0.3
+
+# Seconds during which refresh requests following commands are merged into one
+# poll; the command itself already published the rows it read back.
+REFRESH_COALESCE_WINDOW = 5.0
+
+# Full open-to-close travel time assumed for a shade until one has been learned.
+DEFAULT_SHADE_TRAVEL_TIME = 25.0
+# Seconds between position updates pushed to entities while a shade is moving.
+MOTION_UPDATE_INTERVAL = 1
+
+# Scrolled pages of the app list are re-read once older than this many seconds;
+# the first page is read on every poll. MAX_PAGES bounds a single crawl.
+PAGE_MAX_AGE = 600
+MAX_PAGES = 20
+
+# Whether hierarchy dumps are requested in uiautomator's compressed form, which
+# leaves out layout-only nodes on the device before the XML is transferred. Off
+# by default: those nodes include the row containers shade rows are grouped by.
+DEFAULT_COMPACT_DUMPS = False
+
+# Whether taps and key presses go through a persistent ADB shell instead of the
+# uiautomator2 server, and the seconds a shell command may take.
+DEFAULT_ADB_FAST_PATH = False
+ADB_SHELL_TIMEOUT = 10
+
+# Seconds a stop, any other shade command, and a poll or background check may
+# take on one device, from being queued until finished. Queued work past its
+# deadline is dropped; callers stop waiting for work still running past it.
+STOP_DEADLINE = 20
+COMMAND_DEADLINE = 60
+POLL_DEADLINE = 120
+
+# Seconds cached element bounds are trusted without a fresh capture, in case
+# something other than this integration changed the app screen.
+ELEMENT_CACHE_TTL = 120
+
+# Seconds a successful login/foreground check is trusted before probing again.
+SESSION_TTL = 900
+
+# Seconds between keep-alive pings of idle devices. A dead uiautomator session
+# is restored with up to RECONNECT_ATTEMPTS tries, waiting RECONNECT_BACKOFF
+# seconds after the first failed one and doubling up to RECONNECT_MAX_BACKOFF.
+KEEPALIVE_INTERVAL = 60
+RECONNECT_ATTEMPTS = 5
+RECONNECT_BACKOFF = 1.0
+RECONNECT_MAX_BACKOFF = 30.0
+
+# Event-driven updates: only app log lines matching EVENT_LOG_PATTERN, the ones
+# about device state pushed to the app, count as activity. Bursts of activity
+# within EVENT_REFRESH_DELAY seconds trigger one refresh, and event-triggered
+# refreshes start at least EVENT_MIN_INTERVAL seconds apart; activity in between
+# is caught by one trailing refresh. Activity within EVENT_QUIET_WINDOW seconds
+# of the integration's own device operations is caused by them and ignored.
+EVENT_LOG_PATTERN = r"(?i)(shutter|tapparell|roller|blind|scenari|status|stato|push|mqtt|websocket)"
+EVENT_REFRESH_DELAY = 1.0
+EVENT_MIN_INTERVAL = 10.0
+EVENT_QUIET_WINDOW = 3.0
+# The app log stream is reopened after failures with exponential backoff, and
+# after this many seconds without output to follow app restarts.
+EVENT_STREAM_BACKOFF = 1.0
+EVENT_STREAM_MAX_BACKOFF = 60.0
+EVENT_STREAM_IDLE_TIMEOUT = 300
@@ -2,33 +2,338 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
 import logging
-from typing import Any
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import CONF_POLL_INTERVAL, DOMAIN
-from .vimar_android_client import VimarAndroidClient
+from .const import (
+    CONF_POLL_INTERVAL,
+    DEFAULT_DETAIL_BUDGET,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DETAIL_CRAWL_INTERVAL,
+    DETAIL_CRAWL_MIN_SHADES,
+    DETAIL_METRIC_TTLS,
+    DOMAIN,
+    EVENT_MIN_INTERVAL,
+    EVENT_QUIET_WINDOW,
+    EVENT_REFRESH_DELAY,
+    MOTION_UPDATE_INTERVAL,
+    REFRESH_COALESCE_WINDOW,
+    SHADE_BATCH_WINDOW,
+)
+from .device_pool import VimarDevicePool
+from .event_watcher import DeviceEventWatcher
+from .models import ShadeOperation, ShadeState, VimarSnapshot
+from .motion import MotionTracker
+from .polling import AdaptivePollScheduler
+from .shade_details import ShadeDetailCache
+from .snapshot_store import VimarSnapshotStore
+from .vimar_android_client import ShadeBatchError
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class VimarDataUpdateCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    """Poll app state from Android emulator and fan it out to entities."""
+class VimarDataUpdateCoordinator(DataUpdateCoordinator[VimarSnapshot]):
+    """Poll app state from Android emulator and fan it out to entities.
 
-    def __init__(self, hass: HomeAssistant, client: VimarAndroidClient, poll_interval: int) -> None:
+    Entities register with their shade/scenario id as listener context. Unchanged
+    snapshots notify nobody, and changed ones only notify the entities whose
+    record differs from the previous poll. With an event watcher attached, app
+    activity not caused by the integration itself triggers a refresh, and the
+    periodic poll only remains as a slow safety net. Battery and signal come
+    from shade detail pages, read a few shades at a time in the background and
+    merged into every snapshot from a cache.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: VimarDevicePool,
+        poll_interval: int,
+        max_poll_interval: int = DEFAULT_MAX_POLL_INTERVAL,
+        store: VimarSnapshotStore | None = None,
+        detail_budget: float = DEFAULT_DETAIL_BUDGET,
+    ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=poll_interval),
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REFRESH_COALESCE_WINDOW,
+                immediate=False,
+            ),
+            always_update=False,
         )
         self.client = client
+        self._store = store
+        self._changed: set[str] | None = None
+        self._pending_operations: list[tuple[ShadeOperation, asyncio.Future[None]]] = []
+        self._batch_task: asyncio.Task[None] | None = None
+        self.motion = MotionTracker()
+        self.scheduler = AdaptivePollScheduler(base=poll_interval, ceiling=max_poll_interval)
+        self._moving: set[str] = set()
+        self._unsub_motion: CALLBACK_TYPE | None = None
+        self.watcher: DeviceEventWatcher | None = None
+        self.event_refreshes = 0
+        self.details = ShadeDetailCache(DETAIL_METRIC_TTLS)
+        self.detail_budget = detail_budget
+        self._device_busy = 0
+        self._quiet_until = 0.0
+        self._last_event_refresh: float | None = None
+        self._unsub_event_refresh: CALLBACK_TYPE | None = None
+        self._event_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=EVENT_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> VimarSnapshot:
+        # Only a diff between two successful polls is meaningful; otherwise
+        # every listener must refresh (availability may have flipped).
+        previous = self.data if self.last_update_success else None
+        self._changed = None
+        started = time.monotonic()
+        self._device_busy += 1
         try:
-            return await self.client.async_get_snapshot()
+            data = await self.client.async_get_snapshot()
         except Exception as err:
+            self._set_poll_interval(self.scheduler.record_failure(time.monotonic() - started))
             raise UpdateFailed(f"Unable to refresh Vimar app state: {err}") from err
+        finally:
+            self._async_device_idle()
+
+        filled = [self.details.fill(shade) for shade in data.shades.values()]
+        if any(shade is not data.shades[shade.id] for shade in filled):
+            data = data.with_shades(filled)
+        for shade in data.shades.values():
+            self.motion.observe(shade.id, shade.position)
+        if previous is not None:
+            self._changed = data.changed_ids(previous)
+        if self._changed is None or self._changed:
+            self._async_persist(data)
+        self._set_poll_interval(
+            self.scheduler.record_success(
+                time.monotonic() - started,
+                changed=previous is None or data != previous,
+                moving=bool(self.motion.moving_ids()),
+            )
+        )
+        return data
+
+    @callback
+    def async_handle_device_event(self) -> None:
+        """Refresh shortly after app activity that the integration did not cause.
+
+        Our own polls and commands make the app log as well; events during them
+        and for ``EVENT_QUIET_WINDOW`` afterwards are ignored so a refresh never
+        triggers the next one. Event-triggered refreshes are at least
+        ``EVENT_MIN_INTERVAL`` apart, so a chatty app costs one refresh per
+        interval at most.
+        """
+        if self._device_busy or time.monotonic() < self._quiet_until or self._unsub_event_refresh is not None:
+            return
+        if self._last_event_refresh is not None:
+            wait = self._last_event_refresh + EVENT_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                self._unsub_event_refresh = async_call_later(self.hass, wait, self._async_event_refresh)
+                return
+        self._async_event_refresh()
+
+    @callback
+    def _async_event_refresh(self, _now: datetime | None = None) -> None:
+        self._unsub_event_refresh = None
+        self._last_event_refresh = time.monotonic()
+        self.event_refreshes += 1
+        self.hass.async_create_task(self._event_debouncer.async_call())
+
+    @callback
+    def _async_device_idle(self) -> None:
+        self._device_busy -= 1
+        self._quiet_until = time.monotonic() + EVENT_QUIET_WINDOW
+        self.scheduler.push_active = self.watcher is not None and self.watcher.connected
+
+    @callback
+    def async_restore(self, snapshot: VimarSnapshot) -> None:
+        """Serve a stored snapshot until the first live refresh replaces it."""
+        self.data = snapshot
+
+    @callback
+    def _async_persist(self, snapshot: VimarSnapshot) -> None:
+        if self._store is not None:
+            self._store.async_schedule_save(snapshot)
+
+    def _set_poll_interval(self, seconds: float) -> None:
+        interval = timedelta(seconds=seconds)
+        if interval != self.update_interval:
+            _LOGGER.debug("Next Vimar poll in %.1f s", seconds)
+            self.update_interval = interval
+
+    async def async_shutdown(self) -> None:
+        """Cancel motion and event-driven updates when the entry is unloaded."""
+        await super().async_shutdown()
+        self._event_debouncer.async_shutdown()
+        if self._unsub_event_refresh is not None:
+            self._unsub_event_refresh()
+            self._unsub_event_refresh = None
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self._unsub_motion is not None:
+            self._unsub_motion()
+            self._unsub_motion = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only listeners whose shade/scenario changed in the last poll."""
+        changed = self._changed
+        self._changed = None
+        if changed is None:
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    async def async_execute_shade_operation(self, operation: ShadeOperation) -> None:
+        """Queue a cover command and wait until the batch it joined has run.
+
+        Commands arriving within ``SHADE_BATCH_WINDOW`` of each other (e.g. from a
+        cover group) are executed as one batch followed by a single refresh.
+        """
+        future: asyncio.Future[None] = self.hass.loop.create_future()
+        self._pending_operations.append((operation, future))
+        if self._batch_task is None:
+            self._batch_task = self.hass.async_create_task(self._async_flush_operations())
+        await future
+
+    async def async_run_shade_batch(self, operations: list[ShadeOperation]) -> None:
+        """Run a batch of shade operations and publish the rows it read back.
+
+        The full refresh that follows goes through the request-refresh debouncer,
+        so commands issued in quick succession end up sharing one poll.
+        """
+        self.scheduler.note_activity()
+        self._device_busy += 1
+        try:
+            updated = await self.client.async_run_shade_batch(operations)
+        except ShadeBatchError as err:
+            self._async_start_motion([op for op in operations if op.name not in err.failures])
+            raise
+        else:
+            self._async_start_motion(operations)
+            self.async_apply_shade_updates(updated)
+        finally:
+            self._async_device_idle()
+            await self.async_request_refresh()
+
+    @callback
+    def async_apply_shade_updates(self, shades: list[ShadeState]) -> None:
+        """Merge freshly read shade rows into the current data as a partial update."""
+        if self.data is None:
+            return
+        shades = [self.details.fill(shade) for shade in shades]
+        for shade in shades:
+            self.motion.observe(shade.id, shade.position)
+        snapshot = self.data.with_shades(shades)
+        changed = snapshot.changed_ids(self.data)
+        if not changed:
+            return
+        self._changed = changed
+        self._async_persist(snapshot)
+        self.async_set_updated_data(snapshot)
+
+    async def async_crawl_details(self) -> None:
+        """Read battery and signal of the next due shades from their detail pages.
+
+        Skipped while shades move, since the detail pages would be opened in the
+        middle of the commands' effects; failures only leave readings to age.
+        """
+        if self.data is None or not self.detail_budget or self.motion.moving_ids():
+            return
+        shade_ids = list(self.data.shades)
+        limit = max(DETAIL_CRAWL_MIN_SHADES, self.details.batch_size(len(shade_ids), DETAIL_CRAWL_INTERVAL))
+        due = self.details.due(shade_ids, limit)
+        if not due:
+            return
+        ids = {self.data.shades[shade_id].name: shade_id for shade_id in due}
+        self._device_busy += 1
+        try:
+            readings = await self.client.async_read_shade_details(list(ids), self.detail_budget)
+        except Exception as err:  # noqa: BLE001 - retried with the next crawl
+            _LOGGER.debug("Reading Vimar shade details failed: %s", err)
+            return
+        finally:
+            self._async_device_idle()
+
+        for name, values in readings.items():
+            self.details.store(ids[name], values)
+        if self.data is not None:
+            self.async_apply_shade_updates(
+                [self.data.shades[ids[name]] for name in readings if ids[name] in self.data.shades]
+            )
+
+    @callback
+    def _async_start_motion(self, operations: list[ShadeOperation]) -> None:
+        """Start motion estimates for executed commands and notify their entities."""
+        if self.data is None:
+            return
+        by_name = {shade.name: shade for shade in self.data.shades.values()}
+        started: set[str] = set()
+        for operation in operations:
+            if (shade := by_name.get(operation.name)) is None:
+                continue
+            self.motion.start(shade.id, shade.position, operation.action, operation.position)
+            started.add(shade.id)
+
+        if not started:
+            return
+        self._moving |= self.motion.moving_ids()
+        self._changed = started
+        self.async_update_listeners()
+        if self._moving and self._unsub_motion is None:
+            self._unsub_motion = async_track_time_interval(
+                self.hass, self._async_motion_tick, timedelta(seconds=MOTION_UPDATE_INTERVAL)
+            )
+
+    @callback
+    def _async_motion_tick(self, _now: datetime) -> None:
+        """Push interpolated positions of moving shades to their entities."""
+        moving = self.motion.moving_ids()
+        # Shades that just stopped need one last write with their final state.
+        self._changed = moving | self._moving
+        self._moving = moving
+        self.async_update_listeners()
+        if not moving and self._unsub_motion is not None:
+            self._unsub_motion()
+            self._unsub_motion = None
+
+    async def _async_flush_operations(self) -> None:
+        await asyncio.sleep(SHADE_BATCH_WINDOW)
+        pending, self._pending_operations = self._pending_operations, []
+        self._batch_task = None
+
+        try:
+            await self.async_run_shade_batch([operation for operation, _ in pending])
+        except ShadeBatchError as err:
+            for operation, future in pending:
+                if operation.name in err.failures:
+                    future.set_exception(RuntimeError(err.failures[operation.name]))
+                else:
+                    future.set_result(None)
+        except Exception as err:  # noqa: BLE001 - forwarded to every waiting caller
+            for _, future in pending:
+                future.set_exception(err)
+        else:
+            for _, future in pending:
+                future.set_result(None)
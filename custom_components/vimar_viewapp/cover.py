@@ -14,9 +14,18 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA_CLIENT, DATA_COORDINATOR, DOMAIN
+from .const import (
+    DATA_CLIENT,
+    DATA_COORDINATOR,
+    DOMAIN,
+    SHADE_ACTION_CLOSE,
+    SHADE_ACTION_OPEN,
+    SHADE_ACTION_SET_POSITION,
+    SHADE_ACTION_STOP,
+)
 from .coordinator import VimarDataUpdateCoordinator
-from .vimar_android_client import ShadeState, VimarAndroidClient
+from .device_pool import VimarDevicePool
+from .models import ShadeOperation, ShadeState
 
 
 async def async_setup_entry(
@@ -28,8 +37,8 @@ async def async_setup_entry(
     coordinator: VimarDataUpdateCoordinator = data[DATA_COORDINATOR]
     entities: list[VimarShadeCover] = []
 
-    for shade in coordinator.data.get("shades", []):
-        entities.append(VimarShadeCover(data[DATA_CLIENT], coordinator, shade["id"]))
+    for shade_id in coordinator.data.shades:
+        entities.append(VimarShadeCover(data[DATA_CLIENT], coordinator, shade_id))
 
     async_add_entities(entities)
 
@@ -46,20 +55,17 @@ class VimarShadeCover(CoordinatorEntity[VimarDataUpdateCoordinator], CoverEntity
 
     def __init__(
         self,
-        client: VimarAndroidClient,
+        client: VimarDevicePool,
         coordinator: VimarDataUpdateCoordinator,
         shade_id: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=shade_id)
         self._client = client
         self._shade_id = shade_id
 
     @property
-    def _shade(self) -> dict[str, Any] | None:
-        for shade in self.coordinator.data.get("shades", []):
-            if shade["id"] == self._shade_id:
-                return shade
-        return None
+    def _shade(self) -> ShadeState | None:
+        return self.coordinator.data.shades.get(self._shade_id)
 
     @property
     def unique_id(self) -> str:
@@ -68,43 +74,36 @@ class VimarShadeCover(CoordinatorEntity[VimarDataUpdateCoordinator], CoverEntity
     @property
     def name(self) -> str | None:
         shade = self._shade
-        return shade["name"] if shade else self._shade_id
+        return shade.name if shade else self._shade_id
 
     @property
     def current_cover_position(self) -> int | None:
         shade = self._shade
         if not shade:
             return None
-        return shade.get("position")
+        return self.coordinator.motion.position(self._shade_id, shade.position)
 
     @property
     def is_opening(self) -> bool | None:
-        return False
+        return self.coordinator.motion.direction(self._shade_id) > 0
 
     @property
     def is_closing(self) -> bool | None:
-        return False
+        return self.coordinator.motion.direction(self._shade_id) < 0
 
     async def async_open_cover(self, **kwargs: Any) -> None:
-        shade = self._shade
-        if shade:
-            await self._client.async_open_shade(shade["name"])
-            await self.coordinator.async_request_refresh()
+        await self._async_execute(SHADE_ACTION_OPEN)
 
     async def async_close_cover(self, **kwargs: Any) -> None:
-        shade = self._shade
-        if shade:
-            await self._client.async_close_shade(shade["name"])
-            await self.coordinator.async_request_refresh()
+        await self._async_execute(SHADE_ACTION_CLOSE)
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
-        shade = self._shade
-        if shade:
-            await self._client.async_stop_shade(shade["name"])
-            await self.coordinator.async_request_refresh()
+        await self._async_execute(SHADE_ACTION_STOP)
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
+        await self._async_execute(SHADE_ACTION_SET_POSITION, kwargs[ATTR_POSITION])
+
+    async def _async_execute(self, action: str, position: int | None = None) -> None:
         shade = self._shade
         if shade:
-            await self._client.async_set_shade_position(shade["name"], kwargs[ATTR_POSITION])
-            await self.coordinator.async_request_refresh()
+            await self.coordinator.async_execute_shade_operation(ShadeOperation(shade.name, action, position))
@@ -0,0 +1,251 @@
+"""Pool of Android devices running the Vimar app for one account."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+import logging
+import re
+import time
+from typing import Any, TypeVar
+
+from .const import DEVICE_MAX_BACKOFF, DEVICE_RETRY_BACKOFF
+from .models import ShadeOperation, ShadeState, VimarSnapshot
+from .vimar_android_client import APP_ERRORS, ShadeBatchError, VimarAndroidClient
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+_ENDPOINT_SPLIT_RE = re.compile(r"[\s,;]+")
+
+
+def parse_adb_endpoints(value: str | None) -> list[tuple[str | None, int | None, str]]:
+    """Split a list of ``host:port`` endpoints or ADB serials into client arguments.
+
+    Returns ``(host, port, serial)`` tuples; host and port are None for plain
+    serials such as ``emulator-5556``.
+    """
+    endpoints: list[tuple[str | None, int | None, str]] = []
+    for item in _ENDPOINT_SPLIT_RE.split(value or ""):
+        if not item:
+            continue
+        host, sep, port = item.rpartition(":")
+        if sep and host and port.isdigit():
+            endpoints.append((host, int(port), item))
+        else:
+            endpoints.append((None, None, item))
+    return endpoints
+
+
+@dataclass(slots=True)
+class PooledDevice:
+    """One device of the pool with its load and health bookkeeping."""
+
+    client: VimarAndroidClient
+    in_flight: int = 0
+    last_used: float = 0.0
+    consecutive_failures: int = 0
+    retry_at: float = 0.0
+    calls: int = 0
+    failures: int = 0
+
+    @property
+    def name(self) -> str:
+        return self.client.serial
+
+    def available(self, now: float) -> bool:
+        return now >= self.retry_at
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.retry_at = 0.0
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        backoff = DEVICE_RETRY_BACKOFF * 2 ** (self.consecutive_failures - 1)
+        self.retry_at = now + min(DEVICE_MAX_BACKOFF, backoff)
+
+
+class VimarDevicePool:
+    """Dispatch polls and commands across several devices logged into one account.
+
+    Every device runs its own client with its own worker thread, so calls sent to
+    different devices proceed in parallel. Each call goes to the least busy
+    healthy device; a device that fails is skipped with exponential backoff and
+    the call fails over to the next one. Failures the app answered, such as a
+    missing scenario or a passed deadline, are raised as they are: the device
+    works, and a command still running at its deadline must not run twice.
+    Shade batches are split by shade across all healthy devices, so command
+    throughput grows with the size of the pool.
+    """
+
+    def __init__(self, clients: Sequence[VimarAndroidClient], clock: Callable[[], float] = time.monotonic) -> None:
+        if not clients:
+            raise ValueError("A device pool needs at least one client")
+        self._devices = [PooledDevice(client) for client in clients]
+        self._clock = clock
+
+    @property
+    def devices(self) -> list[PooledDevice]:
+        return list(self._devices)
+
+    async def async_connect(self) -> None:
+        """Connect all devices; succeeds as long as one of them is reachable."""
+        results = await asyncio.gather(
+            *(device.client.async_connect() for device in self._devices), return_exceptions=True
+        )
+        errors = []
+        for device, result in zip(self._devices, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Unable to connect Vimar device %s: %s", device.name, result)
+                device.record_failure(self._clock())
+                errors.append(result)
+        if len(errors) == len(self._devices):
+            raise errors[0]
+
+    async def async_disconnect(self) -> None:
+        await asyncio.gather(*(device.client.async_disconnect() for device in self._devices))
+
+    async def async_keepalive(self) -> None:
+        """Ping idle devices so dead sessions are restored before a call needs them."""
+        idle = [device for device in self._devices if not device.in_flight and device.client.connected]
+        await asyncio.gather(*(self._async_keepalive(device) for device in idle))
+
+    async def _async_keepalive(self, device: PooledDevice) -> None:
+        try:
+            await device.client.async_keepalive()
+        except Exception as err:  # noqa: BLE001 - the device just stays in backoff
+            _LOGGER.warning("Vimar device %s is not responding: %s", device.name, err)
+            device.record_failure(self._clock())
+        else:
+            device.record_success()
+
+    async def async_get_snapshot(self) -> VimarSnapshot:
+        return await self._async_dispatch(lambda client: client.async_get_snapshot())
+
+    async def async_run_scenario(self, name: str) -> None:
+        await self._async_dispatch(lambda client: client.async_run_scenario(name))
+
+    async def async_read_shade_details(self, names: Sequence[str], budget: float) -> dict[str, dict[str, int]]:
+        return await self._async_dispatch(lambda client: client.async_read_shade_details(names, budget))
+
+    async def async_run_shade_operation(self, operation: ShadeOperation) -> None:
+        await self._async_dispatch(lambda client: client.async_run_shade_operation(operation))
+
+    async def async_run_shade_batch(self, operations: Sequence[ShadeOperation]) -> list[ShadeState]:
+        """Run a batch, sharded by shade across the healthy devices.
+
+        All operations on one shade stay on the same device and keep their order.
+        Raises ``ShadeBatchError`` with the failures of every shard.
+        """
+        if not operations:
+            return []
+
+        now = self._clock()
+        # Devices in backoff only take shards when no device is healthy.
+        candidates = [device for device in self._candidates() if device.available(now)] or self._candidates()
+        shard_count = min(len(candidates), len({operation.name for operation in operations}))
+        shards: list[list[ShadeOperation]] = [[] for _ in range(shard_count)]
+        assigned: dict[str, int] = {}
+        for operation in operations:
+            index = assigned.setdefault(operation.name, len(assigned) % shard_count)
+            shards[index].append(operation)
+
+        results = await asyncio.gather(
+            *(
+                self._async_dispatch(lambda client, shard=shard: client.async_run_shade_batch(shard), preferred=device)
+                for shard, device in zip(shards, candidates)
+            ),
+            return_exceptions=True,
+        )
+
+        updated: list[ShadeState] = []
+        failures: dict[str, str] = {}
+        for shard, result in zip(shards, results):
+            if isinstance(result, ShadeBatchError):
+                failures.update(result.failures)
+            elif isinstance(result, BaseException):
+                failures.update({operation.name: str(result) for operation in shard})
+            else:
+                updated.extend(result)
+        if failures:
+            raise ShadeBatchError(failures)
+        return updated
+
+    def as_dict(self) -> list[dict[str, Any]]:
+        now = self._clock()
+        return [
+            {
+                "device": device.name,
+                "healthy": device.available(now),
+                "in_flight": device.in_flight,
+                "calls": device.calls,
+                "failures": device.failures,
+                "consecutive_failures": device.consecutive_failures,
+                "reconnects": device.client.reconnects,
+                "queue": device.client.queue.as_dict(),
+                "timeouts": device.client.timeouts.as_dict(),
+            }
+            for device in self._devices
+        ]
+
+    def _candidates(self, preferred: PooledDevice | None = None) -> list[PooledDevice]:
+        """Order devices for a call: preferred, then idle healthy, then cooling down."""
+        now = self._clock()
+        healthy = sorted(
+            (device for device in self._devices if device.available(now)),
+            key=lambda device: (device.in_flight, device.last_used),
+        )
+        cooling = sorted(
+            (device for device in self._devices if not device.available(now)),
+            key=lambda device: device.retry_at,
+        )
+        # Devices in backoff are still tried last rather than failing outright.
+        ordered = healthy or cooling[:1]
+        ordered += [device for device in cooling if device not in ordered]
+        if preferred is not None and preferred in ordered:
+            ordered.remove(preferred)
+            ordered.insert(0, preferred)
+        return ordered
+
+    async def _async_dispatch(
+        self,
+        call: Callable[[VimarAndroidClient], Awaitable[_T]],
+        preferred: PooledDevice | None = None,
+    ) -> _T:
+        last_error: Exception | None = None
+        for device in self._candidates(preferred):
+            try:
+                return await self._async_call(device, call)
+            except APP_ERRORS:
+                # The device worked; the failure is about the request itself.
+                raise
+            except Exception as err:  # noqa: BLE001 - fail over to the next device
+                _LOGGER.warning("Vimar device %s failed, trying next device: %s", device.name, err)
+                last_error = err
+        assert last_error is not None
+        raise last_error
+
+    async def _async_call(self, device: PooledDevice, call: Callable[[VimarAndroidClient], Awaitable[_T]]) -> _T:
+        device.in_flight += 1
+        device.calls += 1
+        device.last_used = self._clock()
+        try:
+            if not device.client.connected:
+                await device.client.async_connect()
+            result = await call(device.client)
+        except ShadeBatchError:
+            device.record_success()
+            raise
+        except APP_ERRORS:
+            raise
+        except Exception:
+            device.record_failure(self._clock())
+            raise
+        finally:
+            device.in_flight -= 1
+        device.record_success()
+        return result
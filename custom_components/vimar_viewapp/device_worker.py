@@ -0,0 +1,47 @@
+"""Dedicated worker thread for blocking uiautomator2 device calls."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import logging
+from typing import Any, TypeVar
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class DeviceWorker:
+    """Run blocking device calls on a single dedicated thread.
+
+    uiautomator2 talks to the device through synchronous HTTP round trips, some of
+    which wait for seconds. Funnelling every call through one thread keeps the
+    Home Assistant event loop responsive and keeps device interactions ordered.
+    """
+
+    def __init__(self, name: str = "vimar_device") -> None:
+        self._name = name
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def async_run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Run ``func`` on the worker thread and await its result."""
+        if self._executor is None:
+            _LOGGER.debug("Starting device worker thread %s", self._name)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self._name)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Stop the worker thread, dropping calls that have not started yet."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
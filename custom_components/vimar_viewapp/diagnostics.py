@@ -0,0 +1,39 @@
+"""Diagnostics support for Vimar View App integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, CONF_PIN, CONF_USERNAME, DATA_COORDINATOR, DATA_METRICS, DOMAIN
+from .coordinator import VimarDataUpdateCoordinator
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD, CONF_PIN}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: VimarDataUpdateCoordinator = entry_data[DATA_COORDINATOR]
+    data = coordinator.data
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": dict(entry.options),
+        "polling": coordinator.scheduler.as_dict(),
+        "devices": coordinator.client.as_dict(),
+        "latency": entry_data[DATA_METRICS].as_dict(),
+        "events": {
+            "enabled": coordinator.watcher is not None,
+            "connected": coordinator.watcher is not None and coordinator.watcher.connected,
+            "received": coordinator.watcher.events if coordinator.watcher else 0,
+            "refreshes": coordinator.event_refreshes,
+        },
+        "details": {"budget": coordinator.detail_budget, **coordinator.details.as_dict()},
+        "shades": len(data.shades) if data else 0,
+        "scenarios": len(data.scenarios) if data else 0,
+        "moving": sorted(coordinator.motion.moving_ids()),
+    }
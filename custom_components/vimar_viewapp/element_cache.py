@@ -0,0 +1,77 @@
+"""Cache of tap targets on the screen the app is currently showing."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+
+from .hierarchy_parser import ParsedHierarchy, ScreenElements
+
+
+class ElementCache:
+    """Element bounds from the latest capture, valid while the screen is unchanged.
+
+    The client refreshes the cache from every hierarchy capture and invalidates
+    it whenever it navigates (row taps, back presses, scrolling, app restarts).
+    While valid, commands tap coordinates directly instead of searching for
+    widgets with selector round trips.
+
+    Something outside the client may scroll the list or change the screen at
+    any time, so cached bounds are only tapped once confirmed: a capture taken
+    during the current device operation must show the same screen. The client
+    calls ``unconfirm`` whenever an operation starts. ``max_age`` bounds how
+    long the bounds are kept at all.
+    """
+
+    def __init__(self, max_age: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_age = max_age
+        self._clock = clock
+        self._elements: ScreenElements | None = None
+        self._signature: str | None = None
+        self._captured_at = 0.0
+        self._confirmed = False
+
+    @property
+    def confirmed(self) -> bool:
+        """Whether the cached screen was captured since ``unconfirm``."""
+        return self._confirmed and self.current() is not None
+
+    def update(self, parsed: ParsedHierarchy) -> None:
+        self._elements = parsed.elements
+        self._signature = parsed.signature
+        self._captured_at = self._clock()
+        self._confirmed = True
+
+    def touch(self) -> None:
+        """Confirm the cached screen is still showing, e.g. after an identical capture."""
+        if self._elements is not None:
+            self._captured_at = self._clock()
+            self._confirmed = True
+
+    def confirm(self, parsed: ParsedHierarchy) -> bool:
+        """Check the cache against a new capture, which replaces it either way.
+
+        Returns False when the capture lists other records, or puts them
+        elsewhere, than the cached screen did.
+        """
+        unchanged = (
+            self.current() is not None
+            and parsed.signature == self._signature
+            and parsed.elements == self._elements
+        )
+        self.update(parsed)
+        return unchanged
+
+    def unconfirm(self) -> None:
+        """Require a new capture before cached bounds are tapped again."""
+        self._confirmed = False
+
+    def invalidate(self) -> None:
+        self._elements = None
+        self._signature = None
+        self._confirmed = False
+
+    def current(self) -> ScreenElements | None:
+        if self._elements is not None and self._clock() - self._captured_at >= self._max_age:
+            self.invalidate()
+        return self._elements
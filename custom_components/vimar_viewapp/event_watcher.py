@@ -0,0 +1,133 @@
+"""Watch a device for signs of Vimar app activity to trigger targeted refreshes."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Iterator
+import logging
+import re
+import socket
+import threading
+from typing import Any, Protocol
+
+from .const import EVENT_STREAM_BACKOFF, EVENT_STREAM_IDLE_TIMEOUT, EVENT_STREAM_MAX_BACKOFF, VIMAR_PACKAGE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventStream(Protocol):
+    """Iterable of device log lines that can be closed from another thread."""
+
+    def __iter__(self) -> Iterator[str]: ...
+
+    def close(self) -> None: ...
+
+
+class LogcatStream:
+    """Stream the logcat output of the running Vimar app process through adbutils.
+
+    The socket times out after ``EVENT_STREAM_IDLE_TIMEOUT`` seconds without
+    output, which ends the stream; the watcher then reopens it, picking up a new
+    process id if the app was restarted meanwhile.
+    """
+
+    def __init__(self, serial: str, package: str = VIMAR_PACKAGE) -> None:
+        import adbutils  # noqa: PLC0415 - installed with uiautomator2, only needed here
+
+        device = adbutils.adb.device(serial=serial)
+        pid = device.shell(f"pidof {package}").split()
+        if not pid:
+            raise RuntimeError(f"{package} is not running on {serial}")
+        self._connection: Any = device.shell(f"logcat -v brief -T 1 --pid={pid[0]}", stream=True)
+        self._connection.conn.settimeout(EVENT_STREAM_IDLE_TIMEOUT)
+        self._file = self._connection.conn.makefile("rb")
+
+    def __iter__(self) -> Iterator[str]:
+        lines = iter(self._file)
+        try:
+            # "-T 1" replays the last line already logged before following.
+            next(lines, None)
+            for line in lines:
+                if not line.startswith(b"---------"):
+                    yield line.decode(errors="replace").rstrip()
+        except (socket.timeout, OSError) as err:
+            _LOGGER.debug("Vimar logcat stream ended: %s", err)
+
+    def close(self) -> None:
+        self._file.close()
+        self._connection.close()
+
+
+class DeviceEventWatcher:
+    """Report app activity seen in a device event stream to the event loop.
+
+    The stream is read on a dedicated thread, since reads block until the app
+    logs something. Every line matching ``pattern`` (all lines when None) calls
+    ``on_event`` on the event loop. A failed or finished stream is reopened with
+    bounded exponential backoff; ``connected`` tells whether events can arrive.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[], EventStream | Iterable[str]],
+        on_event: Callable[[], None],
+        pattern: str | None = None,
+        name: str = "vimar_events",
+    ) -> None:
+        self._open_stream = open_stream
+        self._on_event = on_event
+        self._pattern = re.compile(pattern) if pattern else None
+        self._name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._stream: EventStream | Iterable[str] | None = None
+        self.connected = False
+        self.events = 0
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._thread is not None:
+            return
+        self._loop = loop
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching; safe to call from the event loop, does not block."""
+        self._stopping.set()
+        _close(self._stream)
+        self._thread = None
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stopping.is_set():
+            try:
+                self._stream = self._open_stream()
+                self.connected = True
+                failures = 0
+                for line in self._stream:
+                    if self._stopping.is_set():
+                        break
+                    if self._pattern is None or self._pattern.search(line):
+                        self.events += 1
+                        assert self._loop is not None
+                        self._loop.call_soon_threadsafe(self._on_event)
+            except Exception as err:  # noqa: BLE001 - reopened with backoff
+                _LOGGER.debug("Vimar event stream failed: %s", err)
+            finally:
+                self.connected = False
+                stream, self._stream = self._stream, None
+                _close(stream)
+
+            failures += 1
+            self._stopping.wait(min(EVENT_STREAM_MAX_BACKOFF, EVENT_STREAM_BACKOFF * 2 ** (failures - 1)))
+
+
+def _close(stream: EventStream | Iterable[str] | None) -> None:
+    if stream is None or not hasattr(stream, "close"):
+        return
+    try:
+        stream.close()
+    except Exception as err:  # noqa: BLE001 - the stream is discarded anyway
+        _LOGGER.debug("Closing the event stream failed: %s", err)
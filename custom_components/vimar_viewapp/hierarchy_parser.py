@@ -0,0 +1,360 @@
+"""Structure-aware parser for uiautomator hierarchy dumps.
+
+The dump is streamed once through an event-driven XML parser; no element tree
+is ever built. Text nodes are grouped by the container they live in: when a
+container closes, the percentage labels inside it are paired with the name
+labels of the same container. That makes one list row produce one shade,
+regardless of unrelated labels sitting next to it in document order. Given the
+app package, subtrees of other windows (status bar, system dialogs) are skipped.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+import html
+import re
+from typing import NamedTuple
+from xml.etree import ElementTree
+
+from .const import DETAIL_METRIC_PATTERNS, LOGIN_BUTTON_PATTERN, PIN_CONFIRM_PATTERN, SHADE_ACTION_PATTERNS
+from .models import Scenario, ShadeState
+
+_CHUNK_SIZE = 64 * 1024
+_SLIDER_CLASS = "android.widget.SeekBar"
+_INPUT_CLASS = "android.widget.EditText"
+
+BUTTON_LOGIN = "login"
+BUTTON_CONFIRM = "confirm"
+
+_PROLOG_RE = re.compile(r"^\s*<\?xml[^>]*\?>")
+_PERCENT_RE = re.compile(r"(\d{1,3})\s*%")
+_SCENARIO_RE = re.compile(r"(?i)(scenario|scena)")
+_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_TEXT_ATTR_RE = re.compile(r'\btext="([^"]+)"')
+_NUMBER_RE = re.compile(r"-?\d+")
+_DETAIL_RES = {metric: re.compile(pattern) for metric, pattern in DETAIL_METRIC_PATTERNS.items()}
+# Same patterns the client uses as uiautomator ``textMatches`` selectors, which
+# must match the whole label.
+_ACTION_RES = {action: re.compile(pattern + "$") for action, pattern in SHADE_ACTION_PATTERNS.items()}
+_BUTTON_RES = {
+    BUTTON_LOGIN: re.compile(LOGIN_BUTTON_PATTERN + "$"),
+    BUTTON_CONFIRM: re.compile(PIN_CONFIRM_PATTERN + "$"),
+}
+
+Bounds = tuple[int, int, int, int]
+
+_NO_TOKENS: tuple[()] = ()
+
+
+class _Text(NamedTuple):
+    """What a label says, independent of where it sits in the hierarchy."""
+
+    stripped: str
+    scenario: bool
+    buttons: tuple[str, ...]
+    reading: bool
+    percent: int | None
+    action: str | None
+
+
+@lru_cache(maxsize=1024)
+def _classify_text(text: str) -> _Text:
+    # Lists repeat the same few labels ("Up", "Stop", "0%") on every row, so
+    # each distinct label goes through the patterns once.
+    stripped = text.strip()
+    scenario = len(text) >= 3 and _SCENARIO_RE.search(text) is not None
+    buttons = tuple(button for button, button_re in _BUTTON_RES.items() if button_re.match(stripped))
+    if "%" in text and (match := _PERCENT_RE.search(text)):
+        reading = any(pattern.search(text) for pattern in _DETAIL_RES.values())
+        return _Text(stripped, scenario, buttons, reading, max(0, min(100, int(match.group(1)))), None)
+    action = next((action for action, action_re in _ACTION_RES.items() if action_re.match(stripped)), None)
+    return _Text(stripped, scenario, buttons, False, None, action)
+
+
+def slugify(text: str) -> str:
+    return _SLUG_RE.sub("_", text.lower()).strip("_")
+
+
+def parse_bounds(bounds: str | None) -> Bounds | None:
+    """Convert a uiautomator ``[x1,y1][x2,y2]`` attribute to a tuple."""
+    if not bounds or not (match := _BOUNDS_RE.fullmatch(bounds)):
+        return None
+    return tuple(map(int, match.groups()))  # type: ignore[return-value]
+
+
+def center(bounds: Bounds) -> tuple[int, int]:
+    left, top, right, bottom = bounds
+    return (left + right) // 2, (top + bottom) // 2
+
+
+@dataclass(slots=True)
+class ScreenElements:
+    """Tap targets found in one capture, keyed by shade/scenario label.
+
+    The remaining fields describe the screen as a whole: text inputs, login and
+    PIN buttons, whether something scrolls, how many sliders it shows, and
+    shade controls (sliders, action buttons) that belong to no list row, as on
+    a shade's detail page. Sliders are moved with ``set_progress`` rather than
+    tapped, so only their number is kept; it is counted before rows claim
+    them, so a detail page is recognized even when a label on it pairs with a
+    percentage.
+    """
+
+    rows: dict[str, Bounds] = field(default_factory=dict)
+    actions: dict[str, dict[str, Bounds]] = field(default_factory=dict)
+    scenarios: dict[str, Bounds] = field(default_factory=dict)
+    inputs: int = 0
+    password_input: bool = False
+    buttons: dict[str, Bounds] = field(default_factory=dict)
+    scrollable: bool = False
+    sliders: int = 0
+    loose_controls: int = 0
+
+
+@dataclass(slots=True)
+class ParsedHierarchy:
+    """Records extracted from one hierarchy capture."""
+
+    shades: list[ShadeState]
+    scenarios: list[Scenario]
+    elements: ScreenElements = field(default_factory=ScreenElements)
+
+    @property
+    def signature(self) -> str:
+        """Identify the screen by the records it lists, ignoring their values."""
+        digest = hashlib.blake2b(digest_size=8)
+        for record in (*self.shades, *self.scenarios):
+            digest.update(record.id.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+class _Token:
+    __slots__ = ("text", "percent", "nameable", "action", "slider", "bounds")
+
+    def __init__(
+        self,
+        text: str,
+        bounds: str | None,
+        percent: int | None = None,
+        action: str | None = None,
+        slider: bool = False,
+    ) -> None:
+        self.text = text
+        self.bounds = bounds
+        self.percent = percent
+        self.action = action
+        self.slider = slider
+        self.nameable = bool(text) and percent is None and action is None
+
+
+class _HierarchyParser:
+    def __init__(self, package: str | None = None) -> None:
+        self.shades: list[ShadeState] = []
+        self.scenarios: dict[str, Scenario] = {}
+        self.elements = ScreenElements()
+        self._stack: list[list[_Token] | tuple[()]] = []
+        self._package = package
+        self._skip_depth = 0
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if self._package is not None and attrib.get("package", self._package) != self._package:
+            self._skip_depth = 1
+            return
+        token: _Token | None = None
+        text = attrib.get("text")
+        node_class = attrib.get("class")
+        if node_class == _INPUT_CLASS:
+            # Typed-in credentials are node text too; never read them as labels.
+            self.elements.inputs += 1
+            self.elements.password_input |= attrib.get("password") == "true"
+        elif text and not text.isspace():
+            token = self._text_token(text, attrib.get("bounds"))
+        elif node_class == _SLIDER_CLASS:
+            self.elements.sliders += 1
+            token = _Token("", attrib.get("bounds"), slider=True)
+        if attrib.get("scrollable") == "true":
+            self.elements.scrollable = True
+        # Most nodes carry nothing; they share one empty tuple instead of a list each.
+        self._stack.append([token] if token is not None else _NO_TOKENS)
+
+    def end(self, tag: str) -> None:
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        tokens = self._stack.pop()
+        if not self._stack:
+            self._resolve(tokens, final=True)
+            self.elements.loose_controls = sum(1 for token in tokens if token.action is not None or token.slider)
+            return
+        # A lone token has nothing to pair with before the root closes. Tokens of
+        # a container that produced a row are spent; all others move up as they
+        # are, and the list itself is handed to a parent that has none yet.
+        if not tokens or (len(tokens) > 1 and self._resolve(tokens, final=False)):
+            return
+        if self._stack[-1] is _NO_TOKENS:
+            self._stack[-1] = tokens
+        else:
+            self._stack[-1].extend(tokens)
+
+    def close(self) -> None:
+        return None
+
+    def _text_token(self, text: str, bounds: str | None) -> _Token | None:
+        label = _classify_text(text)
+        if label.scenario:
+            scenario = Scenario(id=slugify(text), name=label.stripped)
+            self.scenarios[scenario.id] = scenario
+            if (scenario_bounds := parse_bounds(bounds)) is not None:
+                self.elements.scenarios.setdefault(scenario.name, scenario_bounds)
+        for button in label.buttons:
+            if (button_bounds := parse_bounds(bounds)) is not None:
+                self.elements.buttons.setdefault(button, button_bounds)
+        if label.reading:
+            # "Batteria 80%" is a reading of the shade, neither its position nor its name.
+            return None
+        return _Token(label.stripped, bounds, label.percent, label.action)
+
+    def _resolve(self, tokens: list[_Token], final: bool) -> bool:
+        """Pair percentages with names inside one container, consuming both.
+
+        Returns whether a shade was found; the container's tokens are then spent.
+        """
+        positions = [idx for idx, token in enumerate(tokens) if token.percent is not None]
+        if not positions:
+            return False
+        if not final and not any(token.nameable for token in tokens):
+            return False
+
+        # A container holding a single percentage is a list row: its title is the
+        # first label in it. Several percentages mean a flattened list, where each
+        # value belongs to the label right before it.
+        is_row = len(positions) == 1
+        emitted = False
+        for idx in positions:
+            label = self._find_label(tokens, idx, first=is_row)
+            if label is None:
+                if not final:
+                    continue
+                name = f"Shade {len(self.shades) + 1}"
+            else:
+                label.nameable = False
+                name = label.text
+                if is_row:
+                    self._record_row(name, label, tokens)
+
+            self.shades.append(
+                ShadeState(id=slugify(name), name=name, position=tokens[idx].percent, is_moving=False)
+            )
+            tokens[idx].percent = None
+            emitted = True
+
+        if emitted:
+            # Leftovers belong to an already resolved row; never let them name,
+            # position or add controls to shades of other rows further up the tree.
+            for token in tokens:
+                token.nameable = False
+                token.percent = None
+                token.action = None
+                token.slider = False
+        return emitted
+
+    def _record_row(self, name: str, label: _Token, tokens: list[_Token]) -> None:
+        if (row_bounds := parse_bounds(label.bounds)) is not None:
+            self.elements.rows[name] = row_bounds
+        for token in tokens:
+            if token.action is not None and (bounds := parse_bounds(token.bounds)) is not None:
+                self.elements.actions.setdefault(name, {}).setdefault(token.action, bounds)
+
+    @staticmethod
+    def _find_label(tokens: list[_Token], idx: int, first: bool) -> _Token | None:
+        preceding = range(idx) if first else range(idx - 1, -1, -1)
+        for pos in preceding:
+            if tokens[pos].nameable:
+                return tokens[pos]
+        for candidate in tokens[idx + 1 :]:
+            if candidate.nameable:
+                return candidate
+        return None
+
+
+@lru_cache(maxsize=4)
+def _foreign_package_re(package: str) -> re.Pattern[str]:
+    # No leading word boundary: it would disable the fast literal search.
+    return re.compile(rf'package="(?!{re.escape(package)}")')
+
+
+def strip_foreign_nodes(hierarchy_xml: str, package: str) -> str:
+    """Drop the tags of nodes belonging to other packages, e.g. the status bar clock.
+
+    The result is not well-formed XML anymore (closing tags stay); it is meant
+    for cheap comparisons of the app's part of a dump without parsing it.
+    """
+    # Only the few foreign attributes are searched for; matching whole tags
+    # would backtrack through the attributes of every node of the dump.
+    parts: list[str] = []
+    end = 0
+    for match in _foreign_package_re(package).finditer(hierarchy_xml):
+        if match.start() < end:
+            continue
+        tag_start = hierarchy_xml.rfind("<node", end, match.start())
+        tag_end = hierarchy_xml.find(">", match.end())
+        if tag_start == -1 or tag_end == -1:
+            continue
+        parts.append(hierarchy_xml[end:tag_start])
+        end = tag_end + 1
+    if not parts:
+        return hierarchy_xml
+    parts.append(hierarchy_xml[end:])
+    return "".join(parts)
+
+
+def parse_hierarchy(hierarchy_xml: str, package: str | None = None) -> ParsedHierarchy:
+    """Extract shades and scenarios from a uiautomator dump in one pass.
+
+    Fragments without a single root element are accepted as well, which keeps the
+    parser usable on partial or hand-written dumps. With ``package``, nodes of
+    other packages and everything below them are ignored.
+    """
+    state = _HierarchyParser(package)
+    parser = ElementTree.XMLParser(target=state)
+    body = _PROLOG_RE.sub("", hierarchy_xml, count=1)
+
+    parser.feed("<dump>")
+    for offset in range(0, len(body), _CHUNK_SIZE):
+        parser.feed(body[offset : offset + _CHUNK_SIZE])
+    parser.feed("</dump>")
+    parser.close()
+
+    return ParsedHierarchy(
+        shades=state.shades,
+        scenarios=list(state.scenarios.values()),
+        elements=state.elements,
+    )
+
+
+def parse_shade_details(hierarchy_xml: str, package: str | None = None) -> dict[str, int]:
+    """Read the labelled numbers of a shade's detail page, e.g. battery and signal.
+
+    The value is taken from the label itself ("Battery 80%") or from the label
+    right after it ("Signal", "-67 dBm"). Only labels of ``package`` are read.
+    """
+    if package is not None:
+        hierarchy_xml = strip_foreign_nodes(hierarchy_xml, package)
+    texts = [text for raw in _TEXT_ATTR_RE.findall(hierarchy_xml) if (text := html.unescape(raw).strip())]
+    details: dict[str, int] = {}
+    for idx, text in enumerate(texts):
+        for metric, pattern in _DETAIL_RES.items():
+            if metric in details or not pattern.search(text):
+                continue
+            for candidate in texts[idx : idx + 2]:
+                if match := _NUMBER_RE.search(candidate):
+                    details[metric] = int(match.group())
+                    break
+    return details
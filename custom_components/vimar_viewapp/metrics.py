@@ -0,0 +1,135 @@
+"""Rolling latency histograms for the phases of Vimar client operations."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
+import math
+import threading
+import time
+from typing import Any
+
+from .const import METRICS_WINDOW, TIMEOUT_MAX, TIMEOUT_MIN, TIMEOUT_MIN_SAMPLES, TIMEOUT_P95_FACTOR
+
+
+class LatencyHistogram:
+    """Durations of the last ``window`` runs of one phase plus lifetime counters."""
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+
+    def record(self, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+            self.errors += error
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the nearest-rank percentile in seconds, or None without samples."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+    def maximum(self) -> float | None:
+        with self._lock:
+            return max(self._samples, default=None)
+
+    def as_dict(self) -> dict[str, Any]:
+        def _ms(seconds: float | None) -> float | None:
+            return None if seconds is None else round(seconds * 1000, 1)
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "p50_ms": _ms(self.percentile(0.5)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "max_ms": _ms(self.maximum()),
+        }
+
+
+class PhaseMetrics:
+    """Collect timing spans per phase; safe to use from the device worker threads."""
+
+    def __init__(self, window: int = METRICS_WINDOW, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._window = window
+        self._clock = clock
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, phase: str) -> LatencyHistogram:
+        with self._lock:
+            if (histogram := self._histograms.get(phase)) is None:
+                histogram = self._histograms[phase] = LatencyHistogram(self._window)
+            return histogram
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block; exceptions are counted as errors and re-raised."""
+        started = self._clock()
+        try:
+            yield
+        except BaseException:
+            self.histogram(phase).record(self._clock() - started, error=True)
+            raise
+        self.histogram(phase).record(self._clock() - started)
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {phase: histograms[phase].as_dict() for phase in sorted(histograms)}
+
+
+class AdaptiveTimeouts:
+    """Timeouts per kind of device wait, learned from how long successful waits took.
+
+    A timeout only matters when the awaited widget or screen does not show up,
+    so it is derived from the waits that succeeded: ``factor`` times their 95th
+    percentile, within ``floor`` and ``ceiling``. A fast device thus stops
+    wasting seconds on negative checks, and a slow one stops reporting widgets
+    as missing. A wait that times out doubles its kind's timeout until the next
+    success, so a device that suddenly got slower is not starved of samples.
+    """
+
+    def __init__(
+        self,
+        defaults: Mapping[str, float],
+        window: int = METRICS_WINDOW,
+        factor: float = TIMEOUT_P95_FACTOR,
+        floor: float = TIMEOUT_MIN,
+        ceiling: float = TIMEOUT_MAX,
+        min_samples: int = TIMEOUT_MIN_SAMPLES,
+    ) -> None:
+        self._defaults = dict(defaults)
+        self._window = window
+        self._factor = factor
+        self._floor = floor
+        self._ceiling = ceiling
+        self._min_samples = min_samples
+        self._waits: dict[str, LatencyHistogram] = {}
+        self._misses: dict[str, int] = {}
+
+    def timeout(self, kind: str) -> float:
+        waits = self._waits.get(kind)
+        p95 = waits.percentile(0.95) if waits is not None and waits.count >= self._min_samples else None
+        base = self._defaults[kind] if p95 is None else min(self._ceiling, max(self._floor, p95 * self._factor))
+        return min(self._ceiling, base * 2 ** self._misses.get(kind, 0))
+
+    def record(self, kind: str, seconds: float) -> None:
+        """Note a successful wait of ``seconds``."""
+        if (waits := self._waits.get(kind)) is None:
+            waits = self._waits[kind] = LatencyHistogram(self._window)
+        waits.record(seconds)
+        self._misses[kind] = 0
+
+    def miss(self, kind: str) -> None:
+        """Note a wait that timed out."""
+        self._misses[kind] = self._misses.get(kind, 0) + 1
+
+    def as_dict(self) -> dict[str, float]:
+        return {kind: round(self.timeout(kind), 2) for kind in sorted(self._defaults)}
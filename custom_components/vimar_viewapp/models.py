@@ -0,0 +1,92 @@
+"""Data records describing the Vimar app state."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class ShadeState:
+    """Represents a single shade status extracted from app UI."""
+
+    id: str
+    name: str
+    position: int | None
+    is_moving: bool
+    battery: int | None = None
+    signal: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """Represents a scenario/action button in the app."""
+
+    id: str
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class ShadeOperation:
+    """One cover command for a shade, addressed by its label in the app."""
+
+    name: str
+    action: str
+    position: int | None = None
+
+
+def _index(records: Iterable[ShadeState | Scenario]) -> Mapping[str, Any]:
+    return MappingProxyType({record.id: record for record in records})
+
+
+@dataclass(frozen=True, slots=True)
+class VimarSnapshot:
+    """Immutable app state published by the coordinator, indexed by record id."""
+
+    shades: Mapping[str, ShadeState] = field(default_factory=lambda: MappingProxyType({}))
+    scenarios: Mapping[str, Scenario] = field(default_factory=lambda: MappingProxyType({}))
+
+    @classmethod
+    def from_records(cls, shades: Iterable[ShadeState], scenarios: Iterable[Scenario]) -> VimarSnapshot:
+        return cls(shades=_index(shades), scenarios=_index(scenarios))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> VimarSnapshot:
+        """Rebuild a snapshot stored with ``as_dict``; restored shades are never moving."""
+        return cls.from_records(
+            (
+                ShadeState(
+                    id=shade["id"],
+                    name=shade["name"],
+                    position=shade.get("position"),
+                    is_moving=False,
+                    battery=shade.get("battery"),
+                    signal=shade.get("signal"),
+                )
+                for shade in data.get("shades", [])
+            ),
+            (Scenario(id=scenario["id"], name=scenario["name"]) for scenario in data.get("scenarios", [])),
+        )
+
+    def as_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """Return a JSON-serializable form of the snapshot."""
+        return {
+            "shades": [asdict(shade) for shade in self.shades.values()],
+            "scenarios": [asdict(scenario) for scenario in self.scenarios.values()],
+        }
+
+    def changed_ids(self, previous: VimarSnapshot) -> set[str]:
+        """Return ids of shades/scenarios added, removed or modified since ``previous``."""
+        changed: set[str] = set()
+        for old, new in ((previous.shades, self.shades), (previous.scenarios, self.scenarios)):
+            changed |= old.keys() ^ new.keys()
+            changed.update(record_id for record_id in old.keys() & new.keys() if old[record_id] != new[record_id])
+        return changed
+
+    def with_shades(self, shades: Iterable[ShadeState]) -> VimarSnapshot:
+        """Return a copy with the given shade records replaced or added."""
+        merged = dict(self.shades)
+        merged.update((shade.id, shade) for shade in shades)
+        return VimarSnapshot(shades=MappingProxyType(merged), scenarios=self.scenarios)
@@ -0,0 +1,134 @@
+"""Shade motion model used to report movement between polls."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import time
+
+from .const import (
+    DEFAULT_SHADE_TRAVEL_TIME,
+    SHADE_ACTION_CLOSE,
+    SHADE_ACTION_OPEN,
+    SHADE_ACTION_SET_POSITION,
+    SHADE_ACTION_STOP,
+)
+
+# Bounds and smoothing for learned full-travel times, in seconds.
+_MIN_TRAVEL_TIME = 5.0
+_MAX_TRAVEL_TIME = 120.0
+_LEARNING_RATE = 0.5
+# Positions within this many percent of the target count as arrived.
+_ARRIVAL_TOLERANCE = 2
+
+
+@dataclass(slots=True)
+class ShadeMotion:
+    """A commanded movement of one shade."""
+
+    start_position: int
+    target: int
+    started_at: float
+    travel_time: float
+
+    @property
+    def direction(self) -> int:
+        return (self.target > self.start_position) - (self.target < self.start_position)
+
+    def position_at(self, now: float) -> int:
+        distance = abs(self.target - self.start_position)
+        moved = min(distance, (now - self.started_at) * 100 / self.travel_time)
+        return round(self.start_position + self.direction * moved)
+
+    def finished_at(self) -> float:
+        return self.started_at + abs(self.target - self.start_position) * self.travel_time / 100
+
+
+class MotionTracker:
+    """Track commanded shade movements and learn each shade's travel time.
+
+    Commands start a motion; positions are then interpolated from the learned
+    full-travel time until the target is reached. Polled positions correct the
+    model: intermediate readings re-anchor it and refine the travel time.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._motions: dict[str, ShadeMotion] = {}
+        self._travel_times: dict[str, float] = {}
+
+    def travel_time(self, shade_id: str) -> float:
+        return self._travel_times.get(shade_id, DEFAULT_SHADE_TRAVEL_TIME)
+
+    def start(self, shade_id: str, position: int | None, action: str, target: int | None = None) -> None:
+        """Record that a command was sent to a shade."""
+        if action == SHADE_ACTION_STOP:
+            self.stop(shade_id)
+            return
+
+        current = self.position(shade_id, position)
+        if current is None:
+            return
+        if action == SHADE_ACTION_OPEN:
+            target = 100
+        elif action == SHADE_ACTION_CLOSE:
+            target = 0
+        elif action != SHADE_ACTION_SET_POSITION or target is None:
+            return
+
+        if target == current:
+            self._motions.pop(shade_id, None)
+            return
+        self._motions[shade_id] = ShadeMotion(current, target, self._clock(), self.travel_time(shade_id))
+
+    def stop(self, shade_id: str) -> None:
+        self._motions.pop(shade_id, None)
+
+    def position(self, shade_id: str, polled: int | None) -> int | None:
+        """Return the estimated position, falling back to the polled one."""
+        motion = self._active(shade_id)
+        if motion is None:
+            return polled
+        return motion.position_at(self._clock())
+
+    def direction(self, shade_id: str) -> int:
+        """Return 1 while opening, -1 while closing and 0 when idle."""
+        motion = self._active(shade_id)
+        return motion.direction if motion else 0
+
+    def moving_ids(self) -> set[str]:
+        return {shade_id for shade_id in list(self._motions) if self._active(shade_id)}
+
+    def observe(self, shade_id: str, position: int | None) -> None:
+        """Correct the model with a position read from the app."""
+        motion = self._active(shade_id)
+        if motion is None or position is None:
+            return
+
+        now = self._clock()
+        elapsed = now - motion.started_at
+        if abs(position - motion.target) <= _ARRIVAL_TOLERANCE:
+            # Arrival only bounds the travel time from above: the shade may have
+            # stopped long before this poll.
+            if now < motion.finished_at():
+                self._learn(shade_id, elapsed * 100 / abs(motion.target - motion.start_position))
+            self._motions.pop(shade_id)
+            return
+
+        moved = (position - motion.start_position) * motion.direction
+        if moved <= 0 or elapsed <= 0:
+            return
+        self._learn(shade_id, elapsed * 100 / moved)
+        self._motions[shade_id] = ShadeMotion(position, motion.target, now, self.travel_time(shade_id))
+
+    def _active(self, shade_id: str) -> ShadeMotion | None:
+        motion = self._motions.get(shade_id)
+        if motion is not None and self._clock() >= motion.finished_at():
+            del self._motions[shade_id]
+            return None
+        return motion
+
+    def _learn(self, shade_id: str, sample: float) -> None:
+        sample = max(_MIN_TRAVEL_TIME, min(_MAX_TRAVEL_TIME, sample))
+        learned = self.travel_time(shade_id)
+        self._travel_times[shade_id] = learned + _LEARNING_RATE * (sample - learned)
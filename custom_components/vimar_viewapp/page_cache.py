@@ -0,0 +1,92 @@
+"""Per-page cache of parsed records for lists longer than one screen."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import time
+from typing import TypeVar
+
+from .hierarchy_parser import ParsedHierarchy
+from .models import Scenario, ShadeState
+
+_R = TypeVar("_R", ShadeState, Scenario)
+
+
+@dataclass(slots=True)
+class CachedPage:
+    """Records parsed from one scroll position of the app list."""
+
+    signature: str
+    parsed: ParsedHierarchy
+    fetched_at: float
+    stale: bool = False
+
+
+class PageCache:
+    """Remember the parsed content of every page of the shade/scenario list.
+
+    Page 0 is what the app shows without scrolling and is refreshed on every
+    poll. Further pages are only revisited once they are older than ``max_age``
+    or were invalidated, e.g. because a command targeted one of their shades.
+    """
+
+    def __init__(self, max_age: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._max_age = max_age
+        self._clock = clock
+        self._pages: list[CachedPage] = []
+        self.crawled = False
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def signature_at(self, index: int) -> str | None:
+        return self._pages[index].signature if index < len(self._pages) else None
+
+    def store(self, index: int, parsed: ParsedHierarchy) -> None:
+        page = CachedPage(parsed.signature, parsed, self._clock())
+        if index < len(self._pages):
+            self._pages[index] = page
+        else:
+            self._pages.append(page)
+
+    def truncate(self, count: int) -> None:
+        """Drop pages past the end of the list and mark the crawl complete."""
+        del self._pages[count:]
+        self.crawled = True
+
+    def stale_indices(self) -> list[int]:
+        """Return indices of scrolled pages that need to be visited again."""
+        now = self._clock()
+        return [
+            index
+            for index, page in enumerate(self._pages)
+            if index and (page.stale or now - page.fetched_at >= self._max_age)
+        ]
+
+    def needs_crawl(self) -> bool:
+        return not self.crawled or bool(self.stale_indices())
+
+    def invalidate(self, names: Iterable[str]) -> None:
+        """Mark pages listing any of the given shade/scenario names as stale."""
+        wanted = set(names)
+        for page in self._pages:
+            records = (*page.parsed.shades, *page.parsed.scenarios)
+            if any(record.name in wanted for record in records):
+                page.stale = True
+
+    def records(self) -> tuple[list[ShadeState], list[Scenario]]:
+        """Merge all pages in list order; overlapping rows take the newest value."""
+        shades = self._merge(lambda parsed: parsed.shades)
+        scenarios = self._merge(lambda parsed: parsed.scenarios)
+        return list(shades.values()), list(scenarios.values())
+
+    def _merge(self, select: Callable[[ParsedHierarchy], list[_R]]) -> dict[str, _R]:
+        merged: dict[str, _R] = {}
+        fetched: dict[str, float] = {}
+        for page in self._pages:
+            for record in select(page.parsed):
+                if record.id not in merged or fetched[record.id] <= page.fetched_at:
+                    merged[record.id] = record
+                    fetched[record.id] = page.fetched_at
+        return merged
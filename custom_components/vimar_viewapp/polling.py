@@ -0,0 +1,95 @@
+"""Adaptive poll interval scheduling for the Vimar coordinator."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+import time
+from typing import Any
+
+from .const import FAST_POLL_INTERVAL, FAST_POLL_WINDOW
+
+_IDLE_BACKOFF = 2.0
+_DURATION_WINDOW = 50
+
+
+class AdaptivePollScheduler:
+    """Choose the next poll interval from recent activity and poll outcomes.
+
+    Polls run every ``fast`` seconds for a while after a command or while a
+    shade is moving. When nothing changes, the interval doubles from ``base`` up
+    to ``ceiling``; any change resets it to ``base``. Failing polls back off
+    exponentially as well, up to twice the ceiling, to leave a booting or
+    overloaded emulator alone. While ``push_active`` is set, app activity
+    triggers refreshes on its own and idle polls drop straight to the ceiling as
+    a safety net.
+    """
+
+    def __init__(
+        self,
+        base: float,
+        ceiling: float,
+        fast: float = FAST_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.base = base
+        self.ceiling = max(base, ceiling)
+        self.fast = min(fast, base)
+        self._clock = clock
+        self._fast_until = 0.0
+        self._idle_polls = 0
+        self._consecutive_failures = 0
+        self.interval = base
+        self.push_active = False
+
+        self.polls = 0
+        self.failures = 0
+        self._durations: deque[float] = deque(maxlen=_DURATION_WINDOW)
+
+    def note_activity(self) -> None:
+        """Poll quickly for a while, e.g. after a command was sent."""
+        self._fast_until = self._clock() + FAST_POLL_WINDOW
+        self._idle_polls = 0
+
+    def record_success(self, duration: float, changed: bool, moving: bool) -> float:
+        """Account for a successful poll and return the next interval."""
+        self.polls += 1
+        self._durations.append(duration)
+        self._consecutive_failures = 0
+
+        if moving or self._clock() < self._fast_until:
+            self._idle_polls = 0
+            self.interval = self.fast
+        elif changed:
+            self._idle_polls = 0
+            self.interval = self.base
+        elif self.push_active:
+            self.interval = self.ceiling
+        else:
+            self._idle_polls += 1
+            self.interval = min(self.ceiling, self.base * _IDLE_BACKOFF**self._idle_polls)
+        return self.interval
+
+    def record_failure(self, duration: float) -> float:
+        """Account for a failed poll and return the next interval."""
+        self.polls += 1
+        self.failures += 1
+        self._durations.append(duration)
+        self._consecutive_failures += 1
+        self.interval = min(2 * self.ceiling, self.base * 2**self._consecutive_failures)
+        return self.interval
+
+    def as_dict(self) -> dict[str, Any]:
+        durations = self._durations
+        return {
+            "current_interval": self.interval,
+            "push_active": self.push_active,
+            "base_interval": self.base,
+            "max_interval": self.ceiling,
+            "polls": self.polls,
+            "failures": self.failures,
+            "consecutive_failures": self._consecutive_failures,
+            "last_duration": durations[-1] if durations else None,
+            "mean_duration": sum(durations) / len(durations) if durations else None,
+            "max_duration": max(durations) if durations else None,
+        }
@@ -0,0 +1,74 @@
+"""Recognize app screens from one hierarchy capture and plan the way between them."""
+
+from __future__ import annotations
+
+from collections.abc import Collection
+from enum import StrEnum
+
+from .hierarchy_parser import ParsedHierarchy
+
+
+class Screen(StrEnum):
+    """Screens of the Vimar app the client knows how to handle."""
+
+    LOGIN = "login"
+    PIN = "pin"
+    SHADE_LIST = "shade_list"
+    SHADE_DETAIL = "shade_detail"
+    SCENARIO_LIST = "scenario_list"
+    UNKNOWN = "unknown"
+
+
+class NavAction(StrEnum):
+    """Steps that move the app from one screen to another."""
+
+    LOGIN = "login"
+    SUBMIT_PIN = "submit_pin"
+    BACK = "back"
+
+
+# Screens polls and commands start from.
+LIST_SCREENS = frozenset({Screen.SHADE_LIST, Screen.SCENARIO_LIST})
+
+# The step taken on each screen and the screen it is expected to lead to. A PIN
+# prompt after the login is not predictable, so routes are re-planned from the
+# screen actually reached after every step.
+_TRANSITIONS: dict[Screen, tuple[NavAction, Screen]] = {
+    Screen.LOGIN: (NavAction.LOGIN, Screen.SHADE_LIST),
+    Screen.PIN: (NavAction.SUBMIT_PIN, Screen.SHADE_LIST),
+    Screen.SHADE_DETAIL: (NavAction.BACK, Screen.SHADE_LIST),
+    Screen.UNKNOWN: (NavAction.BACK, Screen.SHADE_LIST),
+}
+
+
+def classify_screen(parsed: ParsedHierarchy) -> Screen:
+    """Label the screen a capture shows, without any further device calls."""
+    elements = parsed.elements
+    if elements.inputs >= 2 or elements.password_input:
+        return Screen.LOGIN
+    if elements.inputs == 1:
+        return Screen.PIN
+    if (elements.sliders or elements.loose_controls) and not elements.scrollable:
+        # A slider, or shade buttons outside any list row, on a screen that does
+        # not scroll: a single shade's page, whatever percentage it shows.
+        return Screen.SHADE_DETAIL
+    if parsed.shades:
+        return Screen.SHADE_LIST
+    if parsed.scenarios:
+        return Screen.SCENARIO_LIST
+    return Screen.UNKNOWN
+
+
+def plan_route(current: Screen, targets: Collection[Screen]) -> list[NavAction]:
+    """Return the steps expected to lead from ``current`` to one of ``targets``.
+
+    An empty list means ``current`` already is a target, or none is reachable.
+    """
+    route: list[NavAction] = []
+    screen = current
+    while screen not in targets:
+        if screen not in _TRANSITIONS or len(route) > len(_TRANSITIONS):
+            return []
+        action, screen = _TRANSITIONS[screen]
+        route.append(action)
+    return route
@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+from homeassistant.const import PERCENTAGE, SIGNAL_STRENGTH_DECIBELS_MILLIWATT, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DATA_COORDINATOR, DOMAIN
+from .const import DATA_COORDINATOR, DATA_METRICS, DOMAIN, PHASES
 from .coordinator import VimarDataUpdateCoordinator
+from .metrics import PhaseMetrics
+from .models import ShadeState
+
+# Refresh interval of the polled latency sensors.
+SCAN_INTERVAL = timedelta(seconds=60)
 
 
 async def async_setup_entry(
@@ -18,15 +25,18 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    coordinator: VimarDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
-    entities: list[VimarShadeSensor] = []
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: VimarDataUpdateCoordinator = entry_data[DATA_COORDINATOR]
+    entities: list[SensorEntity] = []
 
-    for shade in coordinator.data.get("shades", []):
-        shade_id = shade["id"]
+    for shade_id in coordinator.data.shades:
         entities.append(VimarShadeSensor(coordinator, shade_id, "position", PERCENTAGE))
         entities.append(VimarShadeSensor(coordinator, shade_id, "battery", PERCENTAGE))
         entities.append(VimarShadeSensor(coordinator, shade_id, "signal", SIGNAL_STRENGTH_DECIBELS_MILLIWATT))
 
+    metrics: PhaseMetrics = entry_data[DATA_METRICS]
+    entities.extend(VimarLatencySensor(entry.entry_id, metrics, phase) for phase in PHASES)
+
     async_add_entities(entities)
 
 
@@ -42,17 +52,14 @@ class VimarShadeSensor(CoordinatorEntity[VimarDataUpdateCoordinator], SensorEnti
         metric: str,
         unit: str,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=shade_id)
         self._shade_id = shade_id
         self._metric = metric
         self._attr_native_unit_of_measurement = unit
 
     @property
-    def _shade(self):
-        for shade in self.coordinator.data.get("shades", []):
-            if shade["id"] == self._shade_id:
-                return shade
-        return None
+    def _shade(self) -> ShadeState | None:
+        return self.coordinator.data.shades.get(self._shade_id)
 
     @property
     def unique_id(self) -> str:
@@ -61,7 +68,7 @@ class VimarShadeSensor(CoordinatorEntity[VimarDataUpdateCoordinator], SensorEnti
     @property
     def name(self) -> str | None:
         shade = self._shade
-        shade_name = shade["name"] if shade else self._shade_id
+        shade_name = shade.name if shade else self._shade_id
         return f"{shade_name} {self._metric}"
 
     @property
@@ -69,4 +76,26 @@ class VimarShadeSensor(CoordinatorEntity[VimarDataUpdateCoordinator], SensorEnti
         shade = self._shade
         if not shade:
             return None
-        return shade.get(self._metric)
+        return getattr(shade, self._metric)
+
+
+class VimarLatencySensor(SensorEntity):
+    """Diagnostic sensor reporting the p95 latency of one client phase."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_should_poll = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry_id: str, metrics: PhaseMetrics, phase: str) -> None:
+        self._metrics = metrics
+        self._phase = phase
+        self._attr_unique_id = f"vimar_{entry_id}_{phase}_latency"
+        self._attr_name = f"Vimar {phase.replace('_', ' ')} latency"
+
+    async def async_update(self) -> None:
+        stats = self._metrics.histogram(self._phase).as_dict()
+        self._attr_native_value = stats.pop("p95_ms")
+        self._attr_extra_state_attributes = stats
@@ -0,0 +1,104 @@
+"""Services exposed by the Vimar View App integration."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_ACTION,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_OPERATIONS,
+    ATTR_SHADE,
+    ATTR_SHADE_POSITION,
+    DATA_COORDINATOR,
+    DOMAIN,
+    SERVICE_RUN_SHADE_BATCH,
+    SHADE_ACTION_SET_POSITION,
+    SHADE_ACTIONS,
+)
+from .coordinator import VimarDataUpdateCoordinator
+from .models import ShadeOperation
+
+
+def _validate_operation(operation: dict) -> dict:
+    if operation[ATTR_ACTION] == SHADE_ACTION_SET_POSITION and ATTR_SHADE_POSITION not in operation:
+        raise vol.Invalid("set_position operations require a position")
+    return operation
+
+
+OPERATION_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_SHADE): cv.string,
+            vol.Required(ATTR_ACTION): vol.In(SHADE_ACTIONS),
+            vol.Optional(ATTR_SHADE_POSITION): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+        }
+    ),
+    _validate_operation,
+)
+
+RUN_SHADE_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_OPERATIONS): vol.All(cv.ensure_list, [OPERATION_SCHEMA]),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services once for all config entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_RUN_SHADE_BATCH):
+        return
+
+    async def async_run_shade_batch(call: ServiceCall) -> None:
+        entries: dict[str, dict] = hass.data.get(DOMAIN, {})
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        if entry_id is not None:
+            if entry_id not in entries:
+                raise HomeAssistantError(f"Unknown Vimar config entry '{entry_id}'")
+            entries = {entry_id: entries[entry_id]}
+
+        batches: dict[str, list[ShadeOperation]] = defaultdict(list)
+        for operation in call.data[ATTR_OPERATIONS]:
+            target = _resolve_shade(entries, operation[ATTR_SHADE])
+            if target is None:
+                raise HomeAssistantError(f"Unknown Vimar shade '{operation[ATTR_SHADE]}'")
+            target_entry_id, shade_name = target
+            batches[target_entry_id].append(
+                ShadeOperation(shade_name, operation[ATTR_ACTION], operation.get(ATTR_SHADE_POSITION))
+            )
+
+        for target_entry_id, operations in batches.items():
+            coordinator: VimarDataUpdateCoordinator = entries[target_entry_id][DATA_COORDINATOR]
+            try:
+                await coordinator.async_run_shade_batch(operations)
+            except RuntimeError as err:
+                raise HomeAssistantError(str(err)) from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_RUN_SHADE_BATCH, async_run_shade_batch, schema=RUN_SHADE_BATCH_SCHEMA
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services when the last config entry is unloaded."""
+    if not hass.data.get(DOMAIN):
+        hass.services.async_remove(DOMAIN, SERVICE_RUN_SHADE_BATCH)
+
+
+def _resolve_shade(entries: dict[str, dict], shade: str) -> tuple[str, str] | None:
+    """Find the entry owning a shade given its id or its label in the app."""
+    for entry_id, data in entries.items():
+        shades = data[DATA_COORDINATOR].data.shades
+        if shade in shades:
+            return entry_id, shades[shade].name
+        for state in shades.values():
+            if state.name == shade:
+                return entry_id, state.name
+    return None
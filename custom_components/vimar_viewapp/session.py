@@ -0,0 +1,34 @@
+"""Session-state tracking for the automated Vimar app."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import time
+
+
+class SessionTracker:
+    """Remember when the Vimar app was last known to be in a logged-in state.
+
+    While the session is valid the client only performs a cheap foreground check
+    instead of relaunching the app and probing for login/PIN widgets.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttl = ttl
+        self._clock = clock
+        self._validated_at: float | None = None
+
+    @property
+    def validated_at(self) -> float | None:
+        return self._validated_at
+
+    def is_valid(self) -> bool:
+        if self._validated_at is None:
+            return False
+        return self._clock() - self._validated_at < self._ttl
+
+    def mark_valid(self) -> None:
+        self._validated_at = self._clock()
+
+    def invalidate(self) -> None:
+        self._validated_at = None
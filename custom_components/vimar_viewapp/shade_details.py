@@ -0,0 +1,76 @@
+"""Cache of readings taken from shade detail pages, such as battery and signal."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import replace
+import math
+import time
+from typing import Any
+
+from .models import ShadeState
+
+
+class ShadeDetailCache:
+    """Last readings per shade and metric, each due for a refresh within its metric's TTL.
+
+    Detail pages are slow to open, so only a few shades are visited at a time.
+    ``due`` hands out shades in round-robin order, continuing after the last
+    one visited, and skips shades visited less than half the shortest TTL
+    ago; ``batch_size`` tells how many shades each crawl must visit for that to
+    hold. A crawl falling behind only leaves readings older than their TTL:
+    they are still served, and counted as stale, until a visit replaces them.
+    """
+
+    def __init__(self, ttls: Mapping[str, float], clock: Callable[[], float] = time.monotonic) -> None:
+        self._ttls = dict(ttls)
+        self._clock = clock
+        self._readings: dict[str, dict[str, tuple[int, float]]] = {}
+        self._visited: dict[str, float] = {}
+        self._cursor: str | None = None
+        self._refresh_after = min(self._ttls.values()) / 2
+
+    def due(self, shade_ids: Sequence[str], limit: int) -> list[str]:
+        """Return up to ``limit`` shades to visit next."""
+        ids = list(shade_ids)
+        if self._cursor in ids:
+            start = ids.index(self._cursor) + 1
+            ids = ids[start:] + ids[:start]
+        now = self._clock()
+        return [
+            shade_id
+            for shade_id in ids
+            if shade_id not in self._visited or now - self._visited[shade_id] >= self._refresh_after
+        ][:limit]
+
+    def batch_size(self, shade_count: int, interval: float) -> int:
+        """Return the shades to visit per crawl, one every ``interval`` seconds, to keep up."""
+        return math.ceil(shade_count * interval / self._refresh_after)
+
+    def store(self, shade_id: str, values: Mapping[str, int]) -> None:
+        """Record a visit; metrics the page did not show keep their last reading."""
+        now = self._clock()
+        self._visited[shade_id] = now
+        self._cursor = shade_id
+        readings = self._readings.setdefault(shade_id, {})
+        readings.update((metric, (value, now)) for metric, value in values.items() if metric in self._ttls)
+
+    def values(self, shade_id: str) -> dict[str, int]:
+        return {metric: value for metric, (value, _) in self._readings.get(shade_id, {}).items()}
+
+    def fill(self, shade: ShadeState) -> ShadeState:
+        """Return ``shade`` carrying its cached readings; the same object if nothing changes."""
+        values = {metric: value for metric, value in self.values(shade.id).items() if getattr(shade, metric) != value}
+        return replace(shade, **values) if values else shade
+
+    def as_dict(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            "visited": len(self._visited),
+            "readings": sum(len(readings) for readings in self._readings.values()),
+            "stale": sum(
+                now - taken >= self._ttls[metric]
+                for readings in self._readings.values()
+                for metric, (_, taken) in readings.items()
+            ),
+        }
@@ -0,0 +1,46 @@
+"""Persistent copy of the last snapshot read from the Vimar app."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, STORAGE_VERSION
+from .models import VimarSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VimarSnapshotStore:
+    """Keep the last good snapshot of a config entry in Home Assistant storage.
+
+    At startup the stored snapshot lets entities be created before the emulator
+    is reachable. Saves are delayed so frequent polls write at most once per
+    ``SNAPSHOT_SAVE_DELAY`` seconds.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    async def async_load(self) -> VimarSnapshot | None:
+        data = await self._store.async_load()
+        if not data:
+            return None
+        try:
+            snapshot = VimarSnapshot.from_dict(data)
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Ignoring invalid stored Vimar snapshot: %s", err)
+            return None
+        if not snapshot.shades and not snapshot.scenarios:
+            return None
+        return snapshot
+
+    @callback
+    def async_schedule_save(self, snapshot: VimarSnapshot) -> None:
+        self._store.async_delay_save(snapshot.as_dict, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -0,0 +1,290 @@
+"""Record device interactions of a client session and replay them later.
+
+A trace is a JSON-lines file. The first line is a header; every further line
+is either a device call (``call``, selector ``query``, ``args``, ``result`` or
+``error`` and the observed ``latency`` in seconds) or an operation marker
+(``op`` and ``args``) written when the client starts a poll or command.
+
+Typed text is the login password or the PIN, so ``set_text`` arguments are
+never written; replays do not need them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, is_dataclass
+import json
+import os
+import threading
+import time
+from typing import Any
+
+TRACE_VERSION = 1
+_REDACTED = "<redacted>"
+
+
+class TraceMismatchError(RuntimeError):
+    """Raised when a replayed client issues a call the trace cannot answer."""
+
+
+def _key(call: str, query: dict[str, Any] | None) -> str:
+    return call if query is None else f"{call} {json.dumps(query, sort_keys=True)}"
+
+
+def _encode(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+class TraceWriter:
+    """Append trace events to a file; the file is opened on the first event."""
+
+    def __init__(self, path: str | os.PathLike[str], serial: str, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._path = path
+        self._serial = serial
+        self._clock = clock
+        self._started = clock()
+        self._file: Any = None
+        self._lock = threading.Lock()
+
+    def write(self, event: dict[str, Any]) -> None:
+        event["t"] = round(self._clock() - self._started, 4)
+        with self._lock:
+            if self._file is None:
+                # Device calls run on the device worker thread, never on the event loop.
+                self._file = open(self._path, "a", encoding="utf-8")  # noqa: SIM115 - closed in close()
+                header = {"version": TRACE_VERSION, "serial": self._serial, "recorded_at": time.time()}
+                self._file.write(json.dumps(header) + "\n")
+            self._file.write(json.dumps(event) + "\n")
+            self._file.flush()
+
+    def mark(self, op: str, *args: Any) -> None:
+        self.write({"op": op, "args": _encode(args)})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _Recorder:
+    """Shared call recording for devices, selectors and scroll objects."""
+
+    def __init__(self, writer: TraceWriter, query: dict[str, Any] | None) -> None:
+        self._writer = writer
+        self._query = query
+
+    def _record(
+        self, call: str, func: Callable[..., Any], *args: Any, redact: bool = False, **kwargs: Any
+    ) -> Any:
+        recorded = [_REDACTED] * len(args) if redact else _encode(args)
+        event: dict[str, Any] = {"call": call, "query": self._query, "args": recorded, "kwargs": kwargs}
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as err:
+            event["error"] = f"{type(err).__name__}: {err}"
+            raise
+        else:
+            event["result"] = _encode(result)
+            return result
+        finally:
+            event["latency"] = round(time.perf_counter() - started, 4)
+            self._writer.write(event)
+
+
+class RecordingScroll(_Recorder):
+    def __init__(self, scroll: Any, writer: TraceWriter, query: dict[str, Any]) -> None:
+        super().__init__(writer, query)
+        self._scroll = scroll
+
+    def forward(self) -> bool:
+        return self._record("scroll.forward", self._scroll.forward)
+
+    def toBeginning(self) -> bool:  # noqa: N802 - uiautomator2 API name
+        return self._record("scroll.toBeginning", self._scroll.toBeginning)
+
+    def to(self, **kwargs: Any) -> bool:
+        return self._record("scroll.to", self._scroll.to, **kwargs)
+
+
+class RecordingSelector(_Recorder):
+    def __init__(self, selector: Any, writer: TraceWriter, query: dict[str, Any]) -> None:
+        super().__init__(writer, query)
+        self._selector = selector
+
+    @property
+    def scroll(self) -> RecordingScroll:
+        return RecordingScroll(self._selector.scroll, self._writer, self._query)
+
+    def exists(self, timeout: float = 0) -> bool:
+        return self._record("exists", self._selector.exists, timeout=timeout)
+
+    def click(self) -> None:
+        self._record("click", self._selector.click)
+
+    def set_text(self, text: str) -> None:
+        self._record("set_text", self._selector.set_text, text, redact=True)
+
+    def set_progress(self, value: int) -> None:
+        self._record("set_progress", self._selector.set_progress, value)
+
+
+class RecordingDevice(_Recorder):
+    """Wrap a uiautomator2 device and write every call made through it to a trace."""
+
+    def __init__(self, device: Any, writer: TraceWriter) -> None:
+        super().__init__(writer, None)
+        self._device = device
+        self.writer = writer
+
+    def __call__(self, **query: Any) -> RecordingSelector:
+        return RecordingSelector(self._device(**query), self._writer, query)
+
+    @property
+    def info(self) -> dict[str, Any]:
+        # Keep-alive pings depend on timing, not on the session; not recorded.
+        return self._device.info
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self._record("app_start", self._device.app_start, package, stop=stop)
+
+    def app_current(self) -> dict[str, Any]:
+        return self._record("app_current", self._device.app_current)
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        return self._record("dump_hierarchy", self._device.dump_hierarchy, compressed=compressed)
+
+    def press(self, key: str) -> None:
+        self._record("press", self._device.press, key)
+
+    def click(self, x: int, y: int) -> None:
+        self._record("click", self._device.click, x, y)
+
+
+def load_trace(path: str | os.PathLike[str]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return the header and the events of a trace file."""
+    with open(path, encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("version") != TRACE_VERSION:
+        raise ValueError(f"{path} is not a version {TRACE_VERSION} Vimar trace")
+    return lines[0], lines[1:]
+
+
+class _ReplayScroll:
+    def __init__(self, device: ReplayDevice, query: dict[str, Any]) -> None:
+        self._device = device
+        self._query = query
+
+    def forward(self) -> bool:
+        return self._device.serve("scroll.forward", self._query)
+
+    def toBeginning(self) -> bool:  # noqa: N802 - uiautomator2 API name
+        return self._device.serve("scroll.toBeginning", self._query)
+
+    def to(self, **kwargs: Any) -> bool:
+        return self._device.serve("scroll.to", self._query)
+
+
+class _ReplaySelector:
+    def __init__(self, device: ReplayDevice, query: dict[str, Any]) -> None:
+        self._device = device
+        self._query = query
+
+    @property
+    def scroll(self) -> _ReplayScroll:
+        return _ReplayScroll(self._device, self._query)
+
+    def exists(self, timeout: float = 0) -> bool:
+        return self._device.serve("exists", self._query)
+
+    def click(self) -> None:
+        self._device.serve("click", self._query)
+
+    def set_text(self, text: str) -> None:
+        self._device.serve("set_text", self._query)
+
+    def set_progress(self, value: int) -> None:
+        self._device.serve("set_progress", self._query)
+
+
+class ReplayDevice:
+    """Serve a recorded trace in place of a uiautomator2 device.
+
+    Each call sleeps for the recorded latency multiplied by ``time_scale`` (1.0
+    replays the original timing, 0 replays as fast as possible). In strict mode
+    calls must arrive in exactly the recorded order. Otherwise a call is
+    answered by the next recorded call of the same kind and selector after the
+    current position, or by the latest one before it, so a client version that
+    dumps or probes more or less often still sees the screens in session order.
+    """
+
+    def __init__(self, events: Iterable[dict[str, Any]], time_scale: float = 1.0, strict: bool = False) -> None:
+        self._events = [event for event in events if "call" in event]
+        self._time_scale = time_scale
+        self._strict = strict
+        self._position = 0
+        self._lock = threading.Lock()
+        self.served = 0
+        self.reused = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike[str], **kwargs: Any) -> ReplayDevice:
+        return cls(load_trace(path)[1], **kwargs)
+
+    def __call__(self, **query: Any) -> _ReplaySelector:
+        return _ReplaySelector(self, query)
+
+    @property
+    def info(self) -> dict[str, Any]:
+        return {}
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self.serve("app_start")
+
+    def app_current(self) -> dict[str, Any]:
+        return self.serve("app_current")
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        return self.serve("dump_hierarchy")
+
+    def press(self, key: str) -> None:
+        self.serve("press")
+
+    def click(self, x: int, y: int) -> None:
+        self.serve("click")
+
+    def serve(self, call: str, query: dict[str, Any] | None = None) -> Any:
+        event = self._match(_key(call, query))
+        if self._time_scale:
+            time.sleep(event["latency"] * self._time_scale)
+        if "error" in event:
+            raise RuntimeError(f"Replayed error: {event['error']}")
+        return event.get("result")
+
+    def _match(self, key: str) -> dict[str, Any]:
+        with self._lock:
+            self.served += 1
+            events = self._events
+            if self._strict:
+                if self._position >= len(events) or _key(events[self._position]["call"], events[self._position]["query"]) != key:
+                    expected = events[self._position]["call"] if self._position < len(events) else "end of trace"
+                    raise TraceMismatchError(f"Call {key} at position {self._position}, trace has {expected}")
+                self._position += 1
+                return events[self._position - 1]
+
+            for index in range(self._position, len(events)):
+                if _key(events[index]["call"], events[index]["query"]) == key:
+                    self.skipped += index - self._position
+                    self._position = index + 1
+                    return events[index]
+            for index in range(min(self._position, len(events)) - 1, -1, -1):
+                if _key(events[index]["call"], events[index]["query"]) == key:
+                    self.reused += 1
+                    return events[index]
+        raise TraceMismatchError(f"Call {key} was never recorded")
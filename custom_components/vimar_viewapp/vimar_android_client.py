@@ -6,43 +6,109 @@ and exposes high-level operations used by Home Assistant entities.
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import asyncio
+from collections.abc import Callable, Sequence
+import hashlib
 import logging
-import re
-from typing import Any
+import time
+from typing import Any, TypeVar
 
 import uiautomator2 as u2
 
-from .const import VIMAR_PACKAGE
+from .adb_shell import AdbShell
+from .command_scheduler import CommandScheduler, DeadlineExceededError, Priority, ShadeBatchError
+from .const import (
+    DEFAULT_ADB_FAST_PATH,
+    DEFAULT_COMPACT_DUMPS,
+    DEFAULT_TIMEOUTS,
+    ELEMENT_CACHE_TTL,
+    KEEPALIVE_INTERVAL,
+    MAX_NAVIGATION_STEPS,
+    MAX_PAGES,
+    NAVIGATION_SETTLE_INTERVAL,
+    PAGE_MAX_AGE,
+    PHASE_APP_START,
+    PHASE_COMMAND,
+    PHASE_CRAWL,
+    PHASE_DUMP,
+    PHASE_LOGIN,
+    PHASE_PARSE,
+    PHASE_SCENARIO,
+    PHASE_SELECTOR,
+    PHASE_SNAPSHOT,
+    PHASE_TAP,
+    RECONNECT_ATTEMPTS,
+    RECONNECT_BACKOFF,
+    RECONNECT_MAX_BACKOFF,
+    SESSION_TTL,
+    SHADE_ACTION_CLOSE,
+    SHADE_ACTION_OPEN,
+    SHADE_ACTION_PATTERNS,
+    SHADE_ACTION_SET_POSITION,
+    SHADE_ACTION_STOP,
+    VIMAR_PACKAGE,
+    WAIT_ACTION,
+    WAIT_LAUNCH,
+    WAIT_SCENARIO,
+    WAIT_SCREEN,
+    WAIT_SHADE,
+    WAIT_SLIDER,
+)
+from .device_worker import DeviceWorker
+from .element_cache import ElementCache
+from .hierarchy_parser import (
+    BUTTON_CONFIRM,
+    BUTTON_LOGIN,
+    ParsedHierarchy,
+    ScreenElements,
+    center,
+    parse_hierarchy,
+    parse_shade_details,
+    strip_foreign_nodes,
+)
+from .metrics import AdaptiveTimeouts, PhaseMetrics
+from .models import ShadeOperation, ShadeState, VimarSnapshot
+from .page_cache import PageCache
+from .screens import LIST_SCREENS, NavAction, Screen, classify_screen, plan_route
+from .session import SessionTracker
+from .trace import RecordingDevice, TraceWriter
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
 
-@dataclass(slots=True)
-class ShadeState:
-    """Represents a single shade status extracted from app UI."""
+_KEYCODE_BACK = 4
+_INPUT_CLASS = "android.widget.EditText"
 
-    id: str
-    name: str
-    position: int | None
-    is_moving: bool
-    battery: int | None = None
-    signal: int | None = None
 
+class ElementNotFoundError(RuntimeError):
+    """Raised when the app responds but does not show what an operation needs."""
 
-@dataclass(slots=True)
-class Scenario:
-    """Represents a scenario/action button in the app."""
 
-    id: str
-    name: str
+# Failures of a request the app itself answered; they say nothing about the
+# uiautomator session or the app's login state.
+APP_ERRORS = (ElementNotFoundError, ShadeBatchError, DeadlineExceededError, ValueError)
+
+
+def _fingerprint(hierarchy_xml: str) -> bytes:
+    # Other windows, such as the status bar clock, change without the app screen.
+    app_xml = strip_foreign_nodes(hierarchy_xml, VIMAR_PACKAGE)
+    return hashlib.blake2b(app_xml.encode(), digest_size=16).digest()
 
 
 class VimarAndroidClient:
     """Client that controls Vimar View app by UI automation.
 
     This class intentionally uses only app credentials (username/password/pin) and
-    an ADB endpoint for the emulator/device.
+    an ADB endpoint for the emulator/device. All uiautomator2 calls are blocking,
+    so they run on a dedicated device worker thread and never on the event loop.
+    What the worker runs next is decided by a command scheduler: stops and other
+    shade commands go before polls, and a queued command for a shade is replaced
+    by a newer one. Waits for widgets and screens time out after what successful
+    waits on this device took, and never beyond the running operation's deadline.
+    With the ADB fast path, taps and key presses are sent through a persistent
+    ADB shell instead; uiautomator2 remains in use for everything else and takes
+    over whenever the shell fails.
     """
 
     def __init__(
@@ -53,6 +119,10 @@ class VimarAndroidClient:
         username: str,
         password: str,
         pin: str | None,
+        metrics: PhaseMetrics | None = None,
+        trace_path: str | None = None,
+        compact_dumps: bool = DEFAULT_COMPACT_DUMPS,
+        adb_fast_path: bool = DEFAULT_ADB_FAST_PATH,
     ) -> None:
         self._adb_host = adb_host
         self._adb_port = adb_port
@@ -61,159 +131,681 @@ class VimarAndroidClient:
         self._password = password
         self._pin = pin
         self._device: u2.Device | None = None
+        self._worker = DeviceWorker(name=f"vimar_{self._serial}")
+        self._session = SessionTracker(ttl=SESSION_TTL)
+        self._last_fingerprint: bytes | None = None
+        self._last_snapshot: VimarSnapshot | None = None
+        self._last_parsed: tuple[bytes, ParsedHierarchy] | None = None
+        self._pages = PageCache(max_age=PAGE_MAX_AGE)
+        self._elements = ElementCache(max_age=ELEMENT_CACHE_TTL)
+        self.metrics = metrics or PhaseMetrics()
+        self.queue = CommandScheduler(self._async_run_operations, self.metrics)
+        self.timeouts = AdaptiveTimeouts(DEFAULT_TIMEOUTS)
+        # Deadline of the operation running on the worker, in time.monotonic() time.
+        self._deadline: float | None = None
+        self._trace = TraceWriter(trace_path, self._serial) if trace_path else None
+        self._last_success = 0.0
+        self.reconnects = 0
+        self._compact_dumps = compact_dumps
+        # Traces must see every device call, so tracing disables the fast path.
+        self._adb_fast_path = adb_fast_path and trace_path is None
+        self._shell: AdbShell | None = None
+        self._shell_retry_at = 0.0
+        # Capture taken while preparing the session, reused by the operation after it.
+        self._capture: tuple[str, ParsedHierarchy] | None = None
+
+    @property
+    def serial(self) -> str:
+        return self._serial
+
+    @property
+    def connected(self) -> bool:
+        return self._device is not None
 
     async def async_connect(self) -> None:
         """Open ADB/uiautomator session."""
         _LOGGER.debug("Connecting to Android emulator/device %s", self._serial)
-        self._device = u2.connect(self._serial)
+        self._device = await self._worker.async_run(self._connect_device)
         await self.async_prepare_session()
 
+    async def async_disconnect(self) -> None:
+        """Release the device session and stop the device worker."""
+        self._device = None
+        self.queue.close()
+        self._session.invalidate()
+        if self._shell is not None:
+            self._shell.close()
+            self._shell = None
+        self._worker.shutdown()
+        if self._trace is not None:
+            self._trace.close()
+
     async def async_prepare_session(self) -> None:
         """Bring app in foreground and authenticate if needed."""
-        if self._device is None:
-            raise RuntimeError("Device is not connected")
+        await self._schedule(Priority.POLL, self._traced, self._prepare_session, key="prepare_session")
 
-        self._device.app_start(VIMAR_PACKAGE, stop=False)
-        await self.async_login_if_needed()
+    async def async_keepalive(self) -> None:
+        """Ping the uiautomator service and restore it if it stopped responding.
 
-    async def async_login_if_needed(self) -> None:
-        """Attempt login flow when login widgets are visible."""
-        if self._device is None:
-            raise RuntimeError("Device is not connected")
-
-        d = self._device
-
-        email_field = d(className="android.widget.EditText", instance=0)
-        pass_field = d(className="android.widget.EditText", instance=1)
-        login_button = d(textMatches="(?i)(login|accedi|sign in)")
+        Skipped while recent polls or commands already proved the session alive.
+        """
+        await self._schedule(Priority.BACKGROUND, self._keepalive, key="keepalive")
 
-        if email_field.exists(timeout=0.5) and pass_field.exists(timeout=0.5):
-            _LOGGER.info("Vimar app login required, filling credentials")
-            email_field.set_text(self._username)
-            pass_field.set_text(self._password)
-            if login_button.exists(timeout=0.5):
-                login_button.click()
-
-        pin_field = d(className="android.widget.EditText")
-        confirm_pin = d(textMatches="(?i)(conferma|confirm|ok)")
-        if self._pin and pin_field.exists(timeout=0.5):
-            _LOGGER.info("Submitting Vimar app PIN")
-            pin_field.set_text(self._pin)
-            if confirm_pin.exists(timeout=0.5):
-                confirm_pin.click()
+    async def async_login_if_needed(self) -> None:
+        """Log in and enter the PIN if the app asks for them."""
+        await self._schedule(Priority.POLL, self._navigate, LIST_SCREENS, key="login")
 
-    async def async_get_snapshot(self) -> dict[str, Any]:
+    async def async_get_snapshot(self) -> VimarSnapshot:
         """Collect shades and scenarios from currently displayed pages.
 
         The parser is intentionally permissive and relies on visible strings,
         enabling compatibility with localized app versions.
         """
+        with self.metrics.span(PHASE_SNAPSHOT):
+            return await self._schedule(Priority.POLL, self._run_in_session, self._get_snapshot, key="snapshot")
+
+    async def _schedule(self, priority: Priority, func: Callable[..., _T], *args: Any, key: str | None = None) -> _T:
+        """Queue a call for the device worker behind work of higher priority."""
+        return await self.queue.async_submit(
+            priority, lambda deadline: self._worker.async_run(self._within_deadline, deadline, func, *args), key=key
+        )
+
+    async def _async_run_operations(
+        self, operations: list[ShadeOperation], read_back: bool, deadline: float
+    ) -> list[ShadeState]:
+        return await self._worker.async_run(
+            self._within_deadline, deadline, self._run_in_session, self._run_shade_batch, operations, read_back
+        )
+
+    def _within_deadline(self, deadline: float, func: Callable[..., _T], *args: Any) -> _T:
+        self._deadline = deadline
+        try:
+            return func(*args)
+        finally:
+            self._deadline = None
+
+    def _check_deadline(self) -> None:
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            raise DeadlineExceededError("Device operation ran out of time")
+
+    def _timeout(self, kind: str) -> float:
+        """Learned timeout of a wait, cut to what is left of the operation's deadline."""
+        self._check_deadline()
+        timeout = self.timeouts.timeout(kind)
+        return timeout if self._deadline is None else min(timeout, self._deadline - time.monotonic())
+
+    def _require_device(self) -> u2.Device:
         if self._device is None:
             raise RuntimeError("Device is not connected")
-
-        await self.async_prepare_session()
-        d = self._device
-
-        shades = self._extract_shades(d.dump_hierarchy())
-        scenarios = self._extract_scenarios(d.dump_hierarchy())
-
-        return {
-            "shades": [asdict(shade) for shade in shades],
-            "scenarios": [asdict(scenario) for scenario in scenarios],
-        }
-
-    def _extract_shades(self, hierarchy_xml: str) -> list[ShadeState]:
-        shades: list[ShadeState] = []
-        candidates = re.findall(r'text="([^"]+)"', hierarchy_xml)
-
-        for idx, text in enumerate(candidates):
-            if "%" not in text:
-                continue
-            percent_match = re.search(r"(\d{1,3})\s*%", text)
-            if not percent_match:
+        return self._device
+
+    def _connect_device(self) -> u2.Device:
+        device = u2.connect(self._serial)
+        if self._trace is not None:
+            _LOGGER.info("Recording Vimar device trace for %s", self._serial)
+            device = RecordingDevice(device, self._trace)
+        if self._adb_fast_path and self._shell is None:
+            self._shell = AdbShell.for_serial(self._serial)
+        return device
+
+    def _tap(self, x: int, y: int) -> None:
+        with self.metrics.span(PHASE_TAP):
+            if not self._shell_call(lambda shell: shell.tap(x, y)):
+                self._require_device().click(x, y)
+
+    def _press_back(self) -> None:
+        with self.metrics.span(PHASE_TAP):
+            if not self._shell_call(lambda shell: shell.key(_KEYCODE_BACK)):
+                self._require_device().press("back")
+
+    def _shell_call(self, call: Callable[[AdbShell], None]) -> bool:
+        """Send an input event over the ADB shell; False when uiautomator2 must do it.
+
+        After a failure the shell is left alone for ``KEEPALIVE_INTERVAL`` seconds,
+        so an unreachable ADB server does not delay every tap.
+        """
+        if self._shell is None or time.monotonic() < self._shell_retry_at:
+            return False
+        try:
+            call(self._shell)
+        except Exception as err:  # noqa: BLE001 - uiautomator2 is the fallback
+            _LOGGER.debug("ADB shell on %s failed, falling back to uiautomator2: %s", self._serial, err)
+            self._shell.close()
+            self._shell_retry_at = time.monotonic() + KEEPALIVE_INTERVAL
+            return False
+        return True
+
+    def _ping(self) -> bool:
+        try:
+            self._require_device().info
+        except Exception as err:  # noqa: BLE001 - any failure means the session is gone
+            _LOGGER.debug("uiautomator ping of %s failed: %s", self._serial, err)
+            return False
+        return True
+
+    def _keepalive(self) -> None:
+        if time.monotonic() - self._last_success < KEEPALIVE_INTERVAL or self._ping():
+            return
+        _LOGGER.warning("uiautomator on %s stopped responding, restoring the session", self._serial)
+        self._recover()
+
+    def _recover(self) -> None:
+        """Restart uiautomator in place, then reconnect, with bounded exponential backoff.
+
+        Runs on the device worker, so commands queued meanwhile wait for the
+        session instead of failing against a dead one.
+        """
+        self._session.invalidate()
+        self._elements.invalidate()
+        for attempt in range(RECONNECT_ATTEMPTS):
+            if attempt:
+                time.sleep(min(RECONNECT_MAX_BACKOFF, RECONNECT_BACKOFF * 2 ** (attempt - 1)))
+            try:
+                reset = getattr(self._device, "reset_uiautomator", None)
+                if attempt == 0 and reset is not None:
+                    reset()
+                else:
+                    self._device = self._connect_device()
+            except Exception as err:  # noqa: BLE001 - retried with backoff
+                _LOGGER.debug("Restoring uiautomator on %s failed (attempt %s): %s", self._serial, attempt + 1, err)
                 continue
-
-            position = max(0, min(100, int(percent_match.group(1))))
-            name = candidates[idx - 1] if idx > 0 else f"Shade {idx + 1}"
-            clean_name = name.strip() or f"Shade {idx + 1}"
-            shade_id = re.sub(r"[^a-z0-9]+", "_", clean_name.lower()).strip("_")
-
-            shades.append(
-                ShadeState(
-                    id=shade_id,
-                    name=clean_name,
-                    position=position,
-                    is_moving=False,
-                )
-            )
-
-        return shades
-
-    def _extract_scenarios(self, hierarchy_xml: str) -> list[Scenario]:
-        scenarios: list[Scenario] = []
-        for text in re.findall(r'text="([^"]+)"', hierarchy_xml):
-            if len(text) < 3:
+            if self._ping():
+                self.reconnects += 1
+                _LOGGER.info("uiautomator session on %s restored", self._serial)
+                return
+        raise RuntimeError(f"Unable to restore the uiautomator session on {self._serial}")
+
+    def _prepare_session(self) -> None:
+        d = self._require_device()
+        if self._session.is_valid() and self._app_in_foreground():
+            return
+
+        with self.metrics.span(PHASE_APP_START):
+            d.app_start(VIMAR_PACKAGE, stop=False)
+        self._elements.invalidate()
+        with self.metrics.span(PHASE_LOGIN):
+            self._navigate(LIST_SCREENS, launched=True)
+        self._session.mark_valid()
+
+    def _app_in_foreground(self) -> bool:
+        try:
+            current = self._require_device().app_current()
+        except Exception as err:  # noqa: BLE001 - any failure means "unknown"
+            _LOGGER.debug("Foreground app check failed: %s", err)
+            return False
+        return current.get("package") == VIMAR_PACKAGE
+
+    def _run_in_session(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run a device operation, forcing a full session check if the device fails.
+
+        When the failure was caused by a dead uiautomator session, the session
+        is restored and the operation retried once. Failures the app answered,
+        such as a missing shade or a passed deadline, are raised as they are.
+        """
+        self._mark(func, *args)
+        try:
+            result = self._prepare_and_run(func, *args)
+        except APP_ERRORS:
+            raise
+        except Exception:
+            if self._device is None or self._ping():
+                raise
+            _LOGGER.warning("Lost the uiautomator session on %s, restoring it and retrying", self._serial)
+            self._recover()
+            result = self._prepare_and_run(func, *args)
+        self._last_success = time.monotonic()
+        return result
+
+    def _prepare_and_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        # The screen may have been changed from outside since the last operation.
+        self._elements.unconfirm()
+        try:
+            self._prepare_session()
+            return func(*args)
+        except APP_ERRORS:
+            raise
+        except Exception:
+            self._session.invalidate()
+            raise
+        finally:
+            self._capture = None
+
+    def _traced(self, func: Callable[..., _T], *args: Any) -> _T:
+        self._mark(func, *args)
+        return func(*args)
+
+    def _mark(self, func: Callable[..., Any], *args: Any) -> None:
+        """Note the operation starting in the trace, so it can be replayed."""
+        if self._trace is not None:
+            self._trace.mark(func.__name__.lstrip("_"), *args)
+
+    def _navigate(self, targets: frozenset[Screen], launched: bool = False) -> tuple[str, ParsedHierarchy]:
+        """Bring the app to one of ``targets`` and return the capture showing it.
+
+        Each step is chosen from a single capture of the current screen instead
+        of probing for login, PIN or list widgets one selector at a time. After
+        a step the screen is re-read until it changes, so a slow transition is
+        not mistaken for a step without effect.
+
+        With ``launched``, the app was just started: its splash or loading page
+        is waited out until the operation's deadline, or the ``WAIT_LAUNCH``
+        timeout without one, since BACK would close the app.
+        """
+        steps = 0
+        previous: Screen | None = None
+        stepped_at: float | None = None
+        started = time.monotonic()
+        settle_until = started + self._timeout(WAIT_LAUNCH if launched else WAIT_SCREEN)
+        while True:
+            self._check_deadline()
+            hierarchy_xml = self._dump()
+            parsed = self._parse(hierarchy_xml)
+            screen = classify_screen(parsed)
+            if launched:
+                if screen is Screen.UNKNOWN:
+                    if self._deadline is None and time.monotonic() >= settle_until:
+                        self.timeouts.miss(WAIT_LAUNCH)
+                        raise RuntimeError("The Vimar app did not finish starting")
+                    time.sleep(NAVIGATION_SETTLE_INTERVAL)
+                    continue
+                self.timeouts.record(WAIT_LAUNCH, time.monotonic() - started)
+                launched = False
+            if stepped_at is not None and screen is not previous and screen is not Screen.UNKNOWN:
+                self.timeouts.record(WAIT_SCREEN, time.monotonic() - stepped_at)
+                stepped_at = None
+            if screen in targets:
+                self._capture = (hierarchy_xml, parsed)
+                self._elements.update(parsed)
+                return hierarchy_xml, parsed
+
+            if (screen is previous or screen is Screen.UNKNOWN) and time.monotonic() < settle_until:
+                time.sleep(NAVIGATION_SETTLE_INTERVAL)
                 continue
-            if re.search(r"(?i)(scenario|scena)", text):
-                scenario_id = re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")
-                scenarios.append(Scenario(id=scenario_id, name=text.strip()))
-
-        unique: dict[str, Scenario] = {}
-        for scenario in scenarios:
-            unique[scenario.id] = scenario
-
-        return list(unique.values())
+            if stepped_at is not None:
+                # The last step showed no effect within the timeout.
+                self.timeouts.miss(WAIT_SCREEN)
+            route = plan_route(screen, targets)
+            if not route or steps == MAX_NAVIGATION_STEPS:
+                raise RuntimeError(f"Unable to leave the '{screen}' screen of the Vimar app")
+
+            _LOGGER.debug("Vimar app shows the %s screen, next step: %s", screen, route[0])
+            self._elements.invalidate()
+            self._perform(route[0], parsed)
+            steps += 1
+            previous = screen
+            stepped_at = time.monotonic()
+            settle_until = stepped_at + self._timeout(WAIT_SCREEN)
+
+    def _perform(self, action: NavAction, parsed: ParsedHierarchy) -> None:
+        d = self._require_device()
+        buttons = parsed.elements.buttons
+        if action is NavAction.LOGIN:
+            _LOGGER.info("Vimar app login required, filling credentials")
+            d(className=_INPUT_CLASS, instance=0).set_text(self._username)
+            d(className=_INPUT_CLASS, instance=1).set_text(self._password)
+            if (bounds := buttons.get(BUTTON_LOGIN)) is not None:
+                self._tap(*center(bounds))
+        elif action is NavAction.SUBMIT_PIN:
+            if not self._pin:
+                raise RuntimeError("The Vimar app asks for a PIN, but none is configured")
+            _LOGGER.info("Submitting Vimar app PIN")
+            d(className=_INPUT_CLASS).set_text(self._pin)
+            if (bounds := buttons.get(BUTTON_CONFIRM)) is not None:
+                self._tap(*center(bounds))
+        else:
+            self._press_back()
+
+    def _get_snapshot(self) -> VimarSnapshot:
+        parsed: ParsedHierarchy | None = None
+        if self._capture is not None:
+            hierarchy_xml, parsed = self._capture
+        else:
+            hierarchy_xml = self._dump()
+
+        # An identical first page with no stale scrolled pages yields identical
+        # records: hand back the previous snapshot so nothing is parsed or written.
+        fingerprint = _fingerprint(hierarchy_xml)
+        if (
+            fingerprint == self._last_fingerprint
+            and self._last_snapshot is not None
+            and not self._pages.needs_crawl()
+        ):
+            self._elements.touch()
+            return self._last_snapshot
+
+        if parsed is None:
+            parsed = self._parse(hierarchy_xml, fingerprint)
+        if classify_screen(parsed) not in LIST_SCREENS:
+            # The app was left on some other page, or logged out meanwhile.
+            hierarchy_xml, parsed = self._navigate(LIST_SCREENS)
+            fingerprint = _fingerprint(hierarchy_xml)
+
+        if parsed.signature != self._pages.signature_at(0):
+            # The top of the list changed; the scrolled pages must be re-crawled.
+            self._pages.crawled = False
+        self._pages.store(0, parsed)
+        self._elements.update(parsed)
+        if not parsed.elements.scrollable:
+            # Nothing on screen scrolls: the first page is the whole list.
+            self._pages.truncate(1)
+        elif self._pages.needs_crawl():
+            with self.metrics.span(PHASE_CRAWL):
+                self._crawl_pages()
+
+        shades, scenarios = self._pages.records()
+        snapshot = VimarSnapshot.from_records(shades, scenarios)
+        self._last_fingerprint = fingerprint
+        self._last_snapshot = snapshot
+        return snapshot
+
+    def _crawl_pages(self) -> None:
+        """Scroll through the list, re-reading pages that are stale or unknown.
+
+        Without a previous complete crawl, every page is read until scrolling no
+        longer reveals new content. Otherwise the crawl scrolls past fresh pages
+        without dumping them and stops after the last stale one, unless a page no
+        longer matches its cached signature, which forces a full crawl.
+
+        ``scroll.forward()`` also returns False when its scroll reached the end of
+        the list, so that page is still read; only a page repeating the one
+        before it, or ``MAX_PAGES``, ends the crawl.
+        """
+        scrollable = self._require_device()(scrollable=True)
+        full = not self._pages.crawled
+        targets = set(self._pages.stale_indices())
+        index = 0
+        moved = False
+        try:
+            while full or index < max(targets, default=0):
+                self._check_deadline()
+                if index + 1 >= MAX_PAGES:
+                    self._pages.truncate(index + 1)
+                    break
+                moved = True
+                at_end = not scrollable.scroll.forward()
+                index += 1
+                if not (full or at_end or index in targets):
+                    continue
+
+                parsed = self._parse(self._dump())
+                if parsed.signature == self._pages.signature_at(index - 1):
+                    # Scrolling moved nothing new into view: end of the list. A
+                    # list that cannot scroll at all kept its position and bounds.
+                    moved = index > 1
+                    self._pages.truncate(index)
+                    break
+                if not full and parsed.signature != self._pages.signature_at(index):
+                    _LOGGER.debug("Page %s of the app list changed, crawling all pages", index)
+                    full = True
+                self._pages.store(index, parsed)
+        finally:
+            if moved:
+                scrollable.scroll.toBeginning()
+                self._elements.invalidate()
 
     async def async_open_shade(self, name: str) -> None:
-        await self._tap_text_and_action(name, action_regex=r"(?i)(open|up|apri|su)")
+        await self.async_run_shade_operation(ShadeOperation(name, SHADE_ACTION_OPEN))
 
     async def async_close_shade(self, name: str) -> None:
-        await self._tap_text_and_action(name, action_regex=r"(?i)(close|down|chiudi|giu)")
+        await self.async_run_shade_operation(ShadeOperation(name, SHADE_ACTION_CLOSE))
 
     async def async_stop_shade(self, name: str) -> None:
-        await self._tap_text_and_action(name, action_regex=r"(?i)(stop|ferma)")
+        await self.async_run_shade_operation(ShadeOperation(name, SHADE_ACTION_STOP))
 
     async def async_set_shade_position(self, name: str, position: int) -> None:
-        if self._device is None:
-            raise RuntimeError("Device is not connected")
+        await self.async_run_shade_operation(ShadeOperation(name, SHADE_ACTION_SET_POSITION, position))
 
-        await self.async_prepare_session()
-        d = self._device
+    async def async_run_shade_operation(self, operation: ShadeOperation) -> None:
+        with self.metrics.span(PHASE_COMMAND):
+            await self.queue.async_submit_operation(operation, read_back=False)
 
-        if not d(text=name).exists(timeout=2):
-            raise RuntimeError(f"Shade '{name}' not found in app UI")
+    async def async_run_shade_batch(self, operations: Sequence[ShadeOperation]) -> list[ShadeState]:
+        """Run many shade operations back-to-back in one navigation pass.
 
-        d(text=name).click()
-        slider = d(className="android.widget.SeekBar")
-        if not slider.exists(timeout=2):
-            raise RuntimeError("Shade slider not available")
-
-        slider.set_progress(max(0, min(100, position)))
-
-    async def async_run_scenario(self, name: str) -> None:
-        if self._device is None:
-            raise RuntimeError("Device is not connected")
-
-        await self.async_prepare_session()
-        d = self._device
+        The operations join the shade commands already queued for the device. The
+        session is prepared once and the hierarchy is captured once to order them
+        by their row on screen, stops first. When a shade is addressed more than
+        once, its last operation wins. Operations failing because the app lacks
+        their shade or control do not stop the batch; they are reported together
+        in a ``ShadeBatchError`` at the end.
 
-        if not d(text=name).exists(timeout=3):
-            raise RuntimeError(f"Scenario '{name}' not found")
-
-        d(text=name).click()
-
-    async def _tap_text_and_action(self, name: str, action_regex: str) -> None:
-        if self._device is None:
-            raise RuntimeError("Device is not connected")
-
-        await self.async_prepare_session()
-        d = self._device
+        Returns the rows of the affected shades as read back from one capture
+        taken after the last command, for use as a partial state update.
+        """
+        if not operations:
+            return []
+        with self.metrics.span(PHASE_COMMAND):
+            results = await asyncio.gather(
+                *(self.queue.async_submit_operation(operation) for operation in operations), return_exceptions=True
+            )
 
-        if not d(text=name).exists(timeout=2):
-            raise RuntimeError(f"Shade '{name}' not found")
+        updated: list[ShadeState] = []
+        failures: dict[str, str] = {}
+        for operation, result in zip(operations, results):
+            if isinstance(result, BaseException):
+                failures[operation.name] = str(result)
+            elif result is not None:
+                updated.append(result)
+        if failures:
+            raise ShadeBatchError(failures)
+        return updated
+
+    async def async_read_shade_details(self, names: Sequence[str], budget: float) -> dict[str, dict[str, int]]:
+        """Read the detail pages of ``names`` in order, such as battery and signal.
+
+        Runs behind all other work for the device. The first page is always
+        read, but no further one is opened once ``budget`` seconds have passed,
+        so fewer shades than asked for may come back.
+        """
+        return await self._schedule(
+            Priority.BACKGROUND, self._run_in_session, self._read_shade_details, list(names), budget
+        )
 
-        d(text=name).click()
-        action = d(textMatches=action_regex)
-        if not action.exists(timeout=2):
-            raise RuntimeError(f"No action matching '{action_regex}' found")
-        action.click()
+    async def async_run_scenario(self, name: str) -> None:
+        with self.metrics.span(PHASE_SCENARIO):
+            await self._schedule(Priority.COMMAND, self._run_in_session, self._run_scenario, name)
+
+    def _run_shade_batch(self, operations: list[ShadeOperation], read_back: bool = True) -> list[ShadeState]:
+        if len(operations) == 1 and not read_back:
+            # A lone command needs neither a capture to plan it nor one after it.
+            self._run_shade_operation(operations[0])
+            return []
+
+        elements = self._screen_elements()
+        if elements is None:
+            elements = self._navigate(LIST_SCREENS)[1].elements
+        rows = {name: idx for idx, name in enumerate(elements.rows)}
+
+        planned = {operation.name: operation for operation in operations}
+        failures: dict[str, str] = {}
+        order = sorted(planned.values(), key=lambda op: (op.action != SHADE_ACTION_STOP, rows.get(op.name, len(rows))))
+        for idx, operation in enumerate(order):
+            # Commands may leave a detail page open; step back to the list first.
+            if idx and self._elements.current() is None:
+                self._navigate(LIST_SCREENS)
+            try:
+                self._check_deadline()
+                self._run_shade_operation(operation)
+            except DeadlineExceededError as err:
+                failures.update((pending.name, str(err)) for pending in order[idx:])
+                break
+            except (ElementNotFoundError, ValueError) as err:
+                failures[operation.name] = str(err)
+
+        if failures:
+            raise ShadeBatchError(failures)
+
+        affected = planned.keys()
+        self._pages.invalidate(affected)
+        if not read_back:
+            return []
+        if self._elements.current() is None:
+            # The last command left the list open on a detail page.
+            parsed = self._navigate(LIST_SCREENS)[1]
+        else:
+            parsed = self._parse(self._dump())
+            self._elements.update(parsed)
+        return [shade for shade in parsed.shades if shade.name in affected]
+
+    def _read_shade_details(self, names: list[str], budget: float) -> dict[str, dict[str, int]]:
+        deadline = time.monotonic() + budget
+        if self._deadline is not None:
+            deadline = min(deadline, self._deadline)
+        details: dict[str, dict[str, int]] = {}
+        for name in names:
+            if details and time.monotonic() >= deadline:
+                break
+            if self._elements.current() is None:
+                self._navigate(LIST_SCREENS)
+            self._open_shade(name)
+            values = self._read_detail_page()
+            if values is None:
+                _LOGGER.debug("No detail page opened for shade '%s'", name)
+                values = {}
+            else:
+                self._press_back()
+            details[name] = values
+        if details:
+            self._navigate(LIST_SCREENS)
+        return details
+
+    def _read_detail_page(self) -> dict[str, int] | None:
+        """Wait for a shade's detail page to show and read it; None if it does not."""
+        started = time.monotonic()
+        settle_until = started + self._timeout(WAIT_SCREEN)
+        while True:
+            hierarchy_xml = self._dump()
+            if classify_screen(self._parse(hierarchy_xml)) is Screen.SHADE_DETAIL:
+                self.timeouts.record(WAIT_SCREEN, time.monotonic() - started)
+                return parse_shade_details(hierarchy_xml, package=VIMAR_PACKAGE)
+            if time.monotonic() >= settle_until:
+                self.timeouts.miss(WAIT_SCREEN)
+                return None
+            time.sleep(NAVIGATION_SETTLE_INTERVAL)
+
+    def _run_shade_operation(self, operation: ShadeOperation) -> None:
+        if operation.action == SHADE_ACTION_SET_POSITION:
+            if operation.position is None:
+                raise ValueError("set_position requires a position")
+            self._set_shade_position(operation.name, operation.position)
+        else:
+            self._tap_text_and_action(operation.name, operation.action)
+
+    def _set_shade_position(self, name: str, position: int) -> None:
+        d = self._require_device()
+        position = max(0, min(100, position))
+
+        # A tap on the track misses the position by the slider's padding; the
+        # detail page's slider is moved with set_progress instead.
+        self._open_shade(name)
+        slider = d(className="android.widget.SeekBar")
+        if not self._wait_for(slider, WAIT_SLIDER):
+            raise ElementNotFoundError("Shade slider not available")
+
+        slider.set_progress(position)
+
+    def _run_scenario(self, name: str) -> None:
+        d = self._require_device()
+
+        elements = self._screen_elements()
+        if elements is not None and (bounds := elements.scenarios.get(name)) is not None:
+            self._tap(*center(bounds))
+        elif not self._find_text(name, WAIT_SCENARIO):
+            raise ElementNotFoundError(f"Scenario '{name}' not found")
+        else:
+            d(text=name).click()
+        self._elements.invalidate()
+
+    def _tap_text_and_action(self, name: str, action: str) -> None:
+        d = self._require_device()
+
+        # Inline row buttons can be tapped straight from the cached capture; the
+        # list stays on screen, so the cache remains valid for the next command.
+        elements = self._screen_elements()
+        if elements is not None and (bounds := elements.actions.get(name, {}).get(action)) is not None:
+            self._tap(*center(bounds))
+            return
+
+        self._open_shade(name)
+        action_regex = SHADE_ACTION_PATTERNS[action]
+        button = d(textMatches=action_regex)
+        if not self._wait_for(button, WAIT_ACTION):
+            raise ElementNotFoundError(f"No action matching '{action_regex}' found")
+        button.click()
+
+    def _open_shade(self, name: str) -> None:
+        """Tap a shade row, from cached bounds when possible."""
+        d = self._require_device()
+
+        elements = self._screen_elements()
+        if elements is not None and (bounds := elements.rows.get(name)) is not None:
+            self._tap(*center(bounds))
+        elif not self._find_text(name, WAIT_SHADE):
+            raise ElementNotFoundError(f"Shade '{name}' not found in app UI")
+        else:
+            d(text=name).click()
+        self._elements.invalidate()
+
+    def _screen_elements(self) -> ScreenElements | None:
+        """Cached tap targets, confirmed by one capture per device operation.
+
+        Returns None while the client itself has left the cached screen. Before
+        the first tap of an operation the screen is captured again, and that
+        capture replaces the cached bounds, so a list scrolled from outside is
+        tapped where its rows are now.
+        """
+        if self._elements.current() is None:
+            return None
+        if not self._elements.confirmed and not self._elements.confirm(self._parse(self._dump())):
+            _LOGGER.debug("Vimar app screen changed outside the client, using the new capture")
+        return self._elements.current()
+
+    def _find_text(self, text: str, kind: str) -> bool:
+        """Wait for a label on screen, scrolling the list to it if needed."""
+        d = self._require_device()
+        if self._wait_for(d(text=text), kind, count_miss=False):
+            return True
+        scrollable = d(scrollable=True)
+        found = False
+        if scrollable.exists(timeout=0):
+            self._elements.invalidate()
+            with self.metrics.span(PHASE_SELECTOR):
+                found = bool(scrollable.scroll.to(text=text))
+        if not found:
+            self.timeouts.miss(kind)
+        return found
+
+    def _wait_for(self, selector: Any, kind: str, count_miss: bool = True) -> bool:
+        """Wait for a widget; the time it took teaches the timeout of ``kind``.
+
+        A label off screen is an expected miss for ``_find_text``, which then
+        scrolls; it reports the miss itself only if scrolling fails as well.
+        """
+        started = time.monotonic()
+        with self.metrics.span(PHASE_SELECTOR):
+            found = bool(selector.exists(timeout=self._timeout(kind)))
+        if found:
+            self.timeouts.record(kind, time.monotonic() - started)
+        elif count_miss:
+            self.timeouts.miss(kind)
+        return found
+
+    def _dump(self) -> str:
+        with self.metrics.span(PHASE_DUMP):
+            return self._require_device().dump_hierarchy(compressed=self._compact_dumps)
+
+    def _parse(self, hierarchy_xml: str, fingerprint: bytes | None = None) -> ParsedHierarchy:
+        """Parse a capture, reusing the previous result if the app's part is unchanged.
+
+        Captures taken while waiting for a screen, or before and after a command
+        that changed nothing, repeat the last one; the fingerprint costs a
+        fraction of the structural pass.
+        """
+        if fingerprint is None:
+            fingerprint = _fingerprint(hierarchy_xml)
+        if self._last_parsed is not None and self._last_parsed[0] == fingerprint:
+            return self._last_parsed[1]
+        with self.metrics.span(PHASE_PARSE):
+            parsed = parse_hierarchy(hierarchy_xml, package=VIMAR_PACKAGE)
+        self._last_parsed = (fingerprint, parsed)
+        return parsed
@@ -0,0 +1,481 @@
+"""Minimal stand-ins for the Home Assistant and voluptuous APIs the integration uses.
+
+They follow the behaviour of the real helpers closely enough to run the
+coordinator, services and storage code on a plain asyncio loop: timers are real
+``loop.call_later`` handles, and storage is kept in memory on the ``hass`` stub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from enum import StrEnum
+import sys
+import types
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+def _module(name: str, **attrs: Any) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    if "." not in name:
+        module.__path__ = []
+    module = sys.modules.setdefault(name, module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def _run(hass: HomeAssistant, action: Callable[..., Any], *args: Any) -> None:
+    result = action(*args)
+    if asyncio.iscoroutine(result):
+        hass.async_create_task(result)
+
+
+# -- voluptuous ---------------------------------------------------------------
+
+
+class Invalid(Exception):
+    pass
+
+
+class Marker:
+    def __init__(self, schema: Any) -> None:
+        self.schema = schema
+
+
+class Required(Marker):
+    pass
+
+
+class Optional(Marker):
+    pass
+
+
+def _validate(schema: Any, value: Any) -> Any:
+    if isinstance(schema, Schema):
+        return schema(value)
+    if isinstance(schema, dict):
+        return Schema(schema)(value)
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            raise Invalid("expected a list")
+        return [_validate(schema[0], item) for item in value]
+    return schema(value)
+
+
+class Schema:
+    def __init__(self, schema: Any) -> None:
+        self.schema = schema
+
+    def __call__(self, value: Any) -> Any:
+        if not isinstance(self.schema, dict):
+            return _validate(self.schema, value)
+        if not isinstance(value, dict):
+            raise Invalid("expected a dictionary")
+        known = {marker.schema for marker in self.schema}
+        if extra := set(value) - known:
+            raise Invalid(f"extra keys not allowed: {sorted(extra)}")
+        validated = {}
+        for marker, validator in self.schema.items():
+            if marker.schema in value:
+                validated[marker.schema] = _validate(validator, value[marker.schema])
+            elif isinstance(marker, Required):
+                raise Invalid(f"required key not provided: {marker.schema}")
+        return validated
+
+
+def All(*validators: Any) -> Callable[[Any], Any]:
+    def validate(value: Any) -> Any:
+        for validator in validators:
+            value = _validate(validator, value)
+        return value
+
+    return validate
+
+
+def In(container: Any) -> Callable[[Any], Any]:
+    def validate(value: Any) -> Any:
+        if value not in container:
+            raise Invalid(f"value must be one of {sorted(container)}")
+        return value
+
+    return validate
+
+
+def Coerce(kind: type) -> Callable[[Any], Any]:
+    def validate(value: Any) -> Any:
+        try:
+            return kind(value)
+        except (TypeError, ValueError) as err:
+            raise Invalid(f"expected {kind.__name__}") from err
+
+    return validate
+
+
+def Range(min: float | None = None, max: float | None = None) -> Callable[[Any], Any]:  # noqa: A002
+    def validate(value: Any) -> Any:
+        if (min is not None and value < min) or (max is not None and value > max):
+            raise Invalid(f"value must be between {min} and {max}")
+        return value
+
+    return validate
+
+
+# -- homeassistant.core -------------------------------------------------------
+
+CALLBACK_TYPE = Callable[[], None]
+
+
+def callback(func: _T) -> _T:
+    return func
+
+
+class ServiceCall:
+    def __init__(self, domain: str, service: str, data: dict[str, Any] | None = None) -> None:
+        self.domain = domain
+        self.service = service
+        self.data = data or {}
+
+
+class ServiceRegistry:
+    def __init__(self) -> None:
+        self._services: dict[tuple[str, str], tuple[Callable[..., Any], Any]] = {}
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return (domain, service) in self._services
+
+    def async_register(self, domain: str, service: str, handler: Callable[..., Any], schema: Any = None) -> None:
+        self._services[(domain, service)] = (handler, schema)
+
+    def async_remove(self, domain: str, service: str) -> None:
+        self._services.pop((domain, service), None)
+
+    async def async_call(self, domain: str, service: str, data: dict[str, Any]) -> None:
+        handler, schema = self._services[(domain, service)]
+        await handler(ServiceCall(domain, service, schema(data) if schema is not None else data))
+
+
+class Config:
+    def __init__(self, config_dir: str) -> None:
+        self.config_dir = config_dir
+
+    def path(self, *parts: str) -> str:
+        return "/".join((self.config_dir, *parts))
+
+
+class ConfigEntries:
+    def __init__(self) -> None:
+        self.forwarded: list[tuple[Any, list[str]]] = []
+
+    async def async_forward_entry_setups(self, entry: Any, platforms: list[str]) -> None:
+        self.forwarded.append((entry, list(platforms)))
+
+    async def async_unload_platforms(self, entry: Any, platforms: list[str]) -> bool:
+        return True
+
+
+class HomeAssistant:
+    """Event loop, service registry and in-memory storage of one test instance."""
+
+    def __init__(self, config_dir: str = "/config") -> None:
+        self.loop = asyncio.get_running_loop()
+        self.data: dict[str, Any] = {}
+        self.services = ServiceRegistry()
+        self.config = Config(config_dir)
+        self.config_entries = ConfigEntries()
+        # Stand-in for the ``.storage`` directory, keyed like the files in it.
+        self.storage: dict[str, Any] = {}
+
+    def async_create_task(self, target: Any, name: str | None = None) -> asyncio.Task:
+        return self.loop.create_task(target, name=name)
+
+    def async_create_background_task(self, target: Any, name: str) -> asyncio.Task:
+        return self.loop.create_task(target, name=name)
+
+
+# -- homeassistant.exceptions -------------------------------------------------
+
+
+class HomeAssistantError(Exception):
+    pass
+
+
+class ConfigEntryNotReady(HomeAssistantError):
+    pass
+
+
+# -- homeassistant.config_entries / homeassistant.const -----------------------
+
+
+class ConfigEntry:
+    def __init__(
+        self,
+        data: dict[str, Any],
+        options: dict[str, Any] | None = None,
+        entry_id: str = "entry",
+        domain: str = "vimar_viewapp",
+    ) -> None:
+        self.data = data
+        self.options = options or {}
+        self.entry_id = entry_id
+        self.domain = domain
+        self.unload_callbacks: list[CALLBACK_TYPE] = []
+
+    def async_on_unload(self, func: CALLBACK_TYPE) -> None:
+        self.unload_callbacks.append(func)
+
+    def async_create_background_task(self, hass: HomeAssistant, target: Any, name: str) -> asyncio.Task:
+        return hass.async_create_background_task(target, name)
+
+
+class Platform(StrEnum):
+    BUTTON = "button"
+    COVER = "cover"
+    SENSOR = "sensor"
+
+
+# -- homeassistant.helpers ----------------------------------------------------
+
+
+def async_call_later(
+    hass: HomeAssistant, delay: float | timedelta, action: Callable[[datetime], Any]
+) -> CALLBACK_TYPE:
+    seconds = delay.total_seconds() if isinstance(delay, timedelta) else delay
+    handle = hass.loop.call_later(seconds, lambda: _run(hass, action, datetime.now()))
+    return handle.cancel
+
+
+def async_track_time_interval(
+    hass: HomeAssistant, action: Callable[[datetime], Any], interval: timedelta
+) -> CALLBACK_TYPE:
+    handle: asyncio.TimerHandle | None = None
+
+    def fire() -> None:
+        nonlocal handle
+        handle = hass.loop.call_later(interval.total_seconds(), fire)
+        _run(hass, action, datetime.now())
+
+    handle = hass.loop.call_later(interval.total_seconds(), fire)
+
+    def remove() -> None:
+        assert handle is not None
+        handle.cancel()
+
+    return remove
+
+
+class Debouncer:
+    """Run ``function`` once per ``cooldown``, at its end when not ``immediate``."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Any,
+        *,
+        cooldown: float,
+        immediate: bool,
+        function: Callable[[], Any] | None = None,
+    ) -> None:
+        self.hass = hass
+        self.cooldown = cooldown
+        self.immediate = immediate
+        self.function = function
+        self._timer: asyncio.TimerHandle | None = None
+        self._execute_at_end_of_timer = False
+        self._shutdown = False
+
+    async def async_call(self) -> None:
+        if self._shutdown:
+            raise RuntimeError("Debouncer has been shut down")
+        if self._timer is not None:
+            self._execute_at_end_of_timer = True
+            return
+        if self.immediate:
+            await self.function()
+        else:
+            self._execute_at_end_of_timer = True
+        self._schedule_timer()
+
+    def _schedule_timer(self) -> None:
+        self._timer = self.hass.loop.call_later(self.cooldown, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        if self._execute_at_end_of_timer and not self._shutdown:
+            self._execute_at_end_of_timer = False
+            self.hass.async_create_task(self.function())
+            self._schedule_timer()
+
+    def async_cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._execute_at_end_of_timer = False
+
+    def async_shutdown(self) -> None:
+        self._shutdown = True
+        self.async_cancel()
+
+
+class UpdateFailed(HomeAssistantError):
+    pass
+
+
+class DataUpdateCoordinator(Generic[_T]):
+    """Refresh data through ``_async_update_data`` and notify listeners with contexts."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        logger: Any,
+        *,
+        name: str,
+        update_interval: timedelta | None = None,
+        request_refresh_debouncer: Debouncer | None = None,
+        always_update: bool = True,
+    ) -> None:
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.update_interval = update_interval
+        self.always_update = always_update
+        self.data: _T | None = None
+        self.last_update_success = True
+        self.last_exception: Exception | None = None
+        self._listeners: dict[CALLBACK_TYPE, tuple[CALLBACK_TYPE, object | None]] = {}
+        self._debounced_refresh = request_refresh_debouncer or Debouncer(
+            hass, logger, cooldown=10, immediate=True
+        )
+        self._debounced_refresh.function = self.async_refresh
+
+    def async_add_listener(self, update_callback: CALLBACK_TYPE, context: Any = None) -> CALLBACK_TYPE:
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener)
+
+        self._listeners[remove_listener] = (update_callback, context)
+        return remove_listener
+
+    def async_update_listeners(self) -> None:
+        for update_callback, _ in list(self._listeners.values()):
+            update_callback()
+
+    async def _async_update_data(self) -> _T:
+        raise NotImplementedError
+
+    async def async_refresh(self) -> None:
+        previous_data = self.data
+        previous_success = self.last_update_success
+        try:
+            self.data = await self._async_update_data()
+        except UpdateFailed as err:
+            self.last_exception = err
+            self.last_update_success = False
+        else:
+            self.last_update_success = True
+        if self.always_update or self.last_update_success != previous_success or previous_data != self.data:
+            self.async_update_listeners()
+
+    async def async_config_entry_first_refresh(self) -> None:
+        await self.async_refresh()
+        if not self.last_update_success:
+            raise ConfigEntryNotReady(str(self.last_exception))
+
+    async def async_request_refresh(self) -> None:
+        await self._debounced_refresh.async_call()
+
+    def async_set_updated_data(self, data: _T) -> None:
+        self.data = data
+        self.last_update_success = True
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        self._debounced_refresh.async_shutdown()
+
+
+class Store(Generic[_T]):
+    """Keep one JSON document per key in ``hass.storage``."""
+
+    def __init__(self, hass: HomeAssistant, version: int, key: str) -> None:
+        self.hass = hass
+        self.version = version
+        self.key = key
+        self._unsub_delay: asyncio.TimerHandle | None = None
+
+    async def async_load(self) -> _T | None:
+        return self.hass.storage.get(self.key)
+
+    async def async_save(self, data: _T) -> None:
+        self.hass.storage[self.key] = data
+
+    def async_delay_save(self, data_func: Callable[[], _T], delay: float = 0) -> None:
+        if self._unsub_delay is not None:
+            self._unsub_delay.cancel()
+
+        def write() -> None:
+            self._unsub_delay = None
+            self.hass.storage[self.key] = data_func()
+
+        self._unsub_delay = self.hass.loop.call_later(delay, write)
+
+    async def async_remove(self) -> None:
+        if self._unsub_delay is not None:
+            self._unsub_delay.cancel()
+        self.hass.storage.pop(self.key, None)
+
+
+# -- homeassistant.helpers.config_validation ----------------------------------
+
+
+def string(value: Any) -> str:
+    if value is None or isinstance(value, (dict, list)):
+        raise Invalid("expected a string")
+    return str(value)
+
+
+def ensure_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+_module(
+    "voluptuous",
+    Invalid=Invalid,
+    Schema=Schema,
+    Required=Required,
+    Optional=Optional,
+    All=All,
+    In=In,
+    Coerce=Coerce,
+    Range=Range,
+)
+_module("homeassistant")
+_module(
+    "homeassistant.core",
+    CALLBACK_TYPE=CALLBACK_TYPE,
+    HomeAssistant=HomeAssistant,
+    ServiceCall=ServiceCall,
+    callback=callback,
+)
+_module("homeassistant.exceptions", HomeAssistantError=HomeAssistantError, ConfigEntryNotReady=ConfigEntryNotReady)
+_module("homeassistant.config_entries", ConfigEntry=ConfigEntry)
+_module("homeassistant.const", Platform=Platform)
+_module("homeassistant.helpers")
+_module("homeassistant.helpers.debounce", Debouncer=Debouncer)
+_module(
+    "homeassistant.helpers.event",
+    async_call_later=async_call_later,
+    async_track_time_interval=async_track_time_interval,
+)
+_module(
+    "homeassistant.helpers.update_coordinator",
+    DataUpdateCoordinator=DataUpdateCoordinator,
+    UpdateFailed=UpdateFailed,
+)
+_module("homeassistant.helpers.storage", Store=Store)
+_module("homeassistant.helpers.config_validation", string=string, ensure_list=ensure_list)
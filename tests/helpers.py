@@ -0,0 +1,43 @@
+"""Shared loader for testing integration modules without Home Assistant."""
+
+import importlib.util
+import pathlib
+import sys
+import types
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+PACKAGE_DIR = ROOT / "custom_components" / "vimar_viewapp"
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+# Stub package context and dependency to allow isolated unit testing without Home Assistant.
+pkg = types.ModuleType("custom_components")
+pkg.__path__ = []
+sys.modules.setdefault("custom_components", pkg)
+subpkg = types.ModuleType("custom_components.vimar_viewapp")
+subpkg.__path__ = [str(PACKAGE_DIR)]
+sys.modules.setdefault("custom_components.vimar_viewapp", subpkg)
+
+u2 = types.ModuleType("uiautomator2")
+u2.Device = object
+u2.connect = lambda *args, **kwargs: None
+sys.modules.setdefault("uiautomator2", u2)
+
+import ha_stubs  # noqa: E402,F401 - registers Home Assistant and voluptuous stand-ins
+
+
+def load_module(name: str) -> types.ModuleType:
+    """Load ``custom_components.vimar_viewapp.<name>`` from its source file."""
+    full_name = f"custom_components.vimar_viewapp.{name}"
+    if full_name in sys.modules:
+        return sys.modules[full_name]
+
+    spec = importlib.util.spec_from_file_location(full_name, PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
@@ -0,0 +1,78 @@
+import re
+import socket
+import threading
+import unittest
+
+from helpers import load_module
+
+module = load_module("adb_shell")
+AdbShell = module.AdbShell
+AdbShellError = module.AdbShellError
+
+_COMMAND_RE = re.compile(r"(.*) 2>&1; echo (\S+) \$\?$")
+
+
+def fake_sh(sock: socket.socket, commands: list[str]) -> None:
+    """Answer shell commands like ``sh`` would; ``false`` fails, ``exit`` hangs up."""
+    with sock, sock.makefile("rb") as lines:
+        for line in lines:
+            command, marker = _COMMAND_RE.match(line.decode().rstrip("\n")).groups()
+            commands.append(command)
+            if command == "exit":
+                return
+            output, status = (b"", 1) if command == "false" else (f"ran {command}\n".encode(), 0)
+            # Split the reply to exercise reads across several chunks.
+            sock.sendall(output + marker[:4].encode())
+            sock.sendall(f"{marker[4:]} {status}\n".encode())
+
+
+class TestAdbShell(unittest.TestCase):
+    def setUp(self) -> None:
+        self.commands: list[str] = []
+        self.opened = 0
+
+    def open_connection(self) -> socket.socket:
+        self.opened += 1
+        ours, theirs = socket.socketpair()
+        threading.Thread(target=fake_sh, args=(theirs, self.commands), daemon=True).start()
+        return ours
+
+    def test_commands_share_one_connection(self):
+        shell = AdbShell(self.open_connection, timeout=2)
+        self.assertEqual(shell.run("echo hi"), "ran echo hi\n")
+        shell.tap(10, 20)
+        shell.swipe(1, 2, 3, 4, 100)
+        shell.key(4)
+        shell.close()
+
+        self.assertEqual(self.commands, ["echo hi", "input tap 10 20", "input swipe 1 2 3 4 100", "input keyevent 4"])
+        self.assertEqual(self.opened, 1)
+
+    def test_failed_command_raises_and_keeps_the_shell(self):
+        shell = AdbShell(self.open_connection, timeout=2)
+        with self.assertRaises(AdbShellError):
+            shell.run("false")
+        self.assertTrue(shell.connected)
+        self.assertEqual(shell.run("true"), "ran true\n")
+        shell.close()
+
+    def test_lost_connection_is_reopened_on_next_command(self):
+        shell = AdbShell(self.open_connection, timeout=2)
+        with self.assertRaises(AdbShellError):
+            shell.run("exit")
+        self.assertFalse(shell.connected)
+
+        shell.tap(1, 1)
+        self.assertEqual(self.opened, 2)
+        shell.close()
+
+    def test_unreachable_adb_server(self):
+        def refuse() -> socket.socket:
+            raise ConnectionRefusedError("no ADB server")
+
+        with self.assertRaises(AdbShellError):
+            AdbShell(refuse).tap(1, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import unittest
+
+from helpers import load_module
+
+module = load_module("command_scheduler")
+CommandScheduler = module.CommandScheduler
+Priority = module.Priority
+models = load_module("models")
+ShadeOperation = models.ShadeOperation
+ShadeState = models.ShadeState
+
+
+class TestCommandScheduler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.started: list = []
+        self.failures: dict[str, str] = {}
+        self.metrics = load_module("metrics").PhaseMetrics()
+        self.scheduler = CommandScheduler(self.run_operations, self.metrics)
+        self.gate = asyncio.Event()
+
+    async def run_operations(self, operations, read_back, deadline):
+        self.started.append([(operation.name, operation.action, operation.position) for operation in operations])
+        if self.failures:
+            raise module.ShadeBatchError(self.failures)
+        return [ShadeState(operation.name.lower(), operation.name, operation.position, False) for operation in operations]
+
+    def call(self, label: str):
+        async def run(deadline: float) -> str:
+            self.started.append(label)
+            return label
+
+        return run
+
+    async def occupy_device(self) -> asyncio.Task:
+        """Start a long-running call, so everything after it has to queue."""
+
+        async def busy(deadline: float) -> None:
+            self.started.append("busy")
+            await self.gate.wait()
+
+        task = asyncio.create_task(self.scheduler.async_submit(Priority.POLL, busy))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return task
+
+    async def test_newer_position_replaces_queued_one(self):
+        busy = await self.occupy_device()
+        moves = [
+            asyncio.create_task(self.scheduler.async_submit_operation(ShadeOperation("Kitchen", "set_position", value)))
+            for value in (20, 40, 60)
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(self.scheduler.depth, 1)
+
+        self.gate.set()
+        await busy
+        results = await asyncio.gather(*moves)
+
+        self.assertEqual(self.started, ["busy", [("Kitchen", "set_position", 60)]])
+        self.assertEqual([result and result.position for result in results], [None, None, 60])
+        self.assertEqual(self.scheduler.superseded, 2)
+
+    async def test_stop_and_commands_go_before_polls(self):
+        busy = await self.occupy_device()
+        tasks = [
+            asyncio.create_task(self.scheduler.async_submit(Priority.POLL, self.call("poll"))),
+            asyncio.create_task(self.scheduler.async_submit(Priority.COMMAND, self.call("scenario"))),
+            asyncio.create_task(self.scheduler.async_submit_operation(ShadeOperation("Bedroom", "open"))),
+            asyncio.create_task(self.scheduler.async_submit_operation(ShadeOperation("Kitchen", "stop"))),
+        ]
+        await asyncio.sleep(0)
+
+        self.gate.set()
+        await asyncio.gather(busy, *tasks)
+
+        self.assertEqual(
+            self.started,
+            ["busy", [("Kitchen", "stop", None), ("Bedroom", "open", None)], "scenario", "poll"],
+        )
+        # Every operation records how long it waited, batched ones included.
+        self.assertEqual(self.metrics.histogram("queue_wait").count, 5)
+
+    async def test_queued_polls_with_the_same_key_run_once(self):
+        busy = await self.occupy_device()
+        polls = [
+            asyncio.create_task(self.scheduler.async_submit(Priority.POLL, self.call("poll"), key="snapshot"))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        self.gate.set()
+        await busy
+
+        self.assertEqual(await asyncio.gather(*polls), ["poll"] * 3)
+        self.assertEqual(self.started, ["busy", "poll"])
+
+    async def test_expired_work_is_dropped_from_the_queue(self):
+        busy = await self.occupy_device()
+
+        with self.assertRaises(module.DeadlineExceededError):
+            await self.scheduler.async_submit_operation(ShadeOperation("Kitchen", "open"), timeout=0.01)
+        self.gate.set()
+        await busy
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.started, ["busy"])
+        self.assertEqual(self.scheduler.as_dict()["expired"], 1)
+
+    async def test_batch_failures_reach_only_their_callers(self):
+        self.failures = {"Garage": "not found"}
+        results = await asyncio.gather(
+            self.scheduler.async_submit_operation(ShadeOperation("Garage", "open")),
+            self.scheduler.async_submit_operation(ShadeOperation("Bedroom", "open")),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(str(results[0]), "not found")
+        self.assertIsNone(results[1])
+
+    async def test_close_fails_pending_work(self):
+        busy = await self.occupy_device()
+        queued = asyncio.create_task(self.scheduler.async_submit(Priority.COMMAND, self.call("scenario")))
+        await asyncio.sleep(0)
+
+        self.scheduler.close()
+
+        for task in (busy, queued):
+            with self.assertRaises(RuntimeError):
+                await task
+        self.assertEqual(self.started, ["busy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from helpers import load_module
+
+from homeassistant.core import HomeAssistant
+
+module = load_module("coordinator")
+const = load_module("const")
+models = load_module("models")
+ShadeBatchError = load_module("vimar_android_client").ShadeBatchError
+MotionTracker = load_module("motion").MotionTracker
+ShadeOperation = models.ShadeOperation
+ShadeState = models.ShadeState
+VimarSnapshot = models.VimarSnapshot
+
+
+def snapshot(kitchen: int = 0, bedroom: int = 50) -> VimarSnapshot:
+    return VimarSnapshot.from_records(
+        [ShadeState("kitchen", "Kitchen", kitchen, False), ShadeState("bedroom", "Bedroom", bedroom, False)], []
+    )
+
+
+class FakePool:
+    """Device pool double answering with preset snapshots and shade rows."""
+
+    def __init__(self) -> None:
+        self.snapshot = snapshot()
+        self.batches: list[list[ShadeOperation]] = []
+        self.failures: dict[str, str] = {}
+        self.detail_reads: list[list[str]] = []
+
+    async def async_get_snapshot(self) -> VimarSnapshot:
+        return self.snapshot
+
+    async def async_run_shade_batch(self, operations):
+        self.batches.append(list(operations))
+        if self.failures:
+            raise ShadeBatchError(self.failures)
+        return [
+            ShadeState(operation.name.lower(), operation.name, 100 if operation.action == "open" else 0, True)
+            for operation in operations
+        ]
+
+    async def async_read_shade_details(self, names, budget):
+        self.detail_reads.append(list(names))
+        return {name: {"battery": 80} for name in names}
+
+
+class FakeStore:
+    def __init__(self) -> None:
+        self.saved: list[VimarSnapshot] = []
+
+    def async_schedule_save(self, snapshot: VimarSnapshot) -> None:
+        self.saved.append(snapshot)
+
+
+class CoordinatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hass = HomeAssistant()
+        self.pool = FakePool()
+        self.store = FakeStore()
+        self.coordinator = module.VimarDataUpdateCoordinator(
+            self.hass, self.pool, poll_interval=30, store=self.store, detail_budget=5.0
+        )
+        self.updates: dict[str | None, int] = {"kitchen": 0, "bedroom": 0, None: 0}
+        for context in self.updates:
+            self.coordinator.async_add_listener(lambda context=context: self._count(context), context)
+
+    async def asyncTearDown(self) -> None:
+        await self.coordinator.async_shutdown()
+
+    def _count(self, context: str | None) -> None:
+        self.updates[context] += 1
+
+    def reset_updates(self) -> None:
+        self.updates = dict.fromkeys(self.updates, 0)
+
+
+class TestListenerUpdates(CoordinatorTestCase):
+    async def test_only_changed_shades_are_notified(self):
+        await self.coordinator.async_refresh()
+        self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 1, None: 1})
+
+        self.reset_updates()
+        self.pool.snapshot = snapshot(kitchen=40)
+        await self.coordinator.async_refresh()
+        self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 0, None: 1})
+
+        # An unchanged poll notifies nobody and is not saved again.
+        self.reset_updates()
+        await self.coordinator.async_refresh()
+        self.assertEqual(self.updates, {"kitchen": 0, "bedroom": 0, None: 0})
+        self.assertEqual(len(self.store.saved), 2)
+
+    async def test_everyone_is_notified_after_a_failed_poll(self):
+        await self.coordinator.async_refresh()
+        with mock.patch.object(self.pool, "async_get_snapshot", side_effect=RuntimeError("adb gone")):
+            await self.coordinator.async_refresh()
+        self.assertFalse(self.coordinator.last_update_success)
+
+        self.reset_updates()
+        await self.coordinator.async_refresh()
+        self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 1, None: 1})
+
+    async def test_restored_snapshot_is_the_base_of_the_first_diff(self):
+        self.coordinator.async_restore(snapshot(kitchen=40))
+        self.assertEqual(self.coordinator.data.shades["kitchen"].position, 40)
+
+        await self.coordinator.async_refresh()
+        self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 0, None: 1})
+        self.assertEqual(self.coordinator.data, snapshot())
+
+
+class TestShadeCommands(CoordinatorTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        await self.coordinator.async_refresh()
+        self.reset_updates()
+
+    async def test_commands_within_the_window_run_as_one_batch(self):
+        operations = [ShadeOperation("Kitchen", "open"), ShadeOperation("Bedroom", "close")]
+
+        await asyncio.gather(*(self.coordinator.async_execute_shade_operation(op) for op in operations))
+
+        self.assertEqual(self.pool.batches, [operations])
+
+    async def test_batch_failures_reach_only_their_callers(self):
+        self.pool.failures = {"Kitchen": "Shade 'Kitchen' not found"}
+
+        results = await asyncio.gather(
+            self.coordinator.async_execute_shade_operation(ShadeOperation("Kitchen", "open")),
+            self.coordinator.async_execute_shade_operation(ShadeOperation("Bedroom", "close")),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(str(results[0]), "Shade 'Kitchen' not found")
+        self.assertIsNone(results[1])
+
+    async def test_rows_read_back_are_applied_as_a_partial_update(self):
+        with mock.patch.object(self.coordinator, "async_request_refresh") as request_refresh:
+            await self.coordinator.async_run_shade_batch([ShadeOperation("Kitchen", "open")])
+
+        self.assertEqual(self.coordinator.data.shades["kitchen"].position, 100)
+        self.assertEqual(self.coordinator.data.shades["bedroom"], snapshot().shades["bedroom"])
+        self.assertEqual(self.updates["bedroom"], 0)
+        self.assertGreaterEqual(self.updates["kitchen"], 1)
+        self.assertIs(self.store.saved[-1], self.coordinator.data)
+        request_refresh.assert_awaited_once()
+
+    async def test_motion_ticks_update_moving_shades_until_they_stop(self):
+        now = [1000.0]
+        self.coordinator.motion = MotionTracker(clock=lambda: now[0])
+        with (
+            mock.patch.object(module, "MOTION_UPDATE_INTERVAL", 0.01),
+            mock.patch.object(self.pool, "async_run_shade_batch", return_value=[]),
+        ):
+            await self.coordinator.async_run_shade_batch([ShadeOperation("Kitchen", "open")])
+            self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 0, None: 1})
+
+            await asyncio.sleep(0.05)
+            self.assertGreater(self.updates["kitchen"], 2)
+            self.assertEqual(self.updates["bedroom"], 0)
+
+            now[0] += const.DEFAULT_SHADE_TRAVEL_TIME
+            await asyncio.sleep(0.05)
+            self.assertIsNone(self.coordinator._unsub_motion)
+            ticks = self.updates["kitchen"]
+            await asyncio.sleep(0.03)
+            self.assertEqual(self.updates["kitchen"], ticks)
+
+
+class TestDeviceEvents(CoordinatorTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.coordinator._event_debouncer.cooldown = 0.01
+        self.polls = 0
+        original = self.pool.async_get_snapshot
+
+        async def counted():
+            self.polls += 1
+            return await original()
+
+        self.pool.async_get_snapshot = counted
+
+    async def test_own_device_work_is_not_an_event(self):
+        await self.coordinator.async_refresh()
+        self.coordinator.async_handle_device_event()
+        await asyncio.sleep(0.05)
+        self.assertEqual((self.polls, self.coordinator.event_refreshes), (1, 0))
+
+    async def test_event_refreshes_are_spaced_by_the_minimum_interval(self):
+        with mock.patch.object(module, "EVENT_MIN_INTERVAL", 0.2):
+            self.coordinator.async_handle_device_event()
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.polls, 1)
+
+            # A chatty app within the interval gets one trailing refresh.
+            for _ in range(5):
+                self.coordinator._quiet_until = 0.0
+                self.coordinator.async_handle_device_event()
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.polls, 1)
+            await asyncio.sleep(0.25)
+
+        self.assertEqual((self.polls, self.coordinator.event_refreshes), (2, 2))
+
+
+class TestDetailCrawl(CoordinatorTestCase):
+    async def test_readings_are_merged_into_the_data(self):
+        await self.coordinator.async_refresh()
+        self.reset_updates()
+
+        await self.coordinator.async_crawl_details()
+
+        self.assertEqual(self.pool.detail_reads, [["Kitchen", "Bedroom"]])
+        self.assertEqual(self.coordinator.data.shades["kitchen"].battery, 80)
+        self.assertEqual(self.updates, {"kitchen": 1, "bedroom": 1, None: 1})
+
+    async def test_crawl_is_sized_to_visit_every_shade_within_the_ttl(self):
+        self.pool.snapshot = VimarSnapshot.from_records(
+            [ShadeState(f"shade_{idx}", f"Shade {idx}", 0, False) for idx in range(40)], []
+        )
+        await self.coordinator.async_refresh()
+
+        await self.coordinator.async_crawl_details()
+
+        # Signal readings are due after 1800 s; a crawl runs every 300 s.
+        self.assertEqual(len(self.pool.detail_reads[0]), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
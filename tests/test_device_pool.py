@@ -0,0 +1,222 @@
+import asyncio
+import time
+import unittest
+
+from helpers import load_module
+
+module = load_module("device_pool")
+VimarDevicePool = module.VimarDevicePool
+client_module = load_module("vimar_android_client")
+ShadeBatchError = client_module.ShadeBatchError
+models = load_module("models")
+ShadeOperation = models.ShadeOperation
+ShadeState = models.ShadeState
+
+
+class FakeStats:
+    def as_dict(self) -> dict:
+        return {}
+
+
+class FakeClient:
+    """Client double whose device round trips take ``latency`` seconds each."""
+
+    def __init__(self, serial: str, latency: float = 0.0, broken: bool = False) -> None:
+        self.serial = serial
+        self.connected = True
+        self.latency = latency
+        self.broken = broken
+        self.calls: list[tuple] = []
+        self.reconnects = 0
+        self.queue = FakeStats()
+        self.timeouts = FakeStats()
+        self._lock = asyncio.Lock()
+
+    async def async_connect(self) -> None:
+        if self.broken:
+            raise RuntimeError(f"{self.serial} unreachable")
+        self.connected = True
+
+    async def async_disconnect(self) -> None:
+        self.connected = False
+
+    async def _device_call(self, *entry) -> None:
+        # One device only ever performs one UI interaction at a time.
+        async with self._lock:
+            self.calls.append(entry)
+            await asyncio.sleep(self.latency)
+            if self.broken:
+                raise RuntimeError(f"{self.serial} unreachable")
+
+    async def async_keepalive(self) -> None:
+        await self._device_call("ping")
+
+    async def async_get_snapshot(self):
+        await self._device_call("snapshot")
+        return self.serial
+
+    async def async_run_scenario(self, name: str) -> None:
+        await self._device_call("scenario", name)
+        if name not in ("Notte", "Giorno"):
+            raise client_module.ElementNotFoundError(f"Scenario '{name}' not found")
+
+    async def async_run_shade_batch(self, operations):
+        for operation in operations:
+            await self._device_call("shade", operation.name, operation.action)
+        return [ShadeState(operation.name.lower(), operation.name, 0, False) for operation in operations]
+
+
+class TestParseAdbEndpoints(unittest.TestCase):
+    def test_endpoints_and_serials(self):
+        self.assertEqual(
+            module.parse_adb_endpoints("10.0.0.2:5555, emulator-5556\n10.0.0.3:5557;"),
+            [("10.0.0.2", 5555, "10.0.0.2:5555"), (None, None, "emulator-5556"), ("10.0.0.3", 5557, "10.0.0.3:5557")],
+        )
+        self.assertEqual(module.parse_adb_endpoints(None), [])
+
+
+class TestVimarDevicePool(unittest.IsolatedAsyncioTestCase):
+    async def test_batch_throughput_scales_with_devices(self):
+        operations = [ShadeOperation(f"Shade {idx}", "open") for idx in range(8)]
+
+        async def run(device_count: int) -> float:
+            clients = [FakeClient(f"dev{idx}", latency=0.05) for idx in range(device_count)]
+            pool = VimarDevicePool(clients)
+            started = time.perf_counter()
+            updated = await pool.async_run_shade_batch(operations)
+            elapsed = time.perf_counter() - started
+            self.assertEqual(len(updated), len(operations))
+            self.assertEqual(sorted(len(client.calls) for client in clients), [8 // device_count] * device_count)
+            return elapsed
+
+        single = await run(1)
+        quad = await run(4)
+        self.assertLess(quad, single / 2.5)
+
+    async def test_operations_on_one_shade_stay_on_one_device_in_order(self):
+        clients = [FakeClient("a"), FakeClient("b")]
+        pool = VimarDevicePool(clients)
+
+        await pool.async_run_shade_batch(
+            [ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open"), ShadeOperation("Kitchen", "stop")]
+        )
+
+        kitchen = [client for client in clients if ("shade", "Kitchen", "close") in client.calls]
+        self.assertEqual(len(kitchen), 1)
+        self.assertEqual(
+            [call for call in kitchen[0].calls if call[1] == "Kitchen"],
+            [("shade", "Kitchen", "close"), ("shade", "Kitchen", "stop")],
+        )
+
+    async def test_reads_go_to_idle_device(self):
+        clients = [FakeClient("a", latency=0.05), FakeClient("b", latency=0.05)]
+        pool = VimarDevicePool(clients)
+
+        results = await asyncio.gather(pool.async_get_snapshot(), pool.async_run_scenario("Notte"))
+
+        self.assertEqual(results[0], "a")
+        self.assertEqual(clients[1].calls, [("scenario", "Notte")])
+
+    async def test_failover_and_backoff(self):
+        now = [100.0]
+        clients = [FakeClient("a", broken=True), FakeClient("b")]
+        pool = VimarDevicePool(clients, clock=lambda: now[0])
+
+        self.assertEqual(await pool.async_get_snapshot(), "b")
+        status = {entry["device"]: entry for entry in pool.as_dict()}
+        self.assertFalse(status["a"]["healthy"])
+        self.assertEqual(status["a"]["consecutive_failures"], 1)
+
+        # While backing off, the broken device is not tried at all.
+        clients[0].calls.clear()
+        await pool.async_get_snapshot()
+        await pool.async_get_snapshot()
+        self.assertEqual(clients[0].calls, [])
+
+        now[0] += module.DEVICE_RETRY_BACKOFF
+        clients[0].broken = False
+        await pool.async_run_scenario("Notte")
+        await pool.async_get_snapshot()
+        self.assertTrue(all(entry["healthy"] for entry in pool.as_dict()))
+        self.assertTrue(clients[0].calls)
+
+    async def test_app_errors_neither_fail_over_nor_back_off(self):
+        clients = [FakeClient("a"), FakeClient("b")]
+        pool = VimarDevicePool(clients)
+
+        with self.assertRaises(client_module.ElementNotFoundError):
+            await pool.async_run_scenario("Notte typo")
+
+        self.assertEqual(sum(len(client.calls) for client in clients), 1)
+        self.assertEqual([(entry["healthy"], entry["consecutive_failures"]) for entry in pool.as_dict()], [(True, 0)] * 2)
+
+    async def test_command_past_its_deadline_is_not_run_again(self):
+        clients = [FakeClient("a"), FakeClient("b")]
+        pool = VimarDevicePool(clients)
+
+        async def still_running(name: str) -> None:
+            raise load_module("command_scheduler").DeadlineExceededError("Device operation still running at its deadline")
+
+        clients[0].async_run_scenario = clients[1].async_run_scenario = still_running
+        with self.assertRaises(RuntimeError):
+            await pool.async_run_scenario("Notte")
+
+        self.assertEqual([entry["calls"] for entry in pool.as_dict()], [1, 0])
+
+    async def test_batches_are_sharded_across_healthy_devices_only(self):
+        now = [100.0]
+        clients = [FakeClient("a", broken=True), FakeClient("b")]
+        pool = VimarDevicePool(clients, clock=lambda: now[0])
+        await pool.async_get_snapshot()
+        clients[0].calls.clear()
+
+        await pool.async_run_shade_batch([ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open")])
+
+        self.assertEqual(clients[0].calls, [])
+        self.assertEqual(pool.as_dict()[0]["consecutive_failures"], 1)
+
+    async def test_keepalive_restores_health_of_recovered_devices(self):
+        now = [100.0]
+        clients = [FakeClient("a", broken=True), FakeClient("b")]
+        pool = VimarDevicePool(clients, clock=lambda: now[0])
+
+        await pool.async_keepalive()
+        self.assertEqual([entry["healthy"] for entry in pool.as_dict()], [False, True])
+
+        # Once the session is back, the next ping ends the backoff early.
+        clients[0].broken = False
+        await pool.async_keepalive()
+        self.assertEqual([entry["healthy"] for entry in pool.as_dict()], [True, True])
+
+    async def test_failed_shard_is_retried_on_another_device(self):
+        clients = [FakeClient("a"), FakeClient("b", broken=True)]
+        pool = VimarDevicePool(clients)
+
+        updated = await pool.async_run_shade_batch([ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open")])
+
+        self.assertEqual({shade.name for shade in updated}, {"Kitchen", "Bedroom"})
+        self.assertIn(("shade", "Kitchen", "close"), clients[0].calls)
+        self.assertIn(("shade", "Bedroom", "open"), clients[0].calls)
+
+    async def test_batch_errors_are_merged(self):
+        clients = [FakeClient("a", broken=True), FakeClient("b", broken=True)]
+        pool = VimarDevicePool(clients)
+
+        with self.assertRaises(ShadeBatchError) as ctx:
+            await pool.async_run_shade_batch([ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open")])
+
+        self.assertEqual(set(ctx.exception.failures), {"Kitchen", "Bedroom"})
+
+    async def test_connect_tolerates_unreachable_devices(self):
+        clients = [FakeClient("a", broken=True), FakeClient("b")]
+        pool = VimarDevicePool(clients)
+        await pool.async_connect()
+        self.assertEqual([entry["healthy"] for entry in pool.as_dict()], [False, True])
+
+        pool = VimarDevicePool([FakeClient("a", broken=True)])
+        with self.assertRaises(RuntimeError):
+            await pool.async_connect()
+
+
+if __name__ == "__main__":
+    unittest.main()
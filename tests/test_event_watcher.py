@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from helpers import load_module
+
+module = load_module("event_watcher")
+DeviceEventWatcher = module.DeviceEventWatcher
+const = load_module("const")
+
+
+class FakeStream:
+    """Log stream double that yields its lines and then ends like a dropped socket."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.closed = False
+
+    def __iter__(self):
+        yield from self.lines
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestDeviceEventWatcher(unittest.IsolatedAsyncioTestCase):
+    async def _wait_for(self, predicate) -> None:
+        for _ in range(200):
+            if predicate():
+                return
+            await asyncio.sleep(0.01)
+        self.fail("condition not reached")
+
+    async def test_matching_lines_are_delivered_on_the_loop(self):
+        loop = asyncio.get_running_loop()
+        received = []
+        stream = FakeStream(["I/Vimar: shade moved", "D/Other: noise", "I/Vimar: scenario"])
+        watcher = DeviceEventWatcher(lambda: stream, lambda: received.append(asyncio.get_running_loop()), pattern="Vimar")
+
+        watcher.start(loop)
+        await self._wait_for(lambda: len(received) == 2)
+        watcher.stop()
+
+        self.assertEqual(received, [loop, loop])
+        self.assertEqual(watcher.events, 2)
+        self.assertTrue(stream.closed)
+
+    async def test_only_state_updates_count_as_app_activity(self):
+        received = []
+        stream = FakeStream(
+            [
+                "I/Choreographer( 4242): Skipped 31 frames!  The application may be doing too much work",
+                "D/OpenGLRenderer( 4242): Davey! duration=812ms",
+                "I/art     ( 4242): Background concurrent copying GC freed 20312(1MB) AllocSpace objects",
+                "D/MqttService( 4242): message arrived on home/shutter/12/status",
+                "I/ViewRootImpl( 4242): ViewPostIme pointer 0",
+            ]
+        )
+        watcher = DeviceEventWatcher(lambda: stream, lambda: received.append(1), pattern=const.EVENT_LOG_PATTERN)
+
+        watcher.start(asyncio.get_running_loop())
+        await self._wait_for(lambda: stream.closed)
+        watcher.stop()
+
+        self.assertEqual(watcher.events, 1)
+
+    async def test_ended_and_failed_streams_are_reopened(self):
+        opened = []
+
+        def open_stream():
+            opened.append(len(opened))
+            if len(opened) == 2:
+                raise RuntimeError("app not running")
+            return FakeStream(["line"])
+
+        received = []
+        watcher = DeviceEventWatcher(open_stream, lambda: received.append(1))
+        with mock.patch.object(module, "EVENT_STREAM_BACKOFF", 0.01):
+            watcher.start(asyncio.get_running_loop())
+            await self._wait_for(lambda: len(received) >= 2)
+            watcher.stop()
+
+        self.assertGreaterEqual(len(opened), 3)
+        self.assertFalse(watcher.connected)
+
+    async def test_stop_ends_the_backoff_wait(self):
+        watcher = DeviceEventWatcher(lambda: FakeStream([]), lambda: None)
+        watcher.start(asyncio.get_running_loop())
+        thread = watcher._thread
+        await asyncio.sleep(0.05)
+
+        watcher.stop()
+        await asyncio.to_thread(thread.join, 1)
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+from helpers import load_module, read_fixture
+
+module = load_module("hierarchy_parser")
+parse_hierarchy = module.parse_hierarchy
+
+
+class TestHierarchyParserFragments(unittest.TestCase):
+    def test_extract_shades_from_percent_labels(self):
+        xml = '''
+        <node text="Living Room"/>
+        <node text="65%"/>
+        <node text="Kitchen"/>
+        <node text="10%"/>
+        '''
+        shades = parse_hierarchy(xml).shades
+        self.assertEqual(len(shades), 2)
+        self.assertEqual(shades[0].name, "Living Room")
+        self.assertEqual(shades[0].position, 65)
+        self.assertEqual(shades[1].id, "kitchen")
+
+    def test_extract_scenarios_deduplicates(self):
+        xml = '''
+        <node text="Scenario Morning"/>
+        <node text="Scenario Morning"/>
+        <node text="Scena Notte"/>
+        <node text="Other"/>
+        '''
+        scenarios = parse_hierarchy(xml).scenarios
+        self.assertEqual({s.id for s in scenarios}, {"scenario_morning", "scena_notte"})
+
+    def test_unrelated_neighbour_labels_do_not_name_rows(self):
+        xml = '''
+        <hierarchy>
+          <node text="Shades">
+            <node><node text="Kitchen"/><node text="Stop"/><node text="20%"/></node>
+            <node><node text="40%"/><node text="Bedroom"/></node>
+          </node>
+        </hierarchy>
+        '''
+        shades = parse_hierarchy(xml).shades
+        self.assertEqual([(s.name, s.position) for s in shades], [("Kitchen", 20), ("Bedroom", 40)])
+
+    def test_other_packages_are_skipped(self):
+        xml = '''
+        <hierarchy>
+          <node package="it.vimar.View"><node package="it.vimar.View" text="Kitchen"/><node package="it.vimar.View" text="20%"/></node>
+          <node package="com.android.systemui"><node package="com.android.systemui" text="Battery"/><node text="85%"/></node>
+        </hierarchy>
+        '''
+        self.assertEqual(len(parse_hierarchy(xml).shades), 2)
+        shades = parse_hierarchy(xml, package="it.vimar.View").shades
+        self.assertEqual([(s.name, s.position) for s in shades], [("Kitchen", 20)])
+
+    def test_foreign_node_tags_are_stripped(self):
+        xml = '<node package="it.vimar.View" text="a"><node text="" package="com.android.systemui" bounds="[0,0][1,1]" /></node>'
+        self.assertEqual(
+            module.strip_foreign_nodes(xml, "it.vimar.View"), '<node package="it.vimar.View" text="a"></node>'
+        )
+
+    def test_every_foreign_node_tag_is_stripped(self):
+        xml = (
+            '<node package="com.android.systemui" text="10:42"><node text="x" package="com.android.systemui"/></node>'
+            '<node package="it.vimar.View" text="a"/>'
+            '<node bounds="[0,0][1,1]" package="android" text="y"></node>'
+        )
+        self.assertEqual(
+            module.strip_foreign_nodes(xml, "it.vimar.View"), '</node><node package="it.vimar.View" text="a"/></node>'
+        )
+        own = '<node package="it.vimar.View" text="a"/>'
+        self.assertIs(module.strip_foreign_nodes(own, "it.vimar.View"), own)
+
+    def test_unnamed_percentage_gets_placeholder_name(self):
+        shades = parse_hierarchy('<node text="55%"/>').shades
+        self.assertEqual([(s.id, s.position) for s in shades], [("shade_1", 55)])
+
+    def test_shade_details_from_label_or_next_label(self):
+        xml = """
+        <node package="it.vimar.View"><node package="it.vimar.View" text="Battery"/><node package="it.vimar.View" text="80%"/></node>
+        <node package="it.vimar.View" text="Signal: -67 dBm"/>
+        <node package="com.android.systemui" text="Battery 100%"/>
+        """
+        self.assertEqual(module.parse_shade_details(xml, "it.vimar.View"), {"battery": 80, "signal": -67})
+        self.assertEqual(module.parse_shade_details('<node text="Battery"/>'), {})
+
+
+class TestHierarchyParserFixtures(unittest.TestCase):
+    def test_english_shade_list(self):
+        parsed = parse_hierarchy(read_fixture("shade_list_en.xml"))
+        self.assertEqual(
+            [(s.id, s.name, s.position) for s in parsed.shades],
+            [
+                ("living_room", "Living Room", 65),
+                ("kitchen", "Kitchen", 10),
+                ("bedroom", "Bedroom", 100),
+                ("study", "Study", 0),
+            ],
+        )
+        self.assertEqual(parsed.scenarios, [])
+
+    def test_italian_shades_and_scenarios(self):
+        parsed = parse_hierarchy(read_fixture("mixed_it.xml"))
+        self.assertEqual(
+            [(s.name, s.position) for s in parsed.shades],
+            [("Cucina", 35), ("Soggiorno", 80)],
+        )
+        self.assertEqual(
+            [(s.id, s.name) for s in parsed.scenarios],
+            [("scenario_mattina", "Scenario Mattina"), ("scena_notte", "Scena Notte")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
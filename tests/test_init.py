@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from helpers import load_module
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+module = load_module("__init__")
+const = load_module("const")
+models = load_module("models")
+ShadeState = models.ShadeState
+VimarSnapshot = models.VimarSnapshot
+
+ENTRY_DATA = {
+    const.CONF_ADB_HOST: "10.0.0.2",
+    const.CONF_ADB_PORT: 5555,
+    const.CONF_USERNAME: "user@example.com",
+    const.CONF_PASSWORD: "secret",
+    const.CONF_POLL_INTERVAL: 30,
+}
+
+
+def snapshot(position: int) -> VimarSnapshot:
+    return VimarSnapshot.from_records([ShadeState("kitchen", "Kitchen", position, False)], [])
+
+
+class FakePool:
+    """Device pool double whose connection only completes once ``reachable`` is set."""
+
+    instances: list["FakePool"] = []
+
+    def __init__(self, clients) -> None:
+        self.reachable = asyncio.Event()
+        self.connects = 0
+        self.instances.append(self)
+
+    async def async_connect(self) -> None:
+        self.connects += 1
+        await self.reachable.wait()
+
+    async def async_disconnect(self) -> None:
+        pass
+
+    async def async_get_snapshot(self) -> VimarSnapshot:
+        return snapshot(60)
+
+
+class TestSetupEntry(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hass = HomeAssistant()
+        self.entry = ConfigEntry(ENTRY_DATA, entry_id="home")
+        FakePool.instances.clear()
+        patches = [
+            mock.patch.object(module, "VimarAndroidClient"),
+            mock.patch.object(module, "VimarDevicePool", FakePool),
+            mock.patch.object(module, "async_setup_services"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self) -> None:
+        for unsub in self.entry.unload_callbacks:
+            unsub()
+        if self.entry.entry_id in self.hass.data.get(const.DOMAIN, {}):
+            await self.hass.data[const.DOMAIN][self.entry.entry_id][const.DATA_COORDINATOR].async_shutdown()
+
+    async def test_stored_snapshot_sets_up_entities_before_the_device_connects(self):
+        self.hass.storage[f"{const.DOMAIN}.home"] = snapshot(40).as_dict()
+
+        self.assertTrue(await module.async_setup_entry(self.hass, self.entry))
+
+        data = self.hass.data[const.DOMAIN]["home"]
+        pool, coordinator = data[const.DATA_CLIENT], data[const.DATA_COORDINATOR]
+        self.assertEqual(self.hass.config_entries.forwarded, [(self.entry, const.PLATFORMS)])
+        self.assertEqual(coordinator.data.shades["kitchen"].position, 40)
+
+        # Once the device is reachable, live data replaces the stored snapshot.
+        pool.reachable.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        self.assertEqual(pool.connects, 1)
+        self.assertEqual(coordinator.data.shades["kitchen"].position, 60)
+
+    async def test_first_setup_waits_for_live_data(self):
+        setup = asyncio.ensure_future(module.async_setup_entry(self.hass, self.entry))
+        await asyncio.sleep(0)
+        self.assertFalse(setup.done())
+        self.assertEqual(self.hass.config_entries.forwarded, [])
+
+        FakePool.instances[0].reachable.set()
+        self.assertTrue(await setup)
+        coordinator = self.hass.data[const.DOMAIN]["home"][const.DATA_COORDINATOR]
+        self.assertEqual(coordinator.data.shades["kitchen"].position, 60)
+        self.assertEqual(self.hass.config_entries.forwarded, [(self.entry, const.PLATFORMS)])
+
+
+if __name__ == "__main__":
+    unittest.main()
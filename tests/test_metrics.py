@@ -0,0 +1,72 @@
+import unittest
+
+from helpers import load_module
+
+module = load_module("metrics")
+LatencyHistogram = module.LatencyHistogram
+PhaseMetrics = module.PhaseMetrics
+AdaptiveTimeouts = module.AdaptiveTimeouts
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_over_rolling_window(self):
+        histogram = LatencyHistogram(window=100)
+        for ms in range(1, 201):
+            histogram.record(ms / 1000)
+
+        # Only the last 100 samples (101..200 ms) are kept; counters are lifetime.
+        self.assertEqual(histogram.as_dict(), {"count": 200, "errors": 0, "p50_ms": 150.0, "p95_ms": 195.0, "max_ms": 200.0})
+
+    def test_empty_histogram(self):
+        self.assertEqual(LatencyHistogram().as_dict(), {"count": 0, "errors": 0, "p50_ms": None, "p95_ms": None, "max_ms": None})
+
+
+class TestPhaseMetrics(unittest.TestCase):
+    def test_spans_record_durations_and_errors(self):
+        now = [0.0]
+        metrics = PhaseMetrics(clock=lambda: now[0])
+
+        with metrics.span("dump_hierarchy"):
+            now[0] += 0.25
+        with self.assertRaises(RuntimeError):
+            with metrics.span("dump_hierarchy"):
+                now[0] += 2.0
+                raise RuntimeError("device gone")
+
+        stats = metrics.as_dict()["dump_hierarchy"]
+        self.assertEqual((stats["count"], stats["errors"], stats["max_ms"]), (2, 1, 2000.0))
+        self.assertEqual(stats["p50_ms"], 250.0)
+
+
+
+class TestAdaptiveTimeouts(unittest.TestCase):
+    def setUp(self) -> None:
+        self.timeouts = AdaptiveTimeouts({"slider": 2.0}, factor=2.0, floor=0.5, ceiling=10.0, min_samples=3)
+
+    def test_default_until_enough_successes(self):
+        self.timeouts.record("slider", 0.1)
+        self.timeouts.record("slider", 0.1)
+        self.assertEqual(self.timeouts.timeout("slider"), 2.0)
+
+        self.timeouts.record("slider", 0.1)
+        # A fast device gets the floor instead of the default.
+        self.assertEqual(self.timeouts.timeout("slider"), 0.5)
+
+    def test_slow_device_gets_longer_timeouts(self):
+        for seconds in (1.0, 2.0, 3.0):
+            self.timeouts.record("slider", seconds)
+        self.assertEqual(self.timeouts.timeout("slider"), 6.0)
+
+    def test_misses_double_the_timeout_until_a_success(self):
+        self.timeouts.miss("slider")
+        self.timeouts.miss("slider")
+        self.assertEqual(self.timeouts.timeout("slider"), 8.0)
+        self.timeouts.miss("slider")
+        self.assertEqual(self.timeouts.timeout("slider"), 10.0)
+
+        self.timeouts.record("slider", 0.1)
+        self.assertEqual(self.timeouts.timeout("slider"), 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
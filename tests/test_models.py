@@ -0,0 +1,65 @@
+import json
+import unittest
+
+from helpers import load_module
+
+module = load_module("models")
+Scenario = module.Scenario
+ShadeState = module.ShadeState
+VimarSnapshot = module.VimarSnapshot
+
+
+def _shade(shade_id: str, position: int) -> ShadeState:
+    return ShadeState(id=shade_id, name=shade_id.title(), position=position, is_moving=False)
+
+
+class TestVimarSnapshot(unittest.TestCase):
+    def test_records_are_indexed_by_id(self):
+        snapshot = VimarSnapshot.from_records(
+            [_shade("kitchen", 10), _shade("study", 20)],
+            [Scenario(id="scena_notte", name="Scena Notte")],
+        )
+        self.assertEqual(snapshot.shades["study"].position, 20)
+        self.assertEqual(snapshot.scenarios["scena_notte"].name, "Scena Notte")
+        with self.assertRaises(TypeError):
+            snapshot.shades["new"] = _shade("new", 0)
+
+    def test_equal_records_compare_equal(self):
+        first = VimarSnapshot.from_records([_shade("kitchen", 10)], [])
+        second = VimarSnapshot.from_records([_shade("kitchen", 10)], [])
+        self.assertEqual(first, second)
+        self.assertEqual(second.changed_ids(first), set())
+
+    def test_changed_ids_reports_modified_added_and_removed(self):
+        previous = VimarSnapshot.from_records(
+            [_shade("kitchen", 10), _shade("study", 20), _shade("bedroom", 30)],
+            [Scenario(id="scena_notte", name="Scena Notte")],
+        )
+        current = VimarSnapshot.from_records(
+            [_shade("kitchen", 10), _shade("study", 25), _shade("attic", 0)],
+            [Scenario(id="scena_notte", name="Scena Notte")],
+        )
+        self.assertEqual(current.changed_ids(previous), {"study", "bedroom", "attic"})
+
+    def test_with_shades_replaces_records_without_touching_original(self):
+        previous = VimarSnapshot.from_records([_shade("kitchen", 10), _shade("study", 20)], [])
+        current = previous.with_shades([_shade("study", 60)])
+
+        self.assertEqual(current.shades["study"].position, 60)
+        self.assertEqual(previous.shades["study"].position, 20)
+        self.assertEqual(current.changed_ids(previous), {"study"})
+
+    def test_dict_round_trip_survives_json(self):
+        snapshot = VimarSnapshot.from_records(
+            [ShadeState(id="kitchen", name="Kitchen", position=40, is_moving=True, battery=80, signal=3)],
+            [Scenario(id="scena_notte", name="Scena Notte")],
+        )
+        restored = VimarSnapshot.from_dict(json.loads(json.dumps(snapshot.as_dict())))
+
+        # Motion is not persisted: a restored shade is at rest until polled.
+        self.assertEqual(restored.shades["kitchen"], ShadeState("kitchen", "Kitchen", 40, False, 80, 3))
+        self.assertEqual(restored.scenarios, snapshot.scenarios)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from helpers import load_module
+
+module = load_module("motion")
+MotionTracker = module.MotionTracker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMotionTracker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.tracker = MotionTracker(clock=self.clock)
+
+    def test_open_interpolates_until_target(self):
+        self.tracker.start("kitchen", 0, "open")
+        self.assertEqual(self.tracker.direction("kitchen"), 1)
+
+        self.clock.now += module.DEFAULT_SHADE_TRAVEL_TIME / 2
+        self.assertEqual(self.tracker.position("kitchen", 0), 50)
+        self.assertEqual(self.tracker.moving_ids(), {"kitchen"})
+
+        self.clock.now += module.DEFAULT_SHADE_TRAVEL_TIME
+        self.assertEqual(self.tracker.position("kitchen", 0), 0)
+        self.assertEqual(self.tracker.direction("kitchen"), 0)
+        self.assertEqual(self.tracker.moving_ids(), set())
+
+    def test_set_position_and_stop(self):
+        self.tracker.start("kitchen", 80, "set_position", 40)
+        self.assertEqual(self.tracker.direction("kitchen"), -1)
+
+        self.tracker.start("kitchen", 80, "stop")
+        self.assertEqual(self.tracker.direction("kitchen"), 0)
+
+    def test_intermediate_poll_learns_travel_time(self):
+        self.tracker.start("kitchen", 0, "open")
+        self.clock.now += 5
+        # The shade actually moved 50% in 5 s: full travel takes 10 s.
+        self.tracker.observe("kitchen", 50)
+
+        self.assertLess(self.tracker.travel_time("kitchen"), module.DEFAULT_SHADE_TRAVEL_TIME)
+        self.assertEqual(self.tracker.position("kitchen", 50), 50)
+        self.clock.now += 2
+        self.assertGreater(self.tracker.position("kitchen", 50), 50)
+
+    def test_early_arrival_ends_motion(self):
+        self.tracker.start("kitchen", 100, "close")
+        self.clock.now += 8
+        self.tracker.observe("kitchen", 0)
+
+        self.assertEqual(self.tracker.direction("kitchen"), 0)
+        self.assertAlmostEqual(self.tracker.travel_time("kitchen"), (8 + module.DEFAULT_SHADE_TRAVEL_TIME) / 2)
+
+    def test_stale_poll_does_not_cancel_motion(self):
+        self.tracker.start("kitchen", 0, "open")
+        self.clock.now += 1
+        self.tracker.observe("kitchen", 0)
+
+        self.assertEqual(self.tracker.direction("kitchen"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
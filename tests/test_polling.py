@@ -0,0 +1,62 @@
+import unittest
+
+from helpers import load_module
+
+module = load_module("polling")
+AdaptivePollScheduler = module.AdaptivePollScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptivePollScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        self.scheduler = AdaptivePollScheduler(base=20, ceiling=300, fast=3, clock=self.clock)
+
+    def test_idle_polls_back_off_to_ceiling(self):
+        intervals = [self.scheduler.record_success(0.5, changed=False, moving=False) for _ in range(6)]
+        self.assertEqual(intervals, [40, 80, 160, 300, 300, 300])
+
+    def test_change_resets_to_base(self):
+        for _ in range(3):
+            self.scheduler.record_success(0.5, changed=False, moving=False)
+        self.assertEqual(self.scheduler.record_success(0.5, changed=True, moving=False), 20)
+
+    def test_activity_and_motion_poll_fast(self):
+        self.scheduler.note_activity()
+        self.assertEqual(self.scheduler.record_success(0.5, changed=False, moving=False), 3)
+
+        self.clock.now += module.FAST_POLL_WINDOW + 1
+        self.assertEqual(self.scheduler.record_success(0.5, changed=False, moving=True), 3)
+        self.assertEqual(self.scheduler.record_success(0.5, changed=False, moving=False), 40)
+
+    def test_push_updates_leave_idle_polling_at_ceiling(self):
+        self.scheduler.push_active = True
+        self.assertEqual(self.scheduler.record_success(0.5, changed=False, moving=False), 300)
+        self.assertEqual(self.scheduler.record_success(0.5, changed=True, moving=False), 20)
+        self.assertEqual(self.scheduler.record_success(0.5, changed=False, moving=True), 3)
+
+    def test_failures_back_off_beyond_idle_ceiling(self):
+        intervals = [self.scheduler.record_failure(2.0) for _ in range(6)]
+        self.assertEqual(intervals, [40, 80, 160, 320, 600, 600])
+        self.assertEqual(self.scheduler.record_success(1.0, changed=False, moving=False), 40)
+
+    def test_stats(self):
+        self.scheduler.record_success(1.0, changed=True, moving=False)
+        self.scheduler.record_failure(3.0)
+        stats = self.scheduler.as_dict()
+        self.assertEqual(stats["polls"], 2)
+        self.assertEqual(stats["failures"], 1)
+        self.assertEqual(stats["mean_duration"], 2.0)
+        self.assertEqual(stats["max_duration"], 3.0)
+        self.assertEqual(stats["current_interval"], 40)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+
+from helpers import load_module, read_fixture
+
+module = load_module("screens")
+parse_hierarchy = load_module("hierarchy_parser").parse_hierarchy
+Screen = module.Screen
+NavAction = module.NavAction
+
+LOGIN = """
+<node class="android.widget.LinearLayout">
+  <node class="android.widget.EditText" text="user@example.com" bounds="[40,400][1040,500]"/>
+  <node class="android.widget.EditText" text="" password="true" bounds="[40,520][1040,620]"/>
+  <node class="android.widget.Button" text="Accedi" bounds="[40,700][1040,800]"/>
+</node>
+"""
+PIN = """
+<node class="android.widget.LinearLayout">
+  <node class="android.widget.TextView" text="Inserisci PIN"/>
+  <node class="android.widget.EditText" text="" bounds="[40,400][1040,500]"/>
+  <node class="android.widget.Button" text="Conferma" bounds="[40,700][1040,800]"/>
+</node>
+"""
+DETAIL = """
+<node class="android.widget.LinearLayout">
+  <node class="android.widget.TextView" text="Cucina"/>
+  <node class="android.widget.SeekBar" bounds="[40,900][1040,960]"/>
+  <node class="android.widget.Button" text="Su" bounds="[40,1000][300,1100]"/>
+  <node class="android.widget.Button" text="Giu" bounds="[340,1000][600,1100]"/>
+</node>
+"""
+
+DETAIL_WITH_POSITION = """
+<node class="android.widget.LinearLayout">
+  <node class="android.widget.TextView" text="Kitchen"/>
+  <node class="android.widget.TextView" text="40%"/>
+  <node class="android.widget.SeekBar" bounds="[40,900][1040,960]"/>
+  <node class="android.widget.Button" text="Up" bounds="[40,1000][300,1100]"/>
+</node>
+"""
+DETAIL_WITH_BATTERY = """
+<node class="android.widget.LinearLayout">
+  <node class="android.widget.TextView" text="Kitchen"/>
+  <node class="android.widget.SeekBar" bounds="[40,900][1040,960]"/>
+  <node class="android.widget.TextView" text="Batteria 80%"/>
+</node>
+"""
+
+
+def classify(xml: str) -> Screen:
+    return module.classify_screen(parse_hierarchy(xml))
+
+
+class TestClassifyScreen(unittest.TestCase):
+    def test_screens(self):
+        self.assertEqual(classify(LOGIN), Screen.LOGIN)
+        self.assertEqual(classify(PIN), Screen.PIN)
+        self.assertEqual(classify(DETAIL), Screen.SHADE_DETAIL)
+        self.assertEqual(classify(read_fixture("shade_list_en.xml")), Screen.SHADE_LIST)
+        self.assertEqual(classify('<node text="Scena Notte"/>'), Screen.SCENARIO_LIST)
+        self.assertEqual(classify('<node text="Caricamento..."/>'), Screen.UNKNOWN)
+
+    def test_detail_pages_showing_percentages(self):
+        self.assertEqual(classify(DETAIL_WITH_POSITION), Screen.SHADE_DETAIL)
+        self.assertEqual(classify(DETAIL_WITH_BATTERY), Screen.SHADE_DETAIL)
+        # A battery reading is never taken for the shade's position.
+        self.assertEqual(parse_hierarchy(DETAIL_WITH_BATTERY).shades, [])
+
+    def test_typed_credentials_are_not_labels(self):
+        parsed = parse_hierarchy(LOGIN)
+        self.assertEqual((parsed.shades, parsed.scenarios), ([], []))
+        self.assertEqual(parsed.elements.buttons, {"login": (40, 700, 1040, 800)})
+
+    def test_list_rows_with_buttons_are_not_a_detail_page(self):
+        xml = """
+        <node class="android.widget.LinearLayout">
+          <node text="Kitchen"/><node text="20%"/><node text="Up"/><node text="Down"/>
+        </node>
+        """
+        self.assertEqual(classify(xml), Screen.SHADE_LIST)
+
+
+class TestPlanRoute(unittest.TestCase):
+    def test_routes_to_the_list(self):
+        targets = module.LIST_SCREENS
+        self.assertEqual(module.plan_route(Screen.LOGIN, targets), [NavAction.LOGIN])
+        self.assertEqual(module.plan_route(Screen.PIN, targets), [NavAction.SUBMIT_PIN])
+        self.assertEqual(module.plan_route(Screen.SHADE_DETAIL, targets), [NavAction.BACK])
+        self.assertEqual(module.plan_route(Screen.SHADE_LIST, targets), [])
+
+    def test_unreachable_target(self):
+        self.assertEqual(module.plan_route(Screen.SHADE_LIST, {Screen.SCENARIO_LIST}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from helpers import load_module
+
+import voluptuous as vol
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+module = load_module("services")
+const = load_module("const")
+models = load_module("models")
+ShadeBatchError = load_module("vimar_android_client").ShadeBatchError
+ShadeOperation = models.ShadeOperation
+ShadeState = models.ShadeState
+VimarSnapshot = models.VimarSnapshot
+
+
+class FakeCoordinator:
+    def __init__(self, *names: str) -> None:
+        self.data = VimarSnapshot.from_records(
+            [ShadeState(name.lower(), name, 0, False) for name in names], []
+        )
+        self.batches: list[list[ShadeOperation]] = []
+        self.error: Exception | None = None
+
+    async def async_run_shade_batch(self, operations):
+        self.batches.append(list(operations))
+        if self.error is not None:
+            raise self.error
+
+
+class TestRunShadeBatchService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hass = HomeAssistant()
+        self.home = FakeCoordinator("Kitchen", "Bedroom")
+        self.office = FakeCoordinator("Office")
+        self.hass.data[const.DOMAIN] = {
+            "home": {const.DATA_COORDINATOR: self.home},
+            "office": {const.DATA_COORDINATOR: self.office},
+        }
+        module.async_setup_services(self.hass)
+
+    async def call(self, **data) -> None:
+        await self.hass.services.async_call(const.DOMAIN, const.SERVICE_RUN_SHADE_BATCH, data)
+
+    async def test_operations_are_grouped_per_entry(self):
+        await self.call(
+            operations=[
+                {"shade": "kitchen", "action": "close"},
+                {"shade": "Office", "action": "set_position", "position": "40"},
+                {"shade": "Bedroom", "action": "open"},
+            ]
+        )
+
+        self.assertEqual(
+            self.home.batches, [[ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open")]]
+        )
+        self.assertEqual(self.office.batches, [[ShadeOperation("Office", "set_position", 40)]])
+
+    async def test_invalid_requests_are_rejected(self):
+        with self.assertRaises(vol.Invalid):
+            await self.call(operations=[{"shade": "Kitchen", "action": "set_position"}])
+        with self.assertRaises(HomeAssistantError):
+            await self.call(operations=[{"shade": "Garage", "action": "open"}])
+        with self.assertRaises(HomeAssistantError):
+            await self.call(operations=[{"shade": "Office", "action": "open"}], config_entry_id="home")
+        self.assertEqual((self.home.batches, self.office.batches), ([], []))
+
+    async def test_batch_failures_are_reported(self):
+        self.home.error = ShadeBatchError({"Kitchen": "Shade 'Kitchen' not found"})
+
+        with self.assertRaises(HomeAssistantError) as ctx:
+            await self.call(operations=[{"shade": "Kitchen", "action": "open"}])
+
+        self.assertIn("Kitchen", str(ctx.exception))
+
+    async def test_service_is_removed_with_the_last_entry(self):
+        module.async_setup_services(self.hass)
+        self.hass.data[const.DOMAIN] = {}
+        module.async_unload_services(self.hass)
+        self.assertFalse(self.hass.services.has_service(const.DOMAIN, const.SERVICE_RUN_SHADE_BATCH))
+
+
+if __name__ == "__main__":
+    unittest.main()
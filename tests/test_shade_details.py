@@ -0,0 +1,59 @@
+import unittest
+
+from helpers import load_module
+
+module = load_module("shade_details")
+ShadeState = load_module("models").ShadeState
+
+TTLS = {"battery": 1000, "signal": 100}
+
+
+class TestShadeDetailCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.cache = module.ShadeDetailCache(TTLS, clock=lambda: self.now)
+
+    def test_due_shades_rotate_after_the_last_visited(self):
+        ids = ["a", "b", "c", "d"]
+        self.assertEqual(self.cache.due(ids, 2), ["a", "b"])
+
+        self.cache.store("a", {})
+        self.cache.store("b", {})
+        self.assertEqual(self.cache.due(ids, 2), ["c", "d"])
+
+        self.cache.store("c", {})
+        self.assertEqual(self.cache.due(ids, 2), ["d"])
+        # Half the shortest TTL later the visited shades are due again, in turn.
+        self.now = 50
+        self.assertEqual(self.cache.due(ids, 3), ["d", "a", "b"])
+
+    def test_readings_outlive_their_ttl_as_stale(self):
+        shade = ShadeState("a", "A", 20, False)
+        self.cache.store("a", {"battery": 80, "signal": -67})
+        self.assertEqual((self.cache.fill(shade).battery, self.cache.fill(shade).signal), (80, -67))
+
+        # A crawl falling behind leaves old readings in place, flagged as stale.
+        self.now = 150
+        self.assertEqual(self.cache.values("a"), {"battery": 80, "signal": -67})
+        self.assertEqual(self.cache.as_dict(), {"visited": 1, "readings": 2, "stale": 1})
+        # A page showing only one metric keeps the other's last reading.
+        self.cache.store("a", {"signal": -70})
+        self.assertEqual(self.cache.values("a"), {"battery": 80, "signal": -70})
+        self.assertEqual(self.cache.as_dict()["stale"], 0)
+
+    def test_batch_size_keeps_up_with_the_shortest_ttl(self):
+        # Every shade must be visited within 50 s: 40 shades at one crawl per 10 s.
+        self.assertEqual(self.cache.batch_size(40, 10), 8)
+        self.assertEqual(self.cache.batch_size(3, 10), 1)
+        self.assertEqual(self.cache.batch_size(0, 10), 0)
+
+    def test_fill_returns_the_same_record_without_changes(self):
+        shade = ShadeState("a", "A", 20, False)
+        self.assertIs(self.cache.fill(shade), shade)
+        self.cache.store("a", {"battery": 80})
+        filled = self.cache.fill(shade)
+        self.assertIs(self.cache.fill(filled), filled)
+
+
+if __name__ == "__main__":
+    unittest.main()
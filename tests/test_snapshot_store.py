@@ -0,0 +1,49 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from helpers import load_module
+
+from homeassistant.core import HomeAssistant
+
+module = load_module("snapshot_store")
+models = load_module("models")
+Scenario = models.Scenario
+ShadeState = models.ShadeState
+VimarSnapshot = models.VimarSnapshot
+
+SNAPSHOT = VimarSnapshot.from_records(
+    [ShadeState("kitchen", "Kitchen", 40, False, battery=80)], [Scenario("notte", "Notte")]
+)
+
+
+class TestVimarSnapshotStore(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.hass = HomeAssistant()
+        self.store = module.VimarSnapshotStore(self.hass, "entry")
+
+    async def test_saved_snapshot_is_loaded_back(self):
+        with mock.patch.object(module, "SNAPSHOT_SAVE_DELAY", 0.01):
+            self.store.async_schedule_save(SNAPSHOT)
+            self.assertIsNone(await self.store.async_load())
+            await asyncio.sleep(0.03)
+
+        self.assertEqual(await module.VimarSnapshotStore(self.hass, "entry").async_load(), SNAPSHOT)
+        self.assertIsNone(await module.VimarSnapshotStore(self.hass, "other").async_load())
+
+    async def test_unusable_data_is_ignored(self):
+        key = f"{module.DOMAIN}.entry"
+        for data in ({"shades": [{"name": "Kitchen"}]}, {"shades": [], "scenarios": []}):
+            self.hass.storage[key] = data
+            self.assertIsNone(await self.store.async_load())
+
+    async def test_remove(self):
+        with mock.patch.object(module, "SNAPSHOT_SAVE_DELAY", 0):
+            self.store.async_schedule_save(SNAPSHOT)
+            await asyncio.sleep(0)
+        await self.store.async_remove()
+        self.assertIsNone(await self.store.async_load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from helpers import load_module, read_fixture
+from test_vimar_android_client import ScriptedFakeDevice
+
+module = load_module("trace")
+ReplayDevice = module.ReplayDevice
+VimarAndroidClient = load_module("vimar_android_client").VimarAndroidClient
+ShadeOperation = load_module("models").ShadeOperation
+
+VISIBLE = {"Living Room", "Kitchen", "Bedroom", "Up", "Stop", "Down"}
+OPERATIONS = [ShadeOperation("Living Room", "set_position", 30), ShadeOperation("Kitchen", "stop")]
+
+
+def _client(**kwargs) -> VimarAndroidClient:
+    return VimarAndroidClient("127.0.0.1", 5555, None, "u", "p", None, **kwargs)
+
+
+async def _session(client: VimarAndroidClient):
+    snapshot = await client.async_get_snapshot()
+    updated = await client.async_run_shade_batch(OPERATIONS)
+    return snapshot, updated
+
+
+class TestTraceRecordReplay(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = f"{self.tmp.name}/trace.jsonl"
+        self.device = ScriptedFakeDevice(read_fixture("shade_list_en.xml"), visible=set(VISIBLE))
+
+        client = _client(trace_path=self.path)
+        with mock.patch.object(sys.modules["uiautomator2"], "connect", lambda serial: self.device):
+            await client.async_connect()
+        self.recorded = await _session(client)
+        await client.async_disconnect()
+
+    async def asyncTearDown(self) -> None:
+        self.tmp.cleanup()
+
+    async def test_trace_holds_calls_and_operation_markers(self):
+        header, events = module.load_trace(self.path)
+
+        self.assertEqual(header["serial"], "127.0.0.1:5555")
+        self.assertEqual([event["op"] for event in events if "op" in event], ["prepare_session", "get_snapshot", "run_shade_batch"])
+        calls = [event for event in events if "call" in event]
+        # Every device interaction of the fake was captured, in order.
+        self.assertEqual(sum(event["call"] == "dump_hierarchy" for event in calls), self.device.log.count(("dump",)))
+        self.assertEqual(calls[0]["call"], "app_start")
+        self.assertTrue(all(event["latency"] >= 0 for event in calls))
+
+    async def test_strict_replay_reproduces_the_session(self):
+        client = _client()
+        client._device = ReplayDevice.from_file(self.path, time_scale=0, strict=True)
+
+        await client.async_prepare_session()
+        self.assertEqual(await _session(client), self.recorded)
+        await client.async_disconnect()
+
+    async def test_strict_replay_rejects_diverging_calls(self):
+        client = _client()
+        client._device = ReplayDevice.from_file(self.path, time_scale=0, strict=True)
+
+        await client.async_prepare_session()
+        with self.assertRaises(module.TraceMismatchError):
+            await client.async_run_scenario("Notte")
+        await client.async_disconnect()
+
+
+class TestTraceRedaction(unittest.TestCase):
+    def test_typed_credentials_never_reach_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/trace.jsonl"
+            writer = module.TraceWriter(path, "127.0.0.1:5555")
+            fake = mock.Mock()
+            fake.return_value.set_text.return_value = None
+            device = module.RecordingDevice(fake, writer)
+            device(className="android.widget.EditText", instance=1).set_text("hunter2")
+            device(className="android.widget.EditText").set_text("1234")
+            writer.close()
+
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            events = module.load_trace(path)[1]
+
+        self.assertNotIn("hunter2", content)
+        self.assertNotIn("1234", content)
+        self.assertEqual([event["args"] for event in events], [["<redacted>"], ["<redacted>"]])
+        # The replay device answers set_text without looking at its argument.
+        ReplayDevice(events, time_scale=0, strict=True)(className="android.widget.EditText", instance=1).set_text("x")
+
+
+class TestReplayDevice(unittest.TestCase):
+    EVENTS = [
+        {"call": "dump_hierarchy", "query": None, "result": "<a/>", "latency": 0.2},
+        {"call": "exists", "query": {"text": "Kitchen"}, "result": True, "latency": 0.0},
+        {"call": "click", "query": {"text": "Kitchen"}, "result": None, "latency": 0.0},
+        {"call": "dump_hierarchy", "query": None, "result": "<b/>", "latency": 0.0},
+    ]
+
+    def test_recorded_latency_is_scaled(self):
+        device = ReplayDevice(self.EVENTS, time_scale=0.25)
+        started = time.perf_counter()
+        device.dump_hierarchy()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.05)
+        self.assertLess(time.perf_counter() - started, 0.15)
+
+    def test_lenient_replay_follows_session_order(self):
+        device = ReplayDevice(self.EVENTS, time_scale=0)
+
+        # Skipping the probe still clicks, and the next dump shows the later screen.
+        device(text="Kitchen").click()
+        self.assertEqual(device.dump_hierarchy(), "<b/>")
+        # Calls past the end of the trace reuse the latest matching answer.
+        self.assertEqual(device.dump_hierarchy(), "<b/>")
+        self.assertTrue(device(text="Kitchen").exists(timeout=1))
+        self.assertEqual((device.skipped, device.reused), (2, 2))
+        with self.assertRaises(module.TraceMismatchError):
+            device(text="Garage").exists()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,42 +1,743 @@
-import importlib.util
-import pathlib
+import asyncio
+import re
+import threading
 import sys
-import types
+import time
 import unittest
+from unittest import mock
 
+from helpers import load_module, read_fixture
+import test_screens
 
-ROOT = pathlib.Path(__file__).resolve().parents[1]
-MODULE_PATH = ROOT / "custom_components" / "vimar_viewapp" / "vimar_android_client.py"
+module = load_module("vimar_android_client")
+VimarAndroidClient = module.VimarAndroidClient
+ShadeOperation = load_module("models").ShadeOperation
+page_cache = load_module("page_cache")
+hierarchy_parser = load_module("hierarchy_parser")
+
+
+class SlowSelector:
+    def __init__(self, device: "SlowFakeDevice", query: dict) -> None:
+        self._device = device
+        self._query = query
+
+    def exists(self, timeout: float = 0) -> bool:
+        if self._query.get("scrollable"):
+            return False
+        self._device.probes += 1
+        time.sleep(self._device.latency)
+        return False
+
+
+class SlowFakeDevice:
+    """Fake uiautomator2 device whose every call blocks like a real round trip."""
+
+    info = {"screenOn": True}
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.dumps = 0
+        self.hierarchy = '<node text="Living Room"/><node text="40%"/>'
+        self.probes = 0
+        self.app_starts = 0
+        self.foreground = "it.vimar.View"
+        self.compressed: list[bool] = []
+
+    def __call__(self, **kwargs):
+        return SlowSelector(self, kwargs)
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self.app_starts += 1
+        time.sleep(self.latency)
+
+    def app_current(self) -> dict:
+        return {"package": self.foreground, "activity": ".MainActivity"}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        self.dumps += 1
+        self.compressed.append(compressed)
+        time.sleep(self.latency)
+        return self.hierarchy
+
+
+class TestVimarAndroidClientDeviceWorker(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient(
+            adb_host="127.0.0.1",
+            adb_port=5555,
+            serial=None,
+            username="u",
+            password="p",
+            pin=None,
+        )
+        self.client._device = SlowFakeDevice(latency=0.05)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_event_loop_stays_responsive_during_snapshot(self):
+        max_gap = 0.0
+        stop = asyncio.Event()
+
+        async def heartbeat() -> None:
+            nonlocal max_gap
+            last = time.monotonic()
+            while not stop.is_set():
+                await asyncio.sleep(0.005)
+                now = time.monotonic()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        beat = asyncio.create_task(heartbeat())
+        started = time.monotonic()
+        snapshot = await self.client.async_get_snapshot()
+        elapsed = time.monotonic() - started
+        stop.set()
+        await beat
+
+        self.assertEqual(snapshot.shades["living_room"].position, 40)
+        self.assertEqual(self.client._device.dumps, 1)
+        # The fake device blocks for well over a hundred milliseconds in total ...
+        self.assertGreater(elapsed, 0.1)
+        # ... but the loop keeps ticking because all of it runs on the worker.
+        self.assertLess(max_gap, 0.04)
+
+    async def test_snapshot_phases_are_timed(self):
+        await self.client.async_get_snapshot()
+
+        stats = self.client.metrics.as_dict()
+        for phase in ("snapshot", "app_start", "login_probe", "dump_hierarchy", "parse"):
+            self.assertEqual(stats[phase]["count"], 1, phase)
+        # The fake device sleeps 50 ms per dump; the whole poll includes it.
+        self.assertGreaterEqual(stats["dump_hierarchy"]["max_ms"], 50)
+        self.assertGreaterEqual(stats["snapshot"]["max_ms"], stats["dump_hierarchy"]["max_ms"])
+
+    async def test_device_calls_run_on_single_worker_thread(self):
+        calls: list[tuple[str, str]] = []
+        device = self.client._device
+
+        def recorded(name: str):
+            original = getattr(device, name)
+
+            def call(*args, **kwargs):
+                calls.append((name, threading.current_thread().name))
+                return original(*args, **kwargs)
+
+            return call
+
+        for name in ("app_start", "app_current", "dump_hierarchy"):
+            setattr(device, name, recorded(name))
+        # The cached session skips app_start after the first prepare, so the
+        # later calls reach the device through the other methods.
+        await asyncio.gather(
+            self.client.async_prepare_session(),
+            self.client.async_prepare_session(),
+            self.client.async_get_snapshot(),
+        )
+
+        self.assertEqual({name for name, _ in calls}, {"app_start", "app_current", "dump_hierarchy"})
+        threads = {thread for _, thread in calls}
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(next(iter(threads)).startswith("vimar_"))
+
+
+class TestVimarAndroidClientSession(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient(
+            adb_host="127.0.0.1",
+            adb_port=5555,
+            serial=None,
+            username="u",
+            password="p",
+            pin="1234",
+        )
+        self.device = SlowFakeDevice(latency=0)
+        self.client._device = self.device
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_valid_session_skips_login_probes(self):
+        await self.client.async_prepare_session()
+        self.assertEqual(self.device.app_starts, 1)
+        probes = self.device.probes
+
+        await self.client.async_get_snapshot()
+        await self.client.async_get_snapshot()
+
+        self.assertEqual(self.device.app_starts, 1)
+        self.assertEqual(self.device.probes, probes)
+
+    async def test_app_in_background_triggers_full_prepare(self):
+        await self.client.async_prepare_session()
+        self.device.foreground = "com.android.launcher"
+
+        await self.client.async_prepare_session()
+
+        self.assertEqual(self.device.app_starts, 2)
+
+    async def test_expired_session_triggers_full_prepare(self):
+        await self.client.async_prepare_session()
+        self.client._session._validated_at -= module.SESSION_TTL + 1
+
+        await self.client.async_prepare_session()
+
+        self.assertEqual(self.device.app_starts, 2)
+
+    async def test_missing_element_keeps_session(self):
+        await self.client.async_prepare_session()
+
+        with self.assertRaises(module.ElementNotFoundError):
+            await self.client.async_run_scenario("Scenario Missing")
+        await self.client.async_get_snapshot()
+
+        self.assertTrue(self.client._session.is_valid())
+        self.assertEqual(self.device.app_starts, 1)
+
+    async def test_device_error_invalidates_session(self):
+        await self.client.async_get_snapshot()
+
+        with mock.patch.object(self.device, "dump_hierarchy", side_effect=OSError("adb connection reset")):
+            with self.assertRaises(OSError):
+                await self.client.async_get_snapshot()
+
+        self.assertFalse(self.client._session.is_valid())
+
+
+class TestVimarAndroidClientChangeDetection(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient(
+            adb_host="127.0.0.1",
+            adb_port=5555,
+            serial=None,
+            username="u",
+            password="p",
+            pin=None,
+        )
+        self.device = SlowFakeDevice(latency=0)
+        self.client._device = self.device
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_unchanged_hierarchy_returns_previous_snapshot(self):
+        first = await self.client.async_get_snapshot()
+        second = await self.client.async_get_snapshot()
+
+        self.assertIs(first, second)
+        self.assertEqual(self.device.dumps, 2)
+
+    async def test_changed_hierarchy_is_parsed_again(self):
+        first = await self.client.async_get_snapshot()
+        self.device.hierarchy = '<node text="Living Room"/><node text="75%"/>'
+        second = await self.client.async_get_snapshot()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.shades["living_room"].position, 75)
+
+    async def test_other_windows_do_not_count_as_changes(self):
+        app = '<node package="it.vimar.View" text="Living Room"/><node package="it.vimar.View" text="40%"/>'
+        self.device.hierarchy = app + '<node package="com.android.systemui" text="10:42"/>'
+        first = await self.client.async_get_snapshot()
+        self.device.hierarchy = app + '<node package="com.android.systemui" text="10:43"/>'
+        second = await self.client.async_get_snapshot()
+
+        self.assertIs(first, second)
+
+    def test_repeated_captures_are_parsed_once(self):
+        app = '<node package="it.vimar.View" text="Living Room"/><node package="it.vimar.View" text="40%"/>'
+        first = self.client._parse(app + '<node package="com.android.systemui" text="10:42"/>')
+        again = self.client._parse(app + '<node package="com.android.systemui" text="10:43"/>')
+        changed = self.client._parse(app.replace("40%", "45%"))
+
+        self.assertIs(first, again)
+        self.assertEqual(changed.shades[0].position, 45)
+        self.assertEqual(self.client.metrics.as_dict()["parse"]["count"], 2)
+
+    async def test_full_dumps_are_requested_by_default(self):
+        # Compressed dumps drop the layout containers shade rows are grouped by.
+        await self.client.async_get_snapshot()
+
+        self.assertEqual(set(self.device.compressed), {False})
+
+
+class FixedScroll:
+    """The scripted list fits on one screen: scrolling never moves it."""
+
+    def forward(self) -> bool:
+        return False
+
+    def toBeginning(self) -> bool:  # noqa: N802 - uiautomator2 API name
+        return False
+
+    def to(self, **kwargs) -> bool:
+        return False
+
+
+class UiSelector:
+    def __init__(self, device: "ScriptedFakeDevice", query: dict) -> None:
+        self._device = device
+        self._query = query
+
+    @property
+    def scroll(self) -> FixedScroll:
+        return FixedScroll()
+
+    def _matches(self) -> bool:
+        if "text" in self._query:
+            return self._query["text"] in self._device.visible
+        if "textMatches" in self._query:
+            return any(re.match(self._query["textMatches"], text) for text in self._device.visible)
+        return self._query.get("className") == "android.widget.SeekBar"
+
+    def exists(self, timeout: float = 0) -> bool:
+        return self._matches()
+
+    def click(self) -> None:
+        self._device.log.append(("click", self._query.get("text") or self._query.get("textMatches")))
+
+    def set_progress(self, value: int) -> None:
+        self._device.log.append(("set_progress", value))
+
+
+class ScriptedFakeDevice:
+    """Fake device showing a fixed shade list and logging every interaction."""
+
+    info = {"screenOn": True}
+
+    def __init__(self, hierarchy: str, visible: set[str]) -> None:
+        self.hierarchy = hierarchy
+        self.visible = visible
+        self.log: list[tuple] = []
+
+    def __call__(self, **kwargs):
+        return UiSelector(self, kwargs)
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self.log.append(("app_start", package))
+
+    def app_current(self) -> dict:
+        return {"package": "it.vimar.View"}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        self.log.append(("dump",))
+        return self.hierarchy
+
+    def press(self, key: str) -> None:
+        self.log.append(("press", key))
+
+    def click(self, x: int, y: int) -> None:
+        self.log.append(("tap", x, y))
+
+
+class FakeShell:
+    """ADB shell double recording the taps sent over it."""
+
+    def __init__(self, broken: bool = False) -> None:
+        self.broken = broken
+        self.attempts = 0
+        self.taps: list[tuple[int, int]] = []
+
+    def tap(self, x: int, y: int) -> None:
+        self.attempts += 1
+        if self.broken:
+            raise ConnectionResetError("adb server gone")
+        self.taps.append((x, y))
+
+    def key(self, keycode: int) -> None:
+        self.attempts += 1
+
+    def close(self) -> None:
+        pass
+
+
+class TestVimarAndroidClientShadeBatch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient(
+            adb_host="127.0.0.1",
+            adb_port=5555,
+            serial=None,
+            username="u",
+            password="p",
+            pin=None,
+        )
+        self.device = ScriptedFakeDevice(
+            read_fixture("shade_list_en.xml"),
+            visible={"Living Room", "Kitchen", "Bedroom", "Up", "Stop", "Down"},
+        )
+        self.client._device = self.device
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_batch_runs_in_one_pass_ordered_by_row(self):
+        updated = await self.client.async_run_shade_batch(
+            [
+                ShadeOperation("Kitchen", "close"),
+                ShadeOperation("Living Room", "set_position", 30),
+                ShadeOperation("Kitchen", "stop"),
+            ]
+        )
+
+        # One capture to plan the batch and one to read the affected rows back
+        # once the detail page was left.
+        self.assertEqual(self.device.log.count(("dump",)), 2)
+        self.assertEqual([(shade.id, shade.position) for shade in updated], [("living_room", 65), ("kitchen", 10)])
+        self.assertEqual([entry for entry in self.device.log if entry[0] == "app_start"], [("app_start", "it.vimar.View")])
+        elements = self.elements()
+        clicks = [entry for entry in self.device.log if entry[0] in ("click", "set_progress", "tap")]
+        self.assertEqual(
+            clicks,
+            [
+                # The stop replaced the queued close and goes first.
+                ("tap", *hierarchy_parser.center(elements.actions["Kitchen"]["stop"])),
+                # No inline slider: open the row from its cached bounds.
+                ("tap", *hierarchy_parser.center(elements.rows["Living Room"])),
+                ("set_progress", 30),
+            ],
+        )
+
+    async def test_inline_actions_are_tapped_from_cached_bounds(self):
+        await self.client.async_get_snapshot()
+        self.device.log.clear()
+
+        await self.client.async_run_shade_batch(
+            [ShadeOperation("Kitchen", "close"), ShadeOperation("Bedroom", "open")]
+        )
+
+        elements = self.elements()
+        # One capture confirms the screen the snapshot cached, then both commands
+        # are single coordinate taps without selector lookups.
+        self.assertEqual(
+            self.device.log,
+            [
+                ("dump",),
+                ("tap", *hierarchy_parser.center(elements.actions["Kitchen"]["close"])),
+                ("tap", *hierarchy_parser.center(elements.actions["Bedroom"]["open"])),
+                ("dump",),
+            ],
+        )
+
+    async def test_navigation_invalidates_cached_bounds(self):
+        await self.client.async_get_snapshot()
+        await self.client.async_set_shade_position("Living Room", 40)
+        self.device.log.clear()
+
+        await self.client.async_open_shade("Bedroom")
+
+        self.assertEqual(self.device.log, [("click", "Bedroom"), ("click", "(?i)(open|up|apri|su)")])
+
+    async def test_adb_shell_sends_cached_taps(self):
+        shell = FakeShell()
+        self.client._shell = shell
+        await self.client.async_get_snapshot()
+        self.device.log.clear()
+
+        await self.client.async_close_shade("Kitchen")
+
+        self.assertEqual(shell.taps, [hierarchy_parser.center(self.elements().actions["Kitchen"]["close"])])
+        self.assertEqual(self.device.log, [("dump",)])
+
+    async def test_screen_changed_from_outside_is_tapped_where_it_is_now(self):
+        await self.client.async_get_snapshot()
+        # Someone scrolls the list on the device itself.
+        self.device.hierarchy = self.device.hierarchy.replace("[1008,400][1068,520]", "[1008,100][1068,220]")
+        self.device.log.clear()
+
+        await self.client.async_close_shade("Kitchen")
+
+        self.assertEqual(self.device.log, [("dump",), ("tap", 1038, 160)])
+
+    async def test_failing_adb_shell_falls_back_to_uiautomator(self):
+        shell = FakeShell(broken=True)
+        self.client._shell = shell
+        await self.client.async_get_snapshot()
+        self.device.log.clear()
+
+        await self.client.async_close_shade("Kitchen")
+        await self.client.async_open_shade("Kitchen")
+
+        elements = self.elements()
+        self.assertEqual(shell.attempts, 1)
+        self.assertEqual(
+            [entry for entry in self.device.log if entry[0] == "tap"],
+            [
+                ("tap", *hierarchy_parser.center(elements.actions["Kitchen"]["close"])),
+                ("tap", *hierarchy_parser.center(elements.actions["Kitchen"]["open"])),
+            ],
+        )
+
+    def elements(self):
+        return hierarchy_parser.parse_hierarchy(self.device.hierarchy).elements
+
+    async def test_batch_reports_failures_after_running_the_rest(self):
+        with self.assertRaises(module.ShadeBatchError) as ctx:
+            await self.client.async_run_shade_batch(
+                [ShadeOperation("Garage", "open"), ShadeOperation("Bedroom", "open")]
+            )
+
+        self.assertEqual(set(ctx.exception.failures), {"Garage"})
+        self.assertIn(("tap", *hierarchy_parser.center(self.elements().actions["Bedroom"]["open"])), self.device.log)
+
+
+def _page(first: int, count: int) -> str:
+    rows = "".join(
+        f'<node><node text="Shade {idx:02d}"/><node text="{idx}%"/></node>' for idx in range(first, first + count)
+    )
+    return f"<hierarchy><node scrollable=\"true\">{rows}</node></hierarchy>"
+
+
+class ScreenSelector:
+    def __init__(self, device: "NavigatingFakeDevice", query: dict) -> None:
+        self._device = device
+        self._query = query
+
+    def exists(self, timeout: float = 0) -> bool:
+        self._device.log.append(("exists", self._query))
+        return False
+
+    def set_text(self, text: str) -> None:
+        self._device.log.append(("set_text", self._query.get("instance", 0), text))
+
+
+class NavigatingFakeDevice:
+    """Fake device moving through login, PIN and list screens as buttons are tapped."""
+
+    info = {"screenOn": True}
+
+    def __init__(self, screens: list[str]) -> None:
+        self.screens = screens
+        self.log: list[tuple] = []
+
+    def __call__(self, **kwargs):
+        return ScreenSelector(self, kwargs)
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        self.log.append(("app_start",))
+
+    def app_current(self) -> dict:
+        return {"package": "it.vimar.View"}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        self.log.append(("dump",))
+        return self.screens[0]
+
+    def click(self, x: int, y: int) -> None:
+        self.log.append(("tap", x, y))
+        if len(self.screens) > 1:
+            self.screens.pop(0)
+
+    def press(self, key: str) -> None:
+        self.click(0, 0)
 
-# Stub package context and dependency to allow isolated unit testing without Home Assistant.
-pkg = types.ModuleType("custom_components")
-pkg.__path__ = []
-sys.modules.setdefault("custom_components", pkg)
-subpkg = types.ModuleType("custom_components.vimar_viewapp")
-subpkg.__path__ = [str(ROOT / "custom_components" / "vimar_viewapp")]
-sys.modules.setdefault("custom_components.vimar_viewapp", subpkg)
 
-const_mod = types.ModuleType("custom_components.vimar_viewapp.const")
-const_mod.VIMAR_PACKAGE = "it.vimar.View"
-sys.modules.setdefault("custom_components.vimar_viewapp.const", const_mod)
+class TestVimarAndroidClientNavigation(unittest.IsolatedAsyncioTestCase):
+    def make_client(self, screens: list[str], pin: str | None = "1234") -> VimarAndroidClient:
+        client = VimarAndroidClient("127.0.0.1", 5555, None, "user", "secret", pin)
+        client._device = self.device = NavigatingFakeDevice(screens)
+        self.addAsyncCleanup(client.async_disconnect)
+        return client
 
-u2 = types.ModuleType("uiautomator2")
-u2.Device = object
-u2.connect = lambda *args, **kwargs: None
-sys.modules.setdefault("uiautomator2", u2)
+    async def test_login_and_pin_from_one_capture_each(self):
+        client = self.make_client([test_screens.LOGIN, test_screens.PIN, '<node text="Kitchen"/><node text="20%"/>'])
 
-spec = importlib.util.spec_from_file_location(
-    "custom_components.vimar_viewapp.vimar_android_client", MODULE_PATH
+        snapshot = await client.async_get_snapshot()
+
+        self.assertEqual(snapshot.shades["kitchen"].position, 20)
+        self.assertEqual(
+            self.device.log,
+            [
+                ("app_start",),
+                ("dump",),
+                ("set_text", 0, "user"),
+                ("set_text", 1, "secret"),
+                ("tap", 540, 750),
+                ("dump",),
+                ("set_text", 0, "1234"),
+                ("tap", 540, 750),
+                # The list capture is reused by the poll itself.
+                ("dump",),
+            ],
+        )
+
+    async def test_detail_page_is_left_with_back(self):
+        client = self.make_client([test_screens.DETAIL, '<node text="Kitchen"/><node text="20%"/>'])
+
+        await client.async_get_snapshot()
+
+        self.assertIn(("tap", 0, 0), self.device.log)
+        self.assertFalse([entry for entry in self.device.log if entry[0] == "exists"])
+
+    async def test_slow_launch_is_waited_out_without_back(self):
+        client = self.make_client(['<node text="Loading"/>'])
+        for _ in range(5):
+            # Quick back transitions taught the floor as screen-change timeout.
+            client.timeouts.record(module.WAIT_SCREEN, 0.01)
+        launch = self.device.app_start
+
+        def slow_start(*args, **kwargs) -> None:
+            launch(*args, **kwargs)
+            threading.Timer(1.0, self.device.screens.__setitem__, (0, '<node text="Kitchen"/><node text="20%"/>')).start()
+
+        self.device.app_start = slow_start
+        with mock.patch.object(module, "NAVIGATION_SETTLE_INTERVAL", 0.05):
+            snapshot = await client.async_get_snapshot()
+
+        self.assertEqual(snapshot.shades["kitchen"].position, 20)
+        self.assertNotIn(("tap", 0, 0), self.device.log)
+
+    async def test_pin_prompt_without_configured_pin_fails(self):
+        client = self.make_client([test_screens.PIN], pin=None)
+
+        with self.assertRaisesRegex(RuntimeError, "PIN"):
+            await client.async_get_snapshot()
+
+
+def _app(xml: str) -> str:
+    return xml.replace("<node ", '<node package="it.vimar.View" ')
+
+
+DETAIL_LIST = _app(
+    '<hierarchy><node scrollable="true" bounds="[0,0][1080,1920]">'
+    '<node bounds="[0,100][1080,200]"><node text="Kitchen" bounds="[0,100][500,200]"/><node text="20%" bounds="[600,100][800,200]"/></node>'
+    '<node bounds="[0,200][1080,300]"><node text="Bedroom" bounds="[0,200][500,300]"/><node text="40%" bounds="[600,200][800,300]"/></node>'
+    "</node></hierarchy>"
 )
-module = importlib.util.module_from_spec(spec)
-sys.modules[spec.name] = module
-assert spec.loader is not None
-spec.loader.exec_module(module)
-VimarAndroidClient = module.VimarAndroidClient
 
 
-class TestVimarAndroidClientParsing(unittest.TestCase):
-    def setUp(self) -> None:
+def _detail_page(name: str, battery: int, signal: int) -> str:
+    return _app(
+        f'<hierarchy><node><node text="{name}"/><node class="android.widget.SeekBar" bounds="[40,900][1040,960]"/>'
+        f'<node><node text="Batteria"/><node text="{battery}%"/></node><node text="Segnale: {signal} dBm"/></node></hierarchy>'
+    )
+
+
+class DetailFakeDevice(NavigatingFakeDevice):
+    """Fake device opening a shade's detail page when its row is tapped."""
+
+    details = {"Kitchen": _detail_page("Kitchen", 80, -67), "Bedroom": _detail_page("Bedroom", 35, -81)}
+
+    def __init__(self) -> None:
+        super().__init__([DETAIL_LIST])
+
+    def click(self, x: int, y: int) -> None:
+        self.log.append(("tap", x, y))
+        if self.screens[0] == DETAIL_LIST:
+            self.screens[0] = self.details["Kitchen" if y < 200 else "Bedroom"]
+
+    def press(self, key: str) -> None:
+        self.log.append(("press", key))
+        self.screens[0] = DETAIL_LIST
+
+
+class TestVimarAndroidClientShadeDetails(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient("127.0.0.1", 5555, None, "u", "p", None)
+        self.client._device = self.device = DetailFakeDevice()
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_detail_pages_are_read_and_left(self):
+        details = await self.client.async_read_shade_details(["Kitchen", "Bedroom"], budget=30)
+
+        self.assertEqual(
+            details,
+            {"Kitchen": {"battery": 80, "signal": -67}, "Bedroom": {"battery": 35, "signal": -81}},
+        )
+        self.assertEqual(self.device.screens[0], DETAIL_LIST)
+        self.assertEqual(self.device.log.count(("press", "back")), 2)
+
+    async def test_budget_stops_before_the_next_page(self):
+        details = await self.client.async_read_shade_details(["Bedroom", "Kitchen"], budget=0)
+
+        self.assertEqual(list(details), ["Bedroom"])
+
+
+class TestVimarAndroidClientDeadlines(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient("127.0.0.1", 5555, None, "u", "p", None)
+        self.client._device = self.device = NavigatingFakeDevice(['<node text="Loading"/>'])
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_stuck_poll_gives_up_at_its_deadline(self):
+        scheduler = load_module("command_scheduler")
+        started = time.monotonic()
+        with mock.patch.dict(scheduler._DEADLINES, {scheduler.Priority.POLL: 0.2}):
+            with self.assertRaises(scheduler.DeadlineExceededError):
+                await self.client.async_get_snapshot()
+            # The worker stopped waiting for the screen too and is free again.
+            await self.client.async_keepalive()
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertLessEqual(self.device.log.count(("dump",)), 2)
+
+    async def test_selector_waits_use_learned_timeouts(self):
+        timeouts: list[float] = []
+        selector = mock.Mock()
+        selector.exists.side_effect = lambda timeout: timeouts.append(timeout) or True
+        for _ in range(5):
+            self.client._wait_for(selector, "slider")
+
+        # Five quick successes replace the 2 s default with the floor.
+        self.assertEqual(timeouts[0], 2.0)
+        self.assertEqual(self.client.timeouts.timeout("slider"), load_module("const").TIMEOUT_MIN)
+
+
+class PagedScroll:
+    def __init__(self, device: "PagedFakeDevice") -> None:
+        self._device = device
+
+    def forward(self) -> bool:
+        """Scroll one page; like uiautomator2, False once the end is reached."""
+        if self._device.page + 1 >= len(self._device.pages):
+            return False
+        self._device.page += 1
+        self._device.scrolls += 1
+        return self._device.page + 1 < len(self._device.pages)
+
+    def toBeginning(self) -> None:  # noqa: N802 - uiautomator2 API name
+        self._device.page = 0
+
+
+class PagedSelector:
+    def __init__(self, device: "PagedFakeDevice", query: dict) -> None:
+        self.scroll = PagedScroll(device)
+        self._query = query
+
+    def exists(self, timeout: float = 0) -> bool:
+        return bool(self._query.get("scrollable"))
+
+
+class PagedFakeDevice:
+    """Fake device whose shade list spans several scroll pages."""
+
+    info = {"screenOn": True}
+
+    def __init__(self, pages: list[str]) -> None:
+        self.pages = pages
+        self.page = 0
+        self.scrolls = 0
+        self.dumped_pages: list[int] = []
+
+    def __call__(self, **kwargs):
+        return PagedSelector(self, kwargs)
+
+    def app_start(self, package: str, stop: bool = False) -> None:
+        pass
+
+    def app_current(self) -> dict:
+        return {"package": "it.vimar.View"}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        self.dumped_pages.append(self.page)
+        return self.pages[self.page]
+
+
+class TestVimarAndroidClientPageCrawl(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
         self.client = VimarAndroidClient(
             adb_host="127.0.0.1",
             adb_port=5555,
@@ -45,29 +746,168 @@ class TestVimarAndroidClientParsing(unittest.TestCase):
             password="p",
             pin=None,
         )
+        self.now = 1000.0
+        self.client._pages = page_cache.PageCache(max_age=600, clock=lambda: self.now)
+        self.device = PagedFakeDevice([_page(0, 5), _page(5, 5), _page(10, 3)])
+        self.client._device = self.device
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_first_poll_crawls_every_page(self):
+        snapshot = await self.client.async_get_snapshot()
+
+        self.assertEqual(len(snapshot.shades), 13)
+        # The last page is read once more to confirm nothing follows it.
+        self.assertEqual(self.device.dumped_pages, [0, 1, 2, 2])
+        self.assertEqual(self.device.page, 0)
+
+    async def test_page_reached_by_the_final_scroll_is_read(self):
+        self.device.pages = [_page(0, 5), _page(5, 2)]
+
+        snapshot = await self.client.async_get_snapshot()
+
+        self.assertEqual(len(snapshot.shades), 7)
+        self.assertIn("shade_06", snapshot.shades)
+
+    async def test_stale_last_page_is_refreshed(self):
+        await self.client.async_get_snapshot()
+        self.device.dumped_pages.clear()
+        self.device.pages[2] = _page(10, 3).replace("12%", "55%")
+
+        self.client._pages.invalidate(["Shade 12"])
+        snapshot = await self.client.async_get_snapshot()
+
+        self.assertEqual(self.device.dumped_pages, [0, 2])
+        self.assertEqual(snapshot.shades["shade_12"].position, 55)
+
+    async def test_fresh_pages_are_not_revisited(self):
+        first = await self.client.async_get_snapshot()
+        self.device.dumped_pages.clear()
+
+        second = await self.client.async_get_snapshot()
+
+        self.assertIs(first, second)
+        self.assertEqual(self.device.dumped_pages, [0])
+
+    async def test_only_stale_pages_are_revisited(self):
+        await self.client.async_get_snapshot()
+        self.device.dumped_pages.clear()
+        self.device.scrolls = 0
+
+        self.client._pages.invalidate(["Shade 06"])
+        await self.client.async_get_snapshot()
+
+        self.assertEqual(self.device.dumped_pages, [0, 1])
+        self.assertEqual(self.device.scrolls, 1)
+
+    async def test_expired_pages_are_refreshed(self):
+        await self.client.async_get_snapshot()
+        self.device.dumped_pages.clear()
+        self.now += 601
+        self.device.pages[2] = _page(10, 2).replace("11%", "99%")
+
+        snapshot = await self.client.async_get_snapshot()
+
+        # Page 2 lost a row, so the crawl turns full and confirms the end.
+        self.assertEqual(self.device.dumped_pages, [0, 1, 2, 2])
+        self.assertEqual(snapshot.shades["shade_11"].position, 99)
+
+
+class DyingFakeDevice(ScriptedFakeDevice):
+    """Scripted device whose uiautomator service can be killed."""
+
+    def __init__(self) -> None:
+        super().__init__(read_fixture("shade_list_en.xml"), visible={"Living Room", "Kitchen", "Bedroom", "Up"})
+        self.alive = True
+
+    @property
+    def info(self) -> dict:
+        if not self.alive:
+            raise ConnectionError("uiautomator not running")
+        return {"screenOn": True}
+
+    def dump_hierarchy(self, compressed: bool = False) -> str:
+        if not self.alive:
+            raise ConnectionError("uiautomator not running")
+        return super().dump_hierarchy(compressed)
+
+
+class TestVimarAndroidClientReconnect(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.client = VimarAndroidClient("127.0.0.1", 5555, None, "u", "p", None)
+        self.device = DyingFakeDevice()
+        self.client._device = self.device
+        self.replacement = DyingFakeDevice()
+        self.connects: list[str] = []
+        self.sleeps: list[float] = []
+
+        def connect(serial: str):
+            self.connects.append(serial)
+            return self.replacement
+
+        patches = [
+            mock.patch.object(sys.modules["uiautomator2"], "connect", connect),
+            mock.patch.object(module.time, "sleep", self.sleeps.append),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def asyncTearDown(self) -> None:
+        await self.client.async_disconnect()
+
+    async def test_in_flight_poll_survives_a_dead_session(self):
+        await self.client.async_get_snapshot()
+        self.device.alive = False
+
+        snapshot = await self.client.async_get_snapshot()
+
+        self.assertIn("living_room", snapshot.shades)
+        self.assertEqual(self.connects, ["127.0.0.1:5555"])
+        self.assertIs(self.client._device, self.replacement)
+        self.assertEqual(self.client.reconnects, 1)
+        # The new connection starts a fresh session: the app is brought up again.
+        self.assertIn(("app_start", "it.vimar.View"), self.replacement.log)
+
+    async def test_keepalive_restarts_uiautomator_in_place(self):
+        restarts = []
+
+        def reset_uiautomator() -> None:
+            restarts.append(True)
+            self.device.alive = True
+
+        self.device.reset_uiautomator = reset_uiautomator
+        self.device.alive = False
+
+        await self.client.async_keepalive()
+
+        self.assertEqual((restarts, self.connects), ([True], []))
+        self.assertEqual(self.client.reconnects, 1)
+
+    async def test_keepalive_skipped_while_recently_active(self):
+        await self.client.async_get_snapshot()
+        self.device.alive = False
+
+        await self.client.async_keepalive()
+
+        self.assertEqual(self.client.reconnects, 0)
+
+    async def test_reconnect_backoff_is_bounded(self):
+        self.device.alive = False
+        self.replacement.alive = False
+
+        with self.assertRaises(RuntimeError):
+            await self.client.async_keepalive()
+
+        self.assertEqual(len(self.connects), module.RECONNECT_ATTEMPTS)
+        self.assertEqual(self.sleeps, [1.0, 2.0, 4.0, 8.0])
+
+    async def test_application_errors_are_not_retried(self):
+        with self.assertRaises(RuntimeError):
+            await self.client.async_run_scenario("Missing")
 
-    def test_extract_shades_from_percent_labels(self):
-        xml = '''
-        <node text="Living Room"/>
-        <node text="65%"/>
-        <node text="Kitchen"/>
-        <node text="10%"/>
-        '''
-        shades = self.client._extract_shades(xml)
-        self.assertEqual(len(shades), 2)
-        self.assertEqual(shades[0].name, "Living Room")
-        self.assertEqual(shades[0].position, 65)
-        self.assertEqual(shades[1].id, "kitchen")
-
-    def test_extract_scenarios_deduplicates(self):
-        xml = '''
-        <node text="Scenario Morning"/>
-        <node text="Scenario Morning"/>
-        <node text="Scena Notte"/>
-        <node text="Other"/>
-        '''
-        scenarios = self.client._extract_scenarios(xml)
-        self.assertEqual({s.id for s in scenarios}, {"scenario_morning", "scena_notte"})
+        self.assertEqual((self.connects, self.client.reconnects), ([], 0))
 
 
 if __name__ == "__main__":